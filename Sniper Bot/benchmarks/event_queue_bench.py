@@ -0,0 +1,63 @@
+"""
+Flood the EventQueue with synthetic notifications and report sustained
+handler throughput, drops and how long the producer (websocket reader)
+was stalled.
+
+Run from the "Sniper Bot" directory:
+    python -m benchmarks.event_queue_bench --events 50000 --workers 8 --handler-ms 2
+"""
+import argparse
+import asyncio
+import time
+from bot.event_queue import EventQueue, OVERFLOW_POLICIES
+
+PROGRAMS = ("raydium_amm", "raydium_clmm", "pump_fun")
+
+async def run(args) -> dict:
+    queue = EventQueue(maxsize=args.queue_size, workers=args.workers, policy=args.policy)
+    handler_delay = args.handler_ms / 1000
+
+    async def handler(logs, signature):
+        await asyncio.sleep(handler_delay)
+
+    queue.start()
+    max_put = 0.0
+    started = time.perf_counter()
+
+    for i in range(args.events):
+        put_started = time.perf_counter()
+        await queue.put(PROGRAMS[i % len(PROGRAMS)], handler, [], f"sig{i}")
+        max_put = max(max_put, time.perf_counter() - put_started)
+        if i % 64 == 0:
+            # Let the reader yield the way a real socket read would
+            await asyncio.sleep(0)
+    ingest_time = time.perf_counter() - started
+
+    while len(queue) or queue.processed + sum(queue.dropped.values()) < args.events:
+        await asyncio.sleep(0.001)
+    total_time = time.perf_counter() - started
+    await queue.close()
+
+    stats = queue.stats()
+    stats["ingest_rate"] = args.events / ingest_time
+    stats["handled_rate"] = stats["processed"] / total_time
+    stats["max_put"] = max_put
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Event queue flood benchmark")
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--handler-ms", type=float, default=2.0, help="Simulated handler latency")
+    parser.add_argument("--policy", choices=OVERFLOW_POLICIES, default="drop_oldest")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args))
+    print(f"ingested   {stats['ingest_rate']:.0f} events/s (max reader stall {stats['max_put'] * 1000:.3f}ms)")
+    print(f"handled    {stats['handled_rate']:.0f} events/s ({stats['processed']} processed)")
+    print(f"dropped    {sum(stats['dropped'].values())} {stats['dropped']}")
+    print(f"queue      max depth {stats['max_depth']}, avg wait {stats['avg_wait'] * 1000:.3f}ms, max wait {stats['max_wait'] * 1000:.3f}ms")
+
+if __name__ == "__main__":
+    main()
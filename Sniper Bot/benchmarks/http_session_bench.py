@@ -0,0 +1,81 @@
+"""
+Compare request latency of per-call aiohttp sessions against the pooled
+HttpSessionManager, using a local aiohttp stand-in server.
+
+Run from the "Sniper Bot" directory:
+    python -m benchmarks.http_session_bench --requests 500
+"""
+import argparse
+import asyncio
+import time
+import aiohttp
+from aiohttp import web
+from services.http_session import HttpSessionManager
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+async def start_server(delay: float):
+    async def quote(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({"inAmount": "1000000000", "outAmount": "123456789"})
+
+    app = web.Application()
+    app.router.add_get("/quote", quote)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/quote"
+
+async def run_per_call(url: str, count: int) -> list:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                await response.json()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+async def run_pooled(url: str, count: int) -> list:
+    manager = HttpSessionManager()
+    await manager.warm_up([url], connections=1)
+    samples = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            async with manager.get(url) as response:
+                await response.json()
+            samples.append(time.perf_counter() - start)
+    finally:
+        await manager.close()
+    return samples
+
+def report(name: str, samples: list):
+    print(
+        f"{name:<10} p50={percentile(samples, 50) * 1000:.3f}ms "
+        f"p99={percentile(samples, 99) * 1000:.3f}ms "
+        f"n={len(samples)}"
+    )
+
+async def main():
+    parser = argparse.ArgumentParser(description="HTTP session pooling benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--server-delay", type=float, default=0.0, help="Seconds of simulated server latency")
+    args = parser.parse_args()
+
+    runner, url = await start_server(args.server_delay)
+    try:
+        report("per-call", await run_per_call(url, args.requests))
+        report("pooled", await run_pooled(url, args.requests))
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
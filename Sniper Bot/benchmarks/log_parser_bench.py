@@ -0,0 +1,97 @@
+"""
+Measure LogParser throughput on recorded log notifications, against the
+previous join-and-regex implementation. Rejected (swap) notifications and
+creation events are reported separately: creations are decoded and their
+pool accounts derived, which the old text matching never did.
+
+Run from the "Sniper Bot" directory:
+    python -m benchmarks.log_parser_bench --iterations 20000
+"""
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from utils.log_parser import log_parser
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "log_notifications.json"
+
+def legacy_parse_raydium_amm_logs(logs, signature):
+    result = {"mint_address": None, "pool_address": None, "signature": signature, "program": "raydium_amm"}
+    joined_logs = " ".join(logs)
+    mint_match = re.search(r'mint: (\w{32,44})', joined_logs)
+    if mint_match:
+        result["mint_address"] = mint_match.group(1)
+    pool_match = re.search(r'pool: (\w{32,44})', joined_logs)
+    if pool_match:
+        result["pool_address"] = pool_match.group(1)
+    if "initialize2" in joined_logs and "init_pair" in joined_logs:
+        result["action"] = "pool_creation"
+    return result
+
+def legacy_parse_raydium_clmm_logs(logs, signature):
+    result = {"mint_address": None, "position_address": None, "signature": signature, "program": "raydium_clmm"}
+    joined_logs = " ".join(logs)
+    if "open_position" in joined_logs:
+        result["action"] = "position_opened"
+        mint_match = re.search(r'mint: (\w{32,44})', joined_logs)
+        if mint_match:
+            result["mint_address"] = mint_match.group(1)
+    return result
+
+def legacy_parse_pump_fun_logs(logs, signature):
+    result = {"mint_address": None, "signature": signature, "program": "pump_fun"}
+    joined_logs = " ".join(logs)
+    if "create" in joined_logs and "token" in joined_logs:
+        result["action"] = "token_creation"
+        mint_match = re.search(r'mint: (\w{32,44})', joined_logs)
+        if mint_match:
+            result["mint_address"] = mint_match.group(1)
+    if "init_launch" in joined_logs:
+        result["action"] = "migration_initiated"
+        mint_match = re.search(r'mint: (\w{32,44})', joined_logs)
+        if mint_match:
+            result["mint_address"] = mint_match.group(1)
+    return result
+
+LEGACY = {
+    "raydium_amm": legacy_parse_raydium_amm_logs,
+    "raydium_clmm": legacy_parse_raydium_clmm_logs,
+    "pump_fun": legacy_parse_pump_fun_logs
+}
+
+CURRENT = {
+    "raydium_amm": log_parser.parse_raydium_amm_logs,
+    "raydium_clmm": log_parser.parse_raydium_clmm_logs,
+    "pump_fun": log_parser.parse_pump_fun_logs
+}
+
+def measure(parsers: dict, notifications: list, iterations: int) -> float:
+    """Events per second over the fixture set"""
+    calls = [(parsers[n["program"]], n["logs"], n["signature"]) for n in notifications]
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for parse, logs, signature in calls:
+            parse(logs, signature)
+    return iterations * len(calls) / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="LogParser throughput benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    notifications = json.loads(FIXTURES.read_text())
+    # Fixtures with an "expected" entry are creation events, the rest are swaps
+    groups = {
+        "rejected": [n for n in notifications if "expected" not in n],
+        "creation": [n for n in notifications if "expected" in n]
+    }
+
+    print(f"fixtures  {len(notifications)} notifications")
+    for name, group in groups.items():
+        before = measure(LEGACY, group, args.iterations)
+        after = measure(CURRENT, group, args.iterations)
+        print(f"{name:<9} before {before:>12,.0f} events/s   after {after:>12,.0f} events/s ({after / before:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Push a burst of price alerts and trade fills through the NotificationQueue
+into a fake Telegram Bot that enforces Telegram's rate limits, and report
+delivery throughput, coalescing, flood errors and how long fills waited.
+The same burst sent the way the old commented-out calls would have, one
+awaited send_message per notification, is the baseline.
+
+Run from the "Sniper Bot" directory:
+    python -m benchmarks.notification_queue_bench --alerts 1000 --chats 20 --fills 20
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from telegram.error import RetryAfter
+from bot.telegram_bot import NotificationQueue
+
+ADMIN_CHAT = 1
+FILL_ID = re.compile(r"fill #(\d+)")
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+class FakeBot:
+    """
+    Stands in for telegram.Bot: each send takes latency seconds and raises
+    RetryAfter like Telegram's flood control when a sliding window is over
+    its limit (30 a second overall, 20 a minute per group and a short
+    burst per private chat).
+    """
+    def __init__(self, latency: float, global_limit: int = 30, chat_limit: int = 4, group_limit: int = 20):
+        self.latency = latency
+        self.global_limit = global_limit
+        self.chat_limit = chat_limit
+        self.group_limit = group_limit
+        self.recent = deque()  # send times, last second
+        self.recent_by_chat = {}  # chat id -> send times, last minute
+        self.messages = []  # (time, chat id, text)
+        self.floods = 0
+
+    def _over_limit(self, chat_id, now: float) -> bool:
+        while self.recent and now - self.recent[0] > 1:
+            self.recent.popleft()
+        sends = self.recent_by_chat.setdefault(chat_id, deque())
+        while sends and now - sends[0] > 60:
+            sends.popleft()
+        if len(self.recent) >= self.global_limit:
+            return True
+        if chat_id < 0:
+            return len(sends) >= self.group_limit
+        return sum(1 for sent in sends if now - sent <= 1) >= self.chat_limit
+
+    async def send_message(self, chat_id, text):
+        now = time.monotonic()
+        if self._over_limit(chat_id, now):
+            self.floods += 1
+            raise RetryAfter(1)
+        self.recent.append(now)
+        self.recent_by_chat[chat_id].append(now)
+        await asyncio.sleep(self.latency)
+        self.messages.append((time.monotonic(), chat_id, text))
+
+def make_burst(args) -> list:
+    """(delay before, chat id, text, priority, key) for every notification, shuffled in time"""
+    rng = random.Random(args.seed)
+    chats = [ADMIN_CHAT] + [-(100 + i) if i < args.groups else 100 + i for i in range(args.chats - 1)]
+    tokens = [f"{rng.getrandbits(64):016x}" for _ in range(args.tokens)]
+    burst = []
+    for i in range(args.alerts):
+        token = rng.choice(tokens)
+        text = f"📈 Price Alert!\nToken: {token[:8]}...\nPrice: {rng.random():.10f} SOL\nChange: {rng.uniform(-40, 40):.2f}%"
+        burst.append((rng.choice(chats), text, "alert", f"price:{token}"))
+    for i in range(args.fills):
+        burst.insert(rng.randrange(len(burst) + 1), (ADMIN_CHAT, f"✅ Auto-sniped fill #{i}\nTx: https://solscan.io/tx/{i}", "fill", None))
+    gap = args.spread / len(burst)
+    return [(gap, *item) for item in burst]
+
+async def run_queue(args, burst: list) -> dict:
+    bot = FakeBot(args.latency)
+    queue = NotificationQueue(bot)
+    queue.start()
+    fills_queued = {}
+    max_put = 0.0
+    started = time.monotonic()
+    for gap, chat_id, text, priority, key in burst:
+        await asyncio.sleep(gap)
+        put_started = time.perf_counter()
+        queue.put(chat_id, text, priority, key)
+        max_put = max(max_put, time.perf_counter() - put_started)
+        match = FILL_ID.search(text)
+        if match:
+            fills_queued[match.group(1)] = time.monotonic()
+    while len(queue) or queue.sends:
+        await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - started
+    await queue.close()
+
+    fill_waits = [
+        sent_at - fills_queued[fill]
+        for sent_at, _, text in bot.messages
+        for fill in FILL_ID.findall(text)
+    ]
+    return {
+        "elapsed": elapsed,
+        "max_put": max_put,
+        "fill_waits": fill_waits,
+        "floods": bot.floods,
+        **queue.stats()
+    }
+
+async def run_direct(args, burst: list) -> dict:
+    """Every notification awaited in turn on the caller, as the commented-out sends would have"""
+    bot = FakeBot(args.latency)
+    blocked = 0.0
+    max_put = 0.0
+    fill_waits = []
+    failed = 0
+    started = time.monotonic()
+    for gap, chat_id, text, priority, key in burst:
+        await asyncio.sleep(gap)
+        put_started = time.perf_counter()
+        try:
+            await bot.send_message(chat_id=chat_id, text=text)
+            if priority == "fill":
+                fill_waits.append(time.perf_counter() - put_started)
+        except RetryAfter:
+            failed += 1
+        blocked += time.perf_counter() - put_started
+        max_put = max(max_put, time.perf_counter() - put_started)
+    return {
+        "elapsed": time.monotonic() - started,
+        "max_put": max_put,
+        "blocked": blocked,
+        "fill_waits": fill_waits,
+        "floods": bot.floods,
+        "sent": len(bot.messages),
+        "failed": failed
+    }
+
+def report_waits(waits: list) -> str:
+    if not waits:
+        return "no fills delivered"
+    return f"fill wait p50 {percentile(waits, 50) * 1000:.0f}ms, p99 {percentile(waits, 99) * 1000:.0f}ms"
+
+def main():
+    parser = argparse.ArgumentParser(description="Telegram notification queue throughput")
+    parser.add_argument("--alerts", type=int, default=1000)
+    parser.add_argument("--fills", type=int, default=20)
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=5, help="How many of the chats are groups")
+    parser.add_argument("--tokens", type=int, default=200, help="Distinct tokens the alerts are for")
+    parser.add_argument("--spread", type=float, default=2.0, help="Seconds the burst is spread over")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake send_message latency, in seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    burst = make_burst(args)
+    total = len(burst)
+
+    stats = asyncio.run(run_queue(args, burst))
+    print(f"queue      {total} notifications in {stats['elapsed']:.2f}s: {stats['sent']} messages, {stats['delivered']} delivered, "
+          f"{stats['replaced']} replaced, {stats['coalesced']} coalesced, {stats['dropped']} dropped")
+    print(f"           {stats['floods']} flood errors, {stats['failed']} failed, max put {stats['max_put'] * 1e6:.0f}µs, "
+          f"max wait {stats['max_wait']:.2f}s, {report_waits(stats['fill_waits'])}")
+
+    direct = asyncio.run(run_direct(args, burst))
+    print(f"direct     {total} notifications in {direct['elapsed']:.2f}s: {direct['sent']} messages, {direct['failed']} lost to "
+          f"{direct['floods']} flood errors")
+    print(f"           caller blocked {direct['blocked']:.2f}s, max put {direct['max_put'] * 1000:.0f}ms, {report_waits(direct['fill_waits'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Check RaydiumSwap quotes against the recorded pool states, then compare
+the cost of quoting and building a buy in-process with a Jupiter quote
+and swap round trip to a local stand-in server.
+
+Run from the "Sniper Bot" directory:
+    python -m benchmarks.raydium_swap_bench --iterations 2000 --delay 0.03
+"""
+import argparse
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+from aiohttp import web
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solana.transaction import Transaction
+from config.settings import SOL_MINT
+from services.http_session import HttpSessionManager
+from tools.stubs import swap_transaction
+from utils.raydium_swap import RaydiumPool, raydium_swap
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "raydium_pools.json"
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+def make_pool(base_reserve: int, quote_reserve: int) -> RaydiumPool:
+    """A token / SOL pool with made-up account keys"""
+    pool = RaydiumPool()
+    for name in RaydiumPool.__slots__:
+        setattr(pool, name, Pubkey.new_unique())
+    pool.base_mint = str(Pubkey.new_unique())
+    pool.quote_mint = SOL_MINT
+    pool.base_reserve = base_reserve
+    pool.quote_reserve = quote_reserve
+    return pool
+
+def check_quotes(fixtures: list) -> int:
+    """Print every fixture whose quote is off; returns how many were"""
+    mismatches = 0
+    for fixture in fixtures:
+        pool = make_pool(fixture["base_reserve"], fixture["quote_reserve"])
+        quote = raydium_swap.get_quote(pool, SOL_MINT, fixture["amount_in"], fixture["slippage_bps"])
+        got = (int(quote["outAmount"]), int(quote["otherAmountThreshold"]))
+        expected = (fixture["expected_out"], fixture["expected_minimum"])
+        if got != expected:
+            mismatches += 1
+            print(f"MISMATCH  {fixture['name']}: got out/minimum {got}, expected {expected}")
+    return mismatches
+
+def run_native(pool: RaydiumPool, owner: Pubkey, count: int) -> list:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        quote = raydium_swap.get_quote(pool, SOL_MINT, 100_000_000, 500)
+        raydium_swap.build_buy_transaction(pool, owner, quote, Hash.default())
+        samples.append(time.perf_counter() - start)
+    return samples
+
+async def start_server(delay: float, owner: Pubkey):
+    async def quote(request):
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({"inAmount": "100000000", "outAmount": "123456789", "otherAmountThreshold": "117283950"})
+
+    async def swap(request):
+        await request.json()
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({"swapTransaction": swap_transaction(owner)})
+
+    app = web.Application()
+    app.router.add_get("/quote", quote)
+    app.router.add_post("/swap", swap)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+async def run_jupiter(delay: float, owner: Pubkey, count: int) -> list:
+    runner, url = await start_server(delay, owner)
+    manager = HttpSessionManager()
+    await manager.warm_up([url], connections=1)
+    samples = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            async with manager.get(f"{url}/quote") as response:
+                quote = await response.json()
+            async with manager.post(f"{url}/swap", json={"quoteResponse": quote, "userPublicKey": str(owner)}) as response:
+                reply = await response.json()
+            Transaction.deserialize(base64.b64decode(reply["swapTransaction"]))
+            samples.append(time.perf_counter() - start)
+    finally:
+        await manager.close()
+        await runner.cleanup()
+    return samples
+
+def report(name: str, samples: list):
+    print(
+        f"{name:<8} p50 {percentile(samples, 50) * 1000:>8.3f}ms"
+        f"   p99 {percentile(samples, 99) * 1000:>8.3f}ms"
+        f"   mean {sum(samples) / len(samples) * 1000:>8.3f}ms"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Native Raydium swap vs Jupiter round trip")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=200, help="Jupiter round trips to time")
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated Jupiter latency per request, in seconds")
+    args = parser.parse_args()
+
+    fixtures = json.loads(FIXTURES.read_text())
+    mismatches = check_quotes(fixtures)
+    print(f"quotes    {len(fixtures) - mismatches}/{len(fixtures)} fixtures match")
+
+    owner = Keypair().pubkey()
+    pool = make_pool(fixtures[0]["base_reserve"], fixtures[0]["quote_reserve"])
+    report("native", run_native(pool, owner, args.iterations))
+    report("jupiter", asyncio.run(run_jupiter(args.delay, owner, args.requests)))
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Run RpcPool against several local mock JSON-RPC servers with injected
+latency and failures, and report where reads were routed, read latency
+compared with always using the slowest endpoint, and broadcast send
+latency.
+
+Run from the "Sniper Bot" directory:
+    python -m benchmarks.rpc_pool_bench --latencies 5,25,80 --fail-rate 0,0,0.5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from aiohttp import web
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from bot.rpc_pool import RpcPool
+
+SIGNATURE = str(Keypair().sign_message(b"rpc_pool_bench"))
+
+def mock_rpc_app(latency: float, fail_rate: float) -> web.Application:
+    """Minimal JSON-RPC node answering getSlot, getBalance and sendTransaction"""
+    async def handle(request):
+        body = await request.json()
+        await asyncio.sleep(latency * random.uniform(0.8, 1.2))
+        if random.random() < fail_rate:
+            return web.Response(status=503)
+
+        method = body["method"]
+        if method == "getSlot":
+            result = 1
+        elif method == "getBalance":
+            result = {"context": {"slot": 1}, "value": 10**9}
+        elif method == "sendTransaction":
+            result = SIGNATURE
+        else:
+            return web.json_response({"jsonrpc": "2.0", "id": body["id"], "error": {"code": -32601, "message": "Method not found"}})
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    app = web.Application()
+    app.router.add_post("/", handle)
+    return app
+
+async def start_servers(latencies: list, fail_rates: list) -> tuple:
+    runners, urls = [], []
+    for latency, fail_rate in zip(latencies, fail_rates):
+        runner = web.AppRunner(mock_rpc_app(latency, fail_rate))
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        runners.append(runner)
+        urls.append(f"http://127.0.0.1:{port}")
+    return runners, urls
+
+async def timed(coro) -> float:
+    started = time.perf_counter()
+    try:
+        await coro
+    except Exception:
+        return None
+    return time.perf_counter() - started
+
+def summary(samples: list) -> str:
+    ok = sorted(sample for sample in samples if sample is not None)
+    if not ok:
+        return "no successful calls"
+    p99 = ok[min(len(ok) - 1, int(len(ok) * 0.99))]
+    return f"p50 {statistics.median(ok) * 1000:7.2f}ms  p99 {p99 * 1000:7.2f}ms  failed {len(samples) - len(ok)}"
+
+async def run(args):
+    latencies = [float(ms) / 1000 for ms in args.latencies.split(",")]
+    fail_rates = [float(rate) for rate in args.fail_rate.split(",")] if args.fail_rate else [0.0] * len(latencies)
+    runners, urls = await start_servers(latencies, fail_rates)
+    pubkey = Pubkey.default()
+
+    pool = RpcPool(urls)
+    slowest = RpcPool([urls[latencies.index(max(latencies))]])
+    try:
+        # A few probe rounds, as the background loop would have done, so the
+        # first (connection setup) sample doesn't decide the routing
+        for _ in range(5):
+            await pool.probe_once()
+        reads = [await timed(pool.call("get_balance", pubkey)) for _ in range(args.requests)]
+        baseline = [await timed(slowest.call("get_balance", pubkey)) for _ in range(args.requests)]
+        sends = [await timed(pool.broadcast("send_raw_transaction", b"\0" * 64)) for _ in range(args.sends)]
+
+        print(f"reads     pool   {summary(reads)}")
+        print(f"reads     single {summary(baseline)} (slowest endpoint)")
+        print(f"broadcast        {summary(sends)}")
+        for latency, endpoint in zip(latencies, pool.endpoints):
+            status = "healthy" if endpoint.healthy else "ejected"
+            print(
+                f"  {endpoint.url} ({latency * 1000:.0f}ms): {endpoint.requests} requests, "
+                f"{endpoint.errors} errors, score {endpoint.score * 1000:.2f}ms, {status}"
+            )
+    finally:
+        await pool.close()
+        await slowest.close()
+        for runner in runners:
+            await runner.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description="RPC endpoint pool benchmark")
+    parser.add_argument("--latencies", default="5,25,80", help="Injected latency per mock endpoint in ms")
+    parser.add_argument("--fail-rate", default="", help="Failure probability per endpoint, e.g. 0,0,0.5")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--sends", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import struct
+from solders.pubkey import Pubkey
+from solana.rpc.commitment import Commitment
+from solana.rpc.types import TokenAccountOpts
+from utils.event_decoder import TOKEN_PROGRAM, TOKEN_2022_PROGRAM, associated_token_address
+
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+TOKEN_PROGRAMS = (TOKEN_PROGRAM, TOKEN_2022_PROGRAM)  # both share the account and mint layout we read
+_MINT_DECIMALS_OFFSET = 44  # after the mint authority option and supply
+
+def decode_token_account(data: bytes) -> tuple:
+    """(mint, amount) of an SPL token account, None if the data is too short"""
+    if len(data) < 72:
+        return None
+    return str(Pubkey.from_bytes(data[:32])), struct.unpack_from("<Q", data, 64)[0]
+
+def decode_mint_decimals(data: bytes) -> int:
+    """Decimals of an SPL mint, None if the data is too short"""
+    if len(data) <= _MINT_DECIMALS_OFFSET:
+        return None
+    return data[_MINT_DECIMALS_OFFSET]
+
+class TokenBalance:
+    """The primary wallet's token account for one mint and what it last held."""
+    __slots__ = ("mint", "address", "amount", "decimals", "slot", "subscription")
+
+    def __init__(self, mint: str, address: Pubkey = None):
+        self.mint = mint
+        self.address = address
+        self.amount = 0  # raw units; an account that doesn't exist holds none
+        self.decimals = None  # until the mint is visible
+        self.slot = 0
+        self.subscription = None
+
+    @property
+    def ui_amount(self) -> float:
+        """Whole tokens, None until the mint's decimals are known"""
+        if self.decimals is None:
+            return None
+        return self.amount / 10**self.decimals
+
+class BalanceCache:
+    """
+    SOL balances of the wallet pool and the primary wallet's SPL token
+    balances, held in memory and pushed through accountSubscribe on every
+    wallet and token account, so reading a balance costs no RPC call.
+    Token accounts of both token programs are found with
+    getTokenAccountsByOwner at start; a mint asked about later gets its
+    associated token account fetched once and watched from then on, which
+    also catches a buy creating it. A mint that isn't visible yet, as
+    right after a brand-new token is sniped, is looked up again on the
+    next read until its decimals and program are known. The wallet pool's
+    periodic refresh stays as the fallback while a websocket is down.
+    """
+    def __init__(self, rpc, subscriptions, wallets):
+        self.rpc = rpc
+        self.subscriptions = subscriptions
+        self.wallets = wallets
+        self.owner = wallets.primary.address
+        self.tokens = {}  # mint -> TokenBalance
+        self.wallet_subscriptions = []
+        self.updates = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, mint_address):
+        return mint_address in self.tokens
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _on_wallet(self, wallet):
+        async def on_notification(notification):
+            result = notification.result
+            if result.context.slot < wallet.slot:
+                return
+            wallet.balance = result.value.lamports
+            wallet.slot = result.context.slot
+            self.updates += 1
+
+        return on_notification
+
+    def _on_token_account(self, token: TokenBalance):
+        async def on_notification(notification):
+            result = notification.result
+            if result.context.slot < token.slot:
+                return
+            # A closed account comes through empty
+            decoded = decode_token_account(bytes(result.value.data))
+            token.amount = decoded[1] if decoded else 0
+            token.slot = result.context.slot
+            self.updates += 1
+
+        return on_notification
+
+    async def _load_decimals(self, tokens: list):
+        """Fetch the decimals of the tokens' mints in batched getMultipleAccounts calls."""
+        for i in range(0, len(tokens), MAX_ACCOUNTS_PER_CALL):
+            chunk = tokens[i:i + MAX_ACCOUNTS_PER_CALL]
+            response = await self.rpc.call(
+                "get_multiple_accounts",
+                [Pubkey.from_string(token.mint) for token in chunk],
+                commitment=Commitment("confirmed")
+            )
+            for token, account in zip(chunk, response.value):
+                if account is not None:
+                    token.decimals = decode_mint_decimals(bytes(account.data))
+
+    async def _follow(self, token: TokenBalance, address: Pubkey):
+        """Follow the token account at address, moving the subscription if it followed another"""
+        if token.subscription is not None:
+            if address == token.address:
+                return
+            await self.subscriptions.unsubscribe(token.subscription)
+            token.subscription = None
+        token.address = address
+        self.tokens[token.mint] = token
+        token.subscription = await self.subscriptions.account_subscribe(str(address), self._on_token_account(token))
+
+    async def _fetch(self, token: TokenBalance) -> Pubkey:
+        """
+        Read a mint and the owner's associated token account under either
+        token program, filling in the decimals and the amount held.
+        Returns the account to follow: the one under the mint's program,
+        or while the mint isn't visible the one that exists, the token
+        program's if neither does.
+        """
+        mint = Pubkey.from_string(token.mint)
+        addresses = [associated_token_address(self.owner, mint, program) for program in TOKEN_PROGRAMS]
+        response = await self.rpc.call("get_multiple_accounts", [mint, *addresses], commitment=Commitment("confirmed"))
+        mint_account, *accounts = response.value
+        if mint_account is not None and mint_account.owner in TOKEN_PROGRAMS:
+            side = TOKEN_PROGRAMS.index(mint_account.owner)
+            token.decimals = decode_mint_decimals(bytes(mint_account.data))
+        else:
+            side = next((i for i, account in enumerate(accounts) if account is not None), 0)
+        # A push for the account already followed may be newer
+        if addresses[side] != token.address or response.context.slot >= token.slot:
+            decoded = decode_token_account(bytes(accounts[side].data)) if accounts[side] is not None else None
+            token.amount = decoded[1] if decoded else 0
+            token.slot = response.context.slot
+        return addresses[side]
+
+    async def start(self):
+        """Load the wallet's token accounts and follow every balance."""
+        for wallet in self.wallets.wallets:
+            self.wallet_subscriptions.append(
+                await self.subscriptions.account_subscribe(str(wallet.address), self._on_wallet(wallet))
+            )
+
+        found = {}
+        for program in TOKEN_PROGRAMS:
+            response = await self.rpc.call(
+                "get_token_accounts_by_owner",
+                self.owner,
+                TokenAccountOpts(program_id=program),
+                commitment=Commitment("confirmed")
+            )
+            for keyed in response.value:
+                decoded = decode_token_account(bytes(keyed.account.data))
+                if decoded is None or decoded[0] in self.tokens or decoded[0] in found:
+                    continue
+                token = TokenBalance(decoded[0])
+                token.amount = decoded[1]
+                token.slot = response.context.slot
+                found[token.mint] = (token, keyed.pubkey)
+        await self._load_decimals([token for token, _ in found.values()])
+        for token, address in found.values():
+            await self._follow(token, address)
+
+    async def watch(self, mint_address: str) -> TokenBalance:
+        """Fetch and follow the wallet's associated token account for a mint, even if it doesn't exist yet"""
+        token = self.tokens.get(mint_address)
+        if token is not None:
+            return token
+        token = TokenBalance(mint_address)
+        address = await self._fetch(token)
+        # Another caller may have started watching it meanwhile
+        if mint_address in self.tokens:
+            return self.tokens[mint_address]
+        await self._follow(token, address)
+        return token
+
+    async def token_balance(self, mint_address: str) -> float:
+        """The primary wallet's balance of a token in whole tokens, None while its mint isn't visible"""
+        token = self.tokens.get(mint_address)
+        if token is None:
+            self.misses += 1
+            token = await self.watch(mint_address)
+        elif token.decimals is None:
+            # Watched before its mint was visible; its program may differ too
+            self.misses += 1
+            await self._follow(token, await self._fetch(token))
+        else:
+            self.hits += 1
+        return token.ui_amount
+
+    async def sol_balance(self, wallet=None) -> int:
+        """Lamports held by a wallet, or by the whole pool when wallet is None"""
+        wallets = [wallet] if wallet is not None else self.wallets.wallets
+        if any(w.balance is None for w in wallets):
+            # Nothing fetched or pushed yet
+            self.misses += 1
+            await self.wallets.refresh_balances()
+        else:
+            self.hits += 1
+        return sum(w.balance for w in wallets)
+
+    def stats(self) -> dict:
+        """Cached balances and how often reads were served from them"""
+        return {
+            "wallets": len(self.wallet_subscriptions),
+            "tokens": len(self.tokens),
+            "updates": self.updates,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    async def close(self):
+        """Drop every balance subscription."""
+        for subscription in self.wallet_subscriptions:
+            await self.subscriptions.unsubscribe(subscription)
+        self.wallet_subscriptions = []
+        for token in self.tokens.values():
+            if token.subscription is not None:
+                await self.subscriptions.unsubscribe(token.subscription)
+                token.subscription = None
@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections import OrderedDict
+from solana.rpc.commitment import Commitment
+from config.settings import BLOCKHASH_REFRESH_INTERVAL
+
+SLOT_TIME = 0.4  # seconds, mainnet target
+_KNOWN_BLOCKHASHES = 256  # recent blockhashes whose expiry we remember
+
+class BlockhashCache:
+    """
+    Keeps the latest blockhash, its last valid block height and the current
+    block height in memory, refreshed in the background so sending never
+    waits on a blockhash round trip.
+    """
+    def __init__(self, rpc, interval: float = BLOCKHASH_REFRESH_INTERVAL):
+        self.rpc = rpc
+        self.interval = interval
+        self.blockhash = None
+        self.last_valid_block_height = 0
+        self.block_height = 0
+        self.updated_at = 0.0
+        self.expiries = OrderedDict()  # blockhash -> last valid block height
+        self.task = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def start(self):
+        """Start the refresh loop if it is not already running."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def refresh(self):
+        """Fetch the latest blockhash and block height."""
+        commitment = Commitment("confirmed")
+        latest, height = await asyncio.gather(
+            self.rpc.call("get_latest_blockhash", commitment),
+            self.rpc.call("get_block_height", commitment)
+        )
+        self.blockhash = latest.value.blockhash
+        self.last_valid_block_height = latest.value.last_valid_block_height
+        self.block_height = height.value
+        self.updated_at = time.monotonic()
+        self.refreshes += 1
+
+        self.expiries[self.blockhash] = self.last_valid_block_height
+        while len(self.expiries) > _KNOWN_BLOCKHASHES:
+            self.expiries.popitem(last=False)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.failures += 1
+                print(f"Error refreshing blockhash: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def get(self):
+        """Latest (blockhash, last valid block height), only fetching if none is cached yet"""
+        if self.blockhash is None:
+            await self.refresh()
+        return self.blockhash, self.last_valid_block_height
+
+    def expiry_of(self, blockhash) -> int:
+        """Last valid block height of a blockhash we fetched, None if unknown"""
+        return self.expiries.get(blockhash)
+
+    def estimated_block_height(self) -> int:
+        """
+        Current block height, extrapolated at one block per slot since the
+        last refresh. Skipped slots make this run slightly ahead, which errs
+        on the side of treating a blockhash as expired.
+        """
+        return self.block_height + int((time.monotonic() - self.updated_at) / SLOT_TIME)
+
+    async def close(self):
+        """Stop the refresh loop."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
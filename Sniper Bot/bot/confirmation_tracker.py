@@ -0,0 +1,195 @@
+import asyncio
+import time
+from solders.signature import Signature
+from solders.transaction_status import TransactionConfirmationStatus
+from config.settings import CONFIRMATION_POLL_INTERVAL, CONFIRMATION_TIMEOUT
+
+MAX_SIGNATURES_PER_CALL = 256  # getSignatureStatuses limit
+_CONFIRMED = (TransactionConfirmationStatus.Confirmed, TransactionConfirmationStatus.Finalized)
+
+class PendingConfirmation:
+    """A sent transaction waiting to be confirmed."""
+    __slots__ = (
+        "signature", "sent_at", "last_valid_block_height", "processed_at",
+        "confirmed_at", "slot", "subscriptions", "future"
+    )
+
+    def __init__(self, signature, sent_at, last_valid_block_height, future):
+        self.signature = signature
+        self.sent_at = sent_at
+        self.last_valid_block_height = last_valid_block_height
+        self.processed_at = None
+        self.confirmed_at = None
+        self.slot = None
+        self.subscriptions = []
+        self.future = future
+
+class ConfirmationTracker:
+    """
+    Resolves a future for each sent transaction once it is confirmed,
+    failed or expired.
+    Confirmations arrive as signatureSubscribe pushes for the processed
+    and confirmed commitments. A single background loop checks anything
+    still outstanding after a poll interval with batched
+    getSignatureStatuses calls (covering pushes lost to a reconnect), and
+    expires transactions whose blockhash is no longer valid.
+    """
+    def __init__(self, subscriptions, rpc, blockhash_cache, poll_interval: float = CONFIRMATION_POLL_INTERVAL, timeout: float = CONFIRMATION_TIMEOUT):
+        self.subscriptions = subscriptions
+        self.rpc = rpc
+        self.blockhash_cache = blockhash_cache
+        self.poll_interval = poll_interval
+        self.timeout = timeout  # for transactions with an unknown blockhash expiry
+        self.pending = {}  # signature -> PendingConfirmation
+        self.task = None
+        self.confirmed = 0
+        self.failed = 0
+        self.expired = 0
+        self.pushed = 0
+        self.polled = 0
+        self.processed_time = 0.0
+        self.processed_count = 0
+        self.confirmed_time = 0.0
+
+    def __len__(self):
+        return len(self.pending)
+
+    async def track(self, signature, last_valid_block_height=None, sent_at=None) -> asyncio.Future:
+        """
+        Start tracking a signature and return a future for its result dict.
+        sent_at is the monotonic time the send started, defaulting to now.
+        """
+        signature = str(signature)
+        entry = self.pending.get(signature)
+        if entry is not None:
+            return entry.future
+
+        future = asyncio.get_running_loop().create_future()
+        entry = PendingConfirmation(signature, sent_at or time.monotonic(), last_valid_block_height, future)
+        self.pending[signature] = entry
+
+        async def on_processed(notification):
+            self._mark_processed(entry, notification.result.context.slot)
+
+        async def on_confirmed(notification):
+            self.pushed += 1
+            await self._resolve(entry, notification.result.context.slot, notification.result.value.err)
+
+        entry.subscriptions = [
+            await self.subscriptions.signature_subscribe(signature, on_processed, "processed"),
+            await self.subscriptions.signature_subscribe(signature, on_confirmed, "confirmed")
+        ]
+        self.subscriptions.start()
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+        return future
+
+    def _mark_processed(self, entry: PendingConfirmation, slot: int):
+        if entry.processed_at is None and not entry.future.done():
+            entry.processed_at = time.monotonic()
+            entry.slot = slot
+
+    async def _resolve(self, entry: PendingConfirmation, slot: int, err):
+        if entry.future.done():
+            return
+        entry.confirmed_at = time.monotonic()
+        if entry.processed_at is None:
+            entry.processed_at = entry.confirmed_at
+        entry.slot = slot
+        if err is None:
+            self.confirmed += 1
+        else:
+            self.failed += 1
+        await self._finish(entry, "failed" if err else "confirmed", err)
+
+    async def _finish(self, entry: PendingConfirmation, status: str, err=None):
+        self.pending.pop(entry.signature, None)
+
+        time_to_processed = entry.processed_at - entry.sent_at if entry.processed_at else None
+        time_to_confirmed = entry.confirmed_at - entry.sent_at if entry.confirmed_at else None
+        if time_to_processed is not None:
+            self.processed_time += time_to_processed
+            self.processed_count += 1
+        if time_to_confirmed is not None:
+            self.confirmed_time += time_to_confirmed
+
+        if not entry.future.done():
+            entry.future.set_result({
+                "signature": entry.signature,
+                "status": status,
+                "slot": entry.slot,
+                "error": str(err) if err else None,
+                "time_to_processed": time_to_processed,
+                "time_to_confirmed": time_to_confirmed
+            })
+
+        for key in entry.subscriptions:
+            # Fired one-shot subscriptions are already gone; this drops the rest
+            await self.subscriptions.unsubscribe(key)
+
+    def _is_expired(self, entry: PendingConfirmation, now: float) -> bool:
+        if now - entry.sent_at > self.timeout:
+            return True
+        # A processed transaction can still confirm after its blockhash expires
+        if entry.last_valid_block_height is None or entry.processed_at is not None:
+            return False
+        return self.blockhash_cache.estimated_block_height() > entry.last_valid_block_height
+
+    async def poll_once(self):
+        """Check every signature outstanding for longer than the poll interval."""
+        now = time.monotonic()
+        due = [entry for entry in self.pending.values() if now - entry.sent_at >= self.poll_interval]
+
+        for i in range(0, len(due), MAX_SIGNATURES_PER_CALL):
+            chunk = due[i:i + MAX_SIGNATURES_PER_CALL]
+            response = await self.rpc.call(
+                "get_signature_statuses",
+                [Signature.from_string(entry.signature) for entry in chunk]
+            )
+            now = time.monotonic()
+            for entry, status in zip(chunk, response.value):
+                if entry.future.done():
+                    continue
+                if status is not None and status.confirmation_status in _CONFIRMED:
+                    self.polled += 1
+                    await self._resolve(entry, status.slot, status.err)
+                    continue
+                if status is not None:
+                    self._mark_processed(entry, status.slot)
+                if self._is_expired(entry, now):
+                    self.expired += 1
+                    await self._finish(entry, "expired")
+
+    async def _run(self):
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"Error polling signature statuses: {e}")
+
+    def stats(self) -> dict:
+        """Outcome counts and average times to processed and confirmed"""
+        return {
+            "in_flight": len(self.pending),
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "expired": self.expired,
+            "pushed": self.pushed,
+            "polled": self.polled,
+            "avg_time_to_processed": self.processed_time / self.processed_count if self.processed_count else 0.0,
+            "avg_time_to_confirmed": self.confirmed_time / (self.confirmed + self.failed) if self.confirmed + self.failed else 0.0
+        }
+
+    async def close(self):
+        """Stop the poll loop and cancel outstanding futures."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        for entry in self.pending.values():
+            entry.future.cancel()
+        self.pending.clear()
@@ -0,0 +1,140 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from config.settings import EVENT_QUEUE_SIZE, EVENT_WORKERS, EVENT_OVERFLOW_POLICY
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_program")
+
+class QueuedEvent:
+    """A raw notification waiting for a handler worker."""
+    __slots__ = ("seq", "program", "handler", "args", "enqueued_at")
+
+    def __init__(self, seq, program, handler, args):
+        self.seq = seq
+        self.program = program
+        self.handler = handler
+        self.args = args
+        self.enqueued_at = time.monotonic()
+
+class EventQueue:
+    """
+    Bounded queue between websocket ingestion and the event handlers.
+    A pool of workers drains it so a slow handler never stalls the reader.
+
+    Overflow policies when the queue is full:
+        block        - the producer waits for space
+        drop_oldest  - the oldest queued event is discarded
+        drop_program - the oldest event of the busiest program is discarded
+    """
+    def __init__(self, maxsize: int = EVENT_QUEUE_SIZE, workers: int = EVENT_WORKERS, policy: str = EVENT_OVERFLOW_POLICY):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self.policy = policy
+        self.queues = {}  # program -> deque of QueuedEvent, each in arrival order
+        self.size = 0
+        self.seq = itertools.count()
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.workers = []
+
+        # Counters
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = {}
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.first_processed_at = None  # monotonic, for the startup report
+        self.first_processed = asyncio.Event()
+
+    def __len__(self):
+        return self.size
+
+    def start(self):
+        """Start the handler workers."""
+        if not self.workers:
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def put(self, program, handler, *args):
+        """Queue handler(*args), applying the overflow policy when full."""
+        if self.size >= self.maxsize:
+            if self.policy == "block":
+                while self.size >= self.maxsize:
+                    self.not_full.clear()
+                    await self.not_full.wait()
+            else:
+                self._evict()
+
+        self.queues.setdefault(program, deque()).append(
+            QueuedEvent(next(self.seq), program, handler, args)
+        )
+        self.size += 1
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self.size)
+        self.not_empty.set()
+
+    def _evict(self):
+        if self.policy == "drop_program":
+            victim = max(self.queues.values(), key=len)
+        else:
+            victim = self._oldest_queue()
+        event = victim.popleft()
+        self.size -= 1
+        self.dropped[event.program] = self.dropped.get(event.program, 0) + 1
+
+    def _oldest_queue(self):
+        # Few programs are watched, so a scan of the queue heads is cheap
+        oldest = None
+        for queue in self.queues.values():
+            if queue and (oldest is None or queue[0].seq < oldest[0].seq):
+                oldest = queue
+        return oldest
+
+    async def _worker(self):
+        while True:
+            while not self.size:
+                self.not_empty.clear()
+                await self.not_empty.wait()
+
+            event = self._oldest_queue().popleft()
+            self.size -= 1
+            self.not_full.set()
+
+            wait = time.monotonic() - event.enqueued_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+            try:
+                await event.handler(*event.args)
+            except Exception as e:
+                self.failed += 1
+                print(f"Error handling {event.program} event: {e}")
+            self.processed += 1
+            if self.first_processed_at is None:
+                self.first_processed_at = time.monotonic()
+                self.first_processed.set()
+
+    def stats(self) -> dict:
+        """Queue depth, drop and wait-time counters"""
+        return {
+            "depth": self.size,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": dict(self.dropped),
+            "avg_wait": self.total_wait / self.processed if self.processed else 0.0,
+            "max_wait": self.max_wait
+        }
+
+    async def close(self):
+        """Stop the handler workers."""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
@@ -0,0 +1,143 @@
+import asyncio
+import struct
+import time
+from collections import OrderedDict
+from solders.instruction import Instruction
+from solders.pubkey import Pubkey
+from solana.transaction import Transaction
+from config.settings import (
+    PRIORITY_FEE_SAMPLE_INTERVAL,
+    PRIORITY_FEE_PERCENTILES,
+    PRIORITY_FEE_MIN,
+    PRIORITY_FEE_MAX,
+    COMPUTE_UNIT_MARGIN
+)
+
+COMPUTE_BUDGET_PROGRAM = Pubkey.from_string("ComputeBudget111111111111111111111111111111")
+MAX_COMPUTE_UNITS = 1_400_000  # per transaction
+MAX_FEE_ACCOUNTS = 128  # getRecentPrioritizationFees limit
+_SET_COMPUTE_UNIT_LIMIT = struct.Struct("<BI")  # instruction 2, units
+_SET_COMPUTE_UNIT_PRICE = struct.Struct("<BQ")  # instruction 3, micro-lamports per unit
+_SET_COMPUTE_UNIT_LIMIT_TAG = 2
+_SET_COMPUTE_UNIT_PRICE_TAG = 3
+_BUDGET_INSTRUCTION_UNITS = 300  # what our two compute budget instructions consume
+
+def percentile(ordered: list, pct: float) -> int:
+    """Nearest-rank percentile of a sorted list"""
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+class FeeEstimator:
+    """
+    Priority fee and compute unit limit for our transactions.
+    A background sampler calls getRecentPrioritizationFees once a slot for
+    the writable accounts of our latest swaps and keeps the fees sorted,
+    so pricing a transaction is a lookup rather than an RPC call. Each
+    urgency class pays its own percentile of those fees. The compute unit
+    limit is the simulated consumption plus a margin, instead of the
+    default 200k per instruction, which makes the same fee per unit cheaper
+    and lets the leader pack the transaction earlier.
+    """
+    def __init__(
+        self,
+        rpc,
+        interval: float = PRIORITY_FEE_SAMPLE_INTERVAL,
+        percentiles: dict = PRIORITY_FEE_PERCENTILES,
+        min_fee: int = PRIORITY_FEE_MIN,
+        max_fee: int = PRIORITY_FEE_MAX,
+        margin: float = COMPUTE_UNIT_MARGIN
+    ):
+        self.rpc = rpc
+        self.interval = interval
+        self.percentiles = percentiles
+        self.min_fee = min_fee
+        self.max_fee = max_fee
+        self.margin = margin
+        self.accounts = OrderedDict()  # writable accounts of recent swaps, oldest first
+        self.fees = []  # per-slot fees of the last sample, sorted
+        self.sampled_at = 0.0
+        self.samples = 0
+        self.task = None
+
+    def touch(self, transaction):
+        """Sample fees for the accounts a transaction writes to from now on."""
+        for instruction in transaction.instructions:
+            for meta in instruction.accounts:
+                if meta.is_writable and not meta.is_signer:
+                    self.accounts[str(meta.pubkey)] = None
+                    self.accounts.move_to_end(str(meta.pubkey))
+        while len(self.accounts) > MAX_FEE_ACCOUNTS:
+            self.accounts.popitem(last=False)
+
+    async def sample(self):
+        """Fetch recent prioritization fees and keep them sorted."""
+        params = [list(self.accounts)] if self.accounts else []
+        fees = await self.rpc.request("getRecentPrioritizationFees", params)
+        self.fees = sorted(entry["prioritizationFee"] for entry in fees)
+        self.sampled_at = time.monotonic()
+        self.samples += 1
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                print(f"Error sampling priority fees: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background fee sampler."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def price(self, urgency: str) -> int:
+        """Micro-lamports per compute unit for an urgency class, within the configured bounds"""
+        fee = percentile(self.fees, self.percentiles.get(urgency, 50)) if self.fees else 0
+        return max(self.min_fee, min(self.max_fee, fee))
+
+    def unit_limit(self, units_consumed: int) -> int:
+        """Compute unit limit for a transaction that simulated at units_consumed, None if unknown"""
+        if not units_consumed:
+            return None
+        return min(MAX_COMPUTE_UNITS, int(units_consumed * (1 + self.margin)) + _BUDGET_INSTRUCTION_UNITS)
+
+    def apply(self, transaction, units_consumed: int, urgency: str, keep_first: int = 0) -> Transaction:
+        """
+        An unsigned copy of transaction with our compute budget in place of
+        any it had. keep_first leading instructions stay ahead of it, e.g.
+        a nonce advance, which has to come first.
+        """
+        self.touch(transaction)
+        instructions = [
+            instruction for instruction in transaction.instructions
+            if instruction.program_id != COMPUTE_BUDGET_PROGRAM
+        ]
+        budget = [Instruction(COMPUTE_BUDGET_PROGRAM, _SET_COMPUTE_UNIT_PRICE.pack(_SET_COMPUTE_UNIT_PRICE_TAG, self.price(urgency)), [])]
+        limit = self.unit_limit(units_consumed)
+        if limit is not None:
+            budget.insert(0, Instruction(COMPUTE_BUDGET_PROGRAM, _SET_COMPUTE_UNIT_LIMIT.pack(_SET_COMPUTE_UNIT_LIMIT_TAG, limit), []))
+        return Transaction(
+            recent_blockhash=transaction.recent_blockhash,
+            fee_payer=transaction.fee_payer,
+            instructions=instructions[:keep_first] + budget + instructions[keep_first:]
+        )
+
+    def stats(self) -> dict:
+        """Current fee per urgency class and sampler state"""
+        return {
+            "fees": {urgency: self.price(urgency) for urgency in self.percentiles},
+            "slots": len(self.fees),
+            "accounts": len(self.accounts),
+            "samples": self.samples,
+            "age": time.monotonic() - self.sampled_at if self.samples else None
+        }
+
+    async def close(self):
+        """Stop the sampler."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
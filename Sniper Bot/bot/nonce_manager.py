@@ -0,0 +1,193 @@
+import struct
+import time
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+from solders.system_program import (
+    AdvanceNonceAccountParams,
+    WithdrawNonceAccountParams,
+    advance_nonce_account,
+    create_nonce_account,
+    withdraw_nonce_account
+)
+from solana.rpc.commitment import Commitment
+
+NONCE_ACCOUNT_SIZE = 80
+_INITIALIZED = 1
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+
+def decode_nonce_account(data: bytes) -> tuple:
+    """
+    (authority, nonce) of a system program nonce account, None if the data
+    isn't an initialized nonce account.
+    Layout: version u32, state u32, authority, durable nonce, lamports per signature u64.
+    """
+    if len(data) < NONCE_ACCOUNT_SIZE:
+        return None
+    _, state = struct.unpack_from("<II", data)
+    if state != _INITIALIZED:
+        return None
+    return Pubkey.from_bytes(data[8:40]), Hash.from_bytes(data[40:72])
+
+class NonceAccount:
+    """A durable nonce account and the nonce currently stored in it."""
+    __slots__ = ("address", "nonce", "lamports", "bound", "advances", "updated_at", "subscription")
+
+    def __init__(self, address: Pubkey):
+        self.address = address
+        self.nonce = None
+        self.lamports = 0
+        self.bound = 0  # pre-signed transactions currently using this nonce
+        self.advances = 0
+        self.updated_at = 0.0
+        self.subscription = None
+
+class NonceManager:
+    """
+    Durable nonce accounts owned by one authority.
+    A transaction whose first instruction advances a nonce account and
+    whose blockhash is that account's stored nonce stays valid until the
+    nonce is advanced, instead of for about 150 blocks, so it can be
+    signed long before it is sent. Each account's nonce is kept current
+    through an accountSubscribe; on_advance callbacks hear when a nonce is
+    used up so transactions signed against it can be rebuilt.
+    """
+    def __init__(self, rpc, subscriptions, authority, addresses: list = ()):
+        self.rpc = rpc
+        self.subscriptions = subscriptions
+        self.authority = authority
+        self.accounts = {str(address): NonceAccount(Pubkey.from_string(str(address))) for address in addresses}
+        self.listeners = []
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def on_advance(self, callback):
+        """Call callback(address) whenever a nonce account's nonce changes"""
+        self.listeners.append(callback)
+
+    def _update(self, account: NonceAccount, data: bytes, lamports: int) -> bool:
+        """Store a fetched or pushed account state; True if the nonce moved"""
+        decoded = decode_nonce_account(data)
+        if decoded is None:
+            print(f"Nonce account {account.address} is not initialized")
+            return False
+        authority, nonce = decoded
+        if authority != self.authority.pubkey():
+            print(f"Nonce account {account.address} belongs to {authority}, not our wallet")
+            return False
+        advanced = account.nonce is not None and nonce != account.nonce
+        account.nonce = nonce
+        account.lamports = lamports
+        account.updated_at = time.monotonic()
+        if advanced:
+            account.advances += 1
+        return advanced
+
+    def _advanced(self, account: NonceAccount):
+        for callback in self.listeners:
+            try:
+                callback(str(account.address))
+            except Exception as e:
+                print(f"Error in nonce advance callback: {e}")
+
+    async def refresh(self, addresses: list = None):
+        """Fetch the stored nonce of the given accounts (all by default) in batched getMultipleAccounts calls."""
+        accounts = [self.accounts[address] for address in addresses] if addresses else list(self.accounts.values())
+        for i in range(0, len(accounts), MAX_ACCOUNTS_PER_CALL):
+            chunk = accounts[i:i + MAX_ACCOUNTS_PER_CALL]
+            response = await self.rpc.call(
+                "get_multiple_accounts",
+                [account.address for account in chunk],
+                commitment=Commitment("confirmed")
+            )
+            for account, info in zip(chunk, response.value):
+                if info is None:
+                    print(f"Nonce account {account.address} does not exist")
+                elif self._update(account, bytes(info.data), info.lamports):
+                    self._advanced(account)
+
+    async def _subscribe(self, account: NonceAccount):
+        async def on_notification(notification):
+            value = notification.result.value
+            if self._update(account, bytes(value.data), value.lamports):
+                self._advanced(account)
+
+        account.subscription = await self.subscriptions.account_subscribe(str(account.address), on_notification)
+
+    async def start(self):
+        """Load every nonce account and follow its changes."""
+        if not self.accounts:
+            return
+        await self.refresh()
+        for account in self.accounts.values():
+            if account.subscription is None:
+                await self._subscribe(account)
+
+    async def track(self, address: str):
+        """Start using a nonce account, e.g. one just created."""
+        account = self.accounts.setdefault(address, NonceAccount(Pubkey.from_string(address)))
+        await self.refresh([address])
+        if account.subscription is None:
+            await self._subscribe(account)
+
+    async def untrack(self, address: str):
+        """Stop using a nonce account; transactions signed against it are dropped like after an advance."""
+        account = self.accounts.pop(address, None)
+        if account is None:
+            return
+        if account.subscription is not None:
+            await self.subscriptions.unsubscribe(account.subscription)
+        self._advanced(account)
+
+    def acquire(self) -> NonceAccount:
+        """The usable nonce account with the fewest pre-signed transactions bound to it, None if there is none"""
+        usable = [account for account in self.accounts.values() if account.nonce is not None]
+        if not usable:
+            return None
+        account = min(usable, key=lambda a: a.bound)
+        account.bound += 1
+        return account
+
+    def release(self, account: NonceAccount):
+        account.bound = max(0, account.bound - 1)
+
+    def has_advanced(self, address: str, nonce: Hash) -> bool:
+        """Whether a transaction signed against nonce can no longer land"""
+        account = self.accounts.get(address)
+        return account is None or account.nonce != nonce
+
+    def advance_instruction(self, account: NonceAccount):
+        """The instruction that must come first in a transaction using this nonce"""
+        return advance_nonce_account(AdvanceNonceAccountParams(
+            nonce_pubkey=account.address,
+            authorized_pubkey=self.authority.pubkey()
+        ))
+
+    def create_instructions(self, nonce_address: Pubkey, lamports: int) -> tuple:
+        """Instructions creating a nonce account funded and authorized by our wallet"""
+        return create_nonce_account(self.authority.pubkey(), nonce_address, self.authority.pubkey(), lamports)
+
+    def withdraw_instruction(self, account: NonceAccount):
+        """Instruction closing a nonce account by withdrawing its whole balance to our wallet"""
+        return withdraw_nonce_account(WithdrawNonceAccountParams(
+            nonce_pubkey=account.address,
+            authorized_pubkey=self.authority.pubkey(),
+            to_pubkey=self.authority.pubkey(),
+            lamports=account.lamports
+        ))
+
+    def stats(self) -> dict:
+        """Nonce accounts in use and how often they advanced"""
+        return {
+            "accounts": len(self.accounts),
+            "ready": sum(1 for account in self.accounts.values() if account.nonce is not None),
+            "bound": sum(account.bound for account in self.accounts.values()),
+            "advances": sum(account.advances for account in self.accounts.values())
+        }
+
+    async def close(self):
+        """Drop the account subscriptions."""
+        for account in self.accounts.values():
+            if account.subscription is not None:
+                await self.subscriptions.unsubscribe(account.subscription)
+                account.subscription = None
@@ -0,0 +1,287 @@
+import asyncio
+import time
+from solana.rpc.commitment import Commitment
+from solana.rpc.types import MemcmpOpts
+from solana.transaction import Transaction
+from config.settings import PRESIGN_REFRESH_INTERVAL, MAX_BUY_AMOUNT, MAX_SLIPPAGE, SOL_MINT
+from bot.solana_client import solana_client
+from utils.event_decoder import event_decoder
+from utils.raydium_swap import raydium_swap, minimum_amount_out, OPENBOOK_PROGRAM, BUY_COMPUTE_UNITS
+from utils.transaction_simulator import transaction_simulator
+
+_RETRY_DELAY = 1.0  # seconds, floor between build rounds so failing builds don't spin
+
+# Jupiter venues that only exist until the token migrates to an AMM pool.
+# The pool creation or migration event a pre-signed buy waits for is the
+# moment they close, so a buy routed through one would fail on arrival.
+BONDING_CURVE_VENUES = {"Pump.fun", "Moonshot"}
+
+# Serum / OpenBook market state v3: size, base mint and quote mint offsets
+_MARKET_SIZE = 388
+_MARKET_BASE_MINT = 53
+_MARKET_QUOTE_MINT = 85
+
+def bonding_curve_venue(quote: dict) -> str:
+    """The bonding curve a quote routes through, None if it routes through none"""
+    for step in (quote or {}).get("routePlan") or ():
+        label = (step.get("swapInfo") or {}).get("label")
+        if label in BONDING_CURVE_VENUES:
+            return label
+    return None
+
+class PresignedSwap:
+    """A buy signed against a durable nonce, ready to broadcast."""
+    __slots__ = ("mint_address", "transaction", "raw_transaction", "nonce_account", "nonce", "pool_address", "built_at")
+
+    def __init__(self, mint_address, transaction, nonce_account, nonce, pool_address=None):
+        self.mint_address = mint_address
+        self.transaction = transaction
+        self.raw_transaction = transaction.serialize()
+        self.nonce_account = nonce_account
+        self.nonce = nonce
+        self.pool_address = pool_address  # the Raydium pool it swaps through, None for a Jupiter route
+        self.built_at = time.monotonic()
+
+    @property
+    def nonce_address(self) -> str:
+        return str(self.nonce_account.address)
+
+class PresignedSwaps:
+    """
+    Buys for watchlisted mints, quoted, built, simulated and signed ahead
+    of time against the client's durable nonce accounts, so a pool
+    creation for one of them is answered with a broadcast and nothing else.
+    A background loop builds what is missing and rebuilds buys whose quote
+    is older than the refresh interval or whose nonce was advanced.
+    A mint that already trades on a pool that will outlive its event is
+    bought through Jupiter. One with no route yet, or only a bonding curve
+    that closes when it migrates, is bought through the Raydium AMM v4
+    pool its OpenBook market will get: every key of that pool derives from
+    the market, which is listed before initialize2 runs, so the buy is
+    built and signed before the pool exists and sent on its creation.
+    """
+    def __init__(self, build_swap, refresh_interval: float = PRESIGN_REFRESH_INTERVAL):
+        self.build_swap = build_swap  # async (mint_address) -> (transaction, quote, error)
+        self.refresh_interval = refresh_interval
+        self.watchlist = set()
+        self.ready = {}  # mint address -> PresignedSwap
+        self.markets = {}  # mint address -> (market address, SerumMarket), once listed
+        self.wake = asyncio.Event()
+        self.task = None
+        self.builds = 0
+        self.failures = 0
+        self.invalidated = 0
+        self.used = 0
+        self.pending_pools = 0
+
+    def __len__(self):
+        return len(self.ready)
+
+    def __contains__(self, mint_address):
+        return mint_address in self.watchlist
+
+    def watch(self, mint_address):
+        """Keep a pre-signed buy ready for a mint."""
+        self.watchlist.add(mint_address)
+        self.wake.set()
+
+    async def check(self, mint_address) -> str:
+        """
+        Why a mint's buy can't be pre-signed, None if it can, perhaps once
+        its market is listed. Quotes the buy once to see its route.
+        """
+        transaction, quote, _ = await self.build_swap(mint_address)
+        if transaction is not None and not bonding_curve_venue(quote):
+            return None
+        try:
+            self._floor(quote)
+        except ValueError as e:
+            return str(e)
+        return None
+
+    def unwatch(self, mint_address):
+        self.watchlist.discard(mint_address)
+        self.markets.pop(mint_address, None)
+        self._drop(mint_address)
+
+    def awaits_pool(self, mint_address, pool_address) -> bool:
+        """True if the mint's buy is signed for a Raydium pool other than pool_address"""
+        presigned = self.ready.get(mint_address)
+        return presigned is not None and presigned.pool_address not in (None, pool_address)
+
+    def take(self, mint_address) -> PresignedSwap:
+        """
+        Take a mint off the watchlist and return its pre-signed buy, None
+        if there is none whose nonce is still current
+        """
+        presigned = self.ready.get(mint_address)
+        self.unwatch(mint_address)
+        if presigned is None or solana_client.nonces.has_advanced(presigned.nonce_address, presigned.nonce):
+            return None
+        self.used += 1
+        return presigned
+
+    def _drop(self, mint_address):
+        presigned = self.ready.pop(mint_address, None)
+        if presigned is not None:
+            solana_client.nonces.release(presigned.nonce_account)
+
+    def _on_advance(self, address: str):
+        """Every buy signed against an advanced nonce is dead; rebuild them"""
+        for mint_address, presigned in list(self.ready.items()):
+            if presigned.nonce_address == address:
+                self._drop(mint_address)
+                self.invalidated += 1
+        self.wake.set()
+
+    @staticmethod
+    def _floor(quote: dict) -> int:
+        """
+        Least a buy into a pool that doesn't exist yet may return: the
+        current quote's output less MAX_SLIPPAGE, which has to cover the
+        move to the listing price. Without a quote there is nothing to
+        price it by, which only a slippage accepting any output allows.
+        """
+        slippage_bps = int(MAX_SLIPPAGE * 10000)
+        if quote:
+            return minimum_amount_out(int(quote["outAmount"]), slippage_bps)
+        if slippage_bps >= 10000:
+            return 0
+        raise ValueError("it has no route to price the buy by, and MAX_SLIPPAGE doesn't accept any output")
+
+    async def _find_market(self, mint_address) -> tuple:
+        """(address, SerumMarket) of the mint's OpenBook market against SOL, None until it is listed"""
+        found = self.markets.get(mint_address)
+        if found is not None:
+            return found
+        filters = [
+            [_MARKET_SIZE, MemcmpOpts(_MARKET_BASE_MINT, mint_address), MemcmpOpts(_MARKET_QUOTE_MINT, SOL_MINT)],
+            [_MARKET_SIZE, MemcmpOpts(_MARKET_BASE_MINT, SOL_MINT), MemcmpOpts(_MARKET_QUOTE_MINT, mint_address)]
+        ]
+        responses = await asyncio.gather(*(
+            solana_client.rpc.call(
+                "get_program_accounts",
+                OPENBOOK_PROGRAM,
+                commitment=Commitment("confirmed"),
+                encoding="base64",
+                filters=side
+            )
+            for side in filters
+        ))
+        for response in responses:
+            for keyed in response.value:
+                market = event_decoder.decode_serum_market(bytes(keyed.account.data))
+                if market is not None:
+                    self.markets[mint_address] = (keyed.pubkey, market)
+                    return self.markets[mint_address]
+        return None
+
+    async def _build_pending_pool(self, mint_address, quote) -> tuple:
+        """(transaction, pool address) of a buy through the Raydium pool the mint's market will get"""
+        found = await self._find_market(mint_address)
+        if found is None:
+            raise ValueError("no route and no OpenBook market to derive its pool from yet")
+        pool = raydium_swap.pool_from_market(*found)
+        if pool is None:
+            raise ValueError("its OpenBook market isn't a SOL pair a Raydium pool can be derived from")
+        amount = int(quote["inAmount"]) if quote else int(MAX_BUY_AMOUNT * 10**9)
+        floor = raydium_swap.floor_quote(pool, amount, self._floor(quote))
+        transaction = raydium_swap.build_buy_transaction(pool, solana_client.keypair.pubkey(), floor)
+        return transaction, str(pool.amm)
+
+    async def _build(self, mint_address):
+        nonces = solana_client.nonces
+        account = nonces.acquire()
+        if account is None:
+            return
+        nonce = account.nonce
+        pool_address = None
+        try:
+            transaction, quote, _ = await self.build_swap(mint_address)
+            if transaction is None or bonding_curve_venue(quote):
+                transaction, pool_address = await self._build_pending_pool(mint_address, quote)
+
+            # The nonce advance has to be the first instruction
+            durable = Transaction(
+                recent_blockhash=nonce,
+                fee_payer=solana_client.keypair.pubkey(),
+                instructions=[nonces.advance_instruction(account), *transaction.instructions]
+            )
+            if pool_address is None:
+                durable.sign(solana_client.keypair)
+                simulation = await transaction_simulator.simulate_transaction(durable)
+                if not simulation["success"]:
+                    raise ValueError(f"Simulation failed: {simulation['error']}")
+                units_consumed = simulation["units_consumed"]
+            else:
+                # Its pool doesn't exist yet, so there is nothing to simulate against
+                units_consumed = BUY_COMPUTE_UNITS
+            # The fee is fixed at signing, so it is bid at snipe urgency up front
+            durable = solana_client.fees.apply(durable, units_consumed, "snipe", keep_first=1)
+            durable.sign(solana_client.keypair)
+        except Exception as e:
+            nonces.release(account)
+            self.failures += 1
+            print(f"Error pre-signing buy for {mint_address}: {e}")
+            return
+
+        # Unwatched, or the nonce moved, while this was being built
+        if mint_address not in self.watchlist or nonces.has_advanced(str(account.address), nonce):
+            nonces.release(account)
+            return
+        self._drop(mint_address)
+        self.ready[mint_address] = PresignedSwap(mint_address, durable, account, nonce, pool_address)
+        self.builds += 1
+        if pool_address is not None:
+            self.pending_pools += 1
+
+    def _next_refresh(self) -> float:
+        """Seconds until the oldest ready buy is due for a rebuild"""
+        if not self.ready:
+            return self.refresh_interval
+        oldest = min(presigned.built_at for presigned in self.ready.values())
+        return max(0.0, oldest + self.refresh_interval - time.monotonic())
+
+    async def _run(self):
+        while True:
+            self.wake.clear()
+            now = time.monotonic()
+            due = [
+                mint_address for mint_address in self.watchlist
+                if mint_address not in self.ready or now - self.ready[mint_address].built_at >= self.refresh_interval
+            ]
+            if due:
+                await asyncio.gather(*(self._build(mint_address) for mint_address in due))
+            try:
+                await asyncio.wait_for(self.wake.wait(), max(_RETRY_DELAY, self._next_refresh()))
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start rebuilding on nonce advances and stale quotes."""
+        if self._on_advance not in solana_client.nonces.listeners:
+            solana_client.nonces.on_advance(self._on_advance)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def stats(self) -> dict:
+        """Watchlist size and pre-signing counters"""
+        return {
+            "watched": len(self.watchlist),
+            "ready": len(self.ready),
+            "builds": self.builds,
+            "failures": self.failures,
+            "invalidated": self.invalidated,
+            "used": self.used,
+            "pending_pools": self.pending_pools
+        }
+
+    async def close(self):
+        """Stop the build loop."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
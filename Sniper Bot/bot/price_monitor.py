@@ -0,0 +1,63 @@
+import asyncio
+from config.settings import PRICE_POLL_INTERVAL, PRICE_API_MAX_IDS, SOL_MINT
+from services.jupiter_service import jupiter_service
+
+class PriceMonitor:
+    """
+    Single polling loop for every monitored token.
+    Groups the watched mints into multi-id price requests (chunked to the
+    API's id limit) and fans each price back out to a per-token callback.
+    Prices are in SOL. Tokens in streamed get their prices pushed from
+    elsewhere and are skipped.
+    """
+    def __init__(self, tokens: dict, on_price, interval: float = PRICE_POLL_INTERVAL, batch_size: int = PRICE_API_MAX_IDS, streamed=()):
+        self.tokens = tokens  # Shared with the owner, keyed by mint address
+        self.streamed = streamed
+        self.on_price = on_price
+        self.interval = interval
+        self.batch_size = batch_size
+        self.task = None
+        self.cycles = 0
+        self.requests = 0
+
+    def ensure_running(self):
+        """Start the polling loop if it is not already running."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def poll_once(self):
+        """Fetch prices for all monitored tokens and dispatch them."""
+        mints = [mint_address for mint_address in self.tokens if mint_address not in self.streamed]
+        chunks = [mints[i:i + self.batch_size] for i in range(0, len(mints), self.batch_size)]
+        if not chunks:
+            return
+
+        results = await asyncio.gather(*(jupiter_service.get_prices(chunk, SOL_MINT) for chunk in chunks))
+        self.cycles += 1
+        self.requests += len(chunks)
+
+        for prices in results:
+            for mint_address, price in prices.items():
+                # The token may have been dropped while the request was in flight
+                if mint_address in self.tokens:
+                    await self.on_price(mint_address, price)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self.tokens:
+            started = loop.time()
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"Error polling token prices: {e}")
+            await asyncio.sleep(max(0, self.interval - (loop.time() - started)))
+
+    async def close(self):
+        """Stop the polling loop."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
@@ -0,0 +1,264 @@
+import asyncio
+import struct
+from collections import OrderedDict
+from solders.pubkey import Pubkey
+from solana.rpc.commitment import Commitment
+from config.settings import SOL_MINT
+from bot.solana_client import solana_client
+from services.dexscreener_service import dexscreener_service
+from utils.event_decoder import event_decoder
+
+KNOWN_POOLS_CAPACITY = 1024  # pools remembered from detections
+SOL_DECIMALS = 9
+
+def decode_token_amount(data: bytes) -> int:
+    """Amount held by an SPL token account, None if the data is too short"""
+    if len(data) < 72:
+        return None
+    return struct.unpack_from("<Q", data, 64)[0]
+
+def decode_open_orders_totals(data: bytes) -> tuple:
+    """(base, quote) totals of a Serum / OpenBook open orders account, None if the data is too short"""
+    if len(data) < 109:
+        return None
+    return struct.unpack_from("<Q", data, 85)[0], struct.unpack_from("<Q", data, 101)[0]
+
+class StreamedPool:
+    """
+    A monitored token's Raydium AMM v4 pool and the last values pushed for
+    every account its reserves are made of: the two vaults, the open
+    orders on its OpenBook market and the pnl its state says is owed out.
+    Pairs are (token, SOL).
+    """
+    __slots__ = (
+        "mint_address", "pool_address", "vaults", "open_orders", "token_is_base", "token_decimals",
+        "balances", "slots", "orders", "orders_slot", "pnl", "pnl_slot", "subscriptions", "updates"
+    )
+
+    def __init__(self, mint_address, pool_address, amm):
+        self.mint_address = mint_address
+        self.pool_address = pool_address
+        self.token_is_base = amm.base_mint == mint_address
+        self.vaults = self.pair(amm.base_vault, amm.quote_vault)
+        self.open_orders = amm.open_orders
+        self.token_decimals = amm.base_decimals if self.token_is_base else amm.quote_decimals
+        self.balances = [None, None]
+        self.slots = [0, 0]
+        self.orders = (0, 0)
+        self.orders_slot = 0
+        self.pnl = (0, 0)
+        self.pnl_slot = 0
+        self.subscriptions = []
+        self.updates = 0
+
+    def pair(self, base, quote) -> tuple:
+        """A (base, quote) pair of the pool's as (token, SOL)"""
+        return (base, quote) if self.token_is_base else (quote, base)
+
+    @property
+    def reserves(self) -> tuple:
+        """
+        (token, SOL) the pool swaps against, as the program computes them:
+        vault balances plus open order totals less the pnl owed out. None
+        until both vaults are known.
+        """
+        if None in self.balances:
+            return None
+        return tuple(self.balances[side] + self.orders[side] - self.pnl[side] for side in (0, 1))
+
+    @property
+    def price(self) -> float:
+        """SOL per token, None until both reserves are known"""
+        reserves = self.reserves
+        if reserves is None or reserves[0] <= 0:
+            return None
+        token_reserve, sol_reserve = reserves
+        return (sol_reserve / 10**SOL_DECIMALS) / (token_reserve / 10**self.token_decimals)
+
+    def set_pnl(self, amm, slot: int):
+        if slot >= self.pnl_slot:
+            self.pnl = self.pair(amm.need_take_pnl_base, amm.need_take_pnl_quote)
+            self.pnl_slot = slot
+
+    def set_orders(self, totals: tuple, slot: int):
+        if slot >= self.orders_slot:
+            self.orders = self.pair(*totals)
+            self.orders_slot = slot
+
+class ReserveFeed:
+    """
+    Prices of monitored tokens computed from their Raydium AMM v4 pool's
+    reserves, pushed through accountSubscribe on the client's websocket
+    instead of polled. The reserves are the vault balances plus the pool's
+    open orders on OpenBook less the pnl owed out of the vaults, so the
+    pool state and open orders account are followed along with the
+    vaults. Both vaults change in the same slot on every swap, so a price
+    is only published once they agree on the slot. Tokens without a known
+    pool are left to the PriceMonitor's Jupiter polling.
+    """
+    def __init__(self, on_price):
+        self.on_price = on_price  # async (mint_address, price)
+        self.pools = {}  # mint address -> StreamedPool
+        self.inflight = {}  # mint address -> task setting up its stream
+        self.known = OrderedDict()  # mint address -> pool address, from detections
+
+    def __contains__(self, mint_address):
+        return mint_address in self.pools
+
+    def __len__(self):
+        return len(self.pools)
+
+    def remember(self, mint_address, pool_address):
+        """Note the pool of a detected token, sparing a lookup if it is monitored later"""
+        self.known[mint_address] = pool_address
+        self.known.move_to_end(mint_address)
+        if len(self.known) > KNOWN_POOLS_CAPACITY:
+            self.known.popitem(last=False)
+
+    async def _find_pool(self, mint_address) -> str:
+        """Address of the token's deepest Raydium SOL pair on DexScreener, None if it has none"""
+        token_info = await dexscreener_service.get_token_info(mint_address)
+        pairs = [
+            pair for pair in (token_info or {}).get("pairs") or []
+            if pair.get("dexId") == "raydium"
+            and SOL_MINT in (pair.get("baseToken", {}).get("address"), pair.get("quoteToken", {}).get("address"))
+        ]
+        if not pairs:
+            return None
+        best = max(pairs, key=lambda pair: (pair.get("liquidity") or {}).get("usd") or 0)
+        return best["pairAddress"]
+
+    async def track(self, mint_address) -> bool:
+        """
+        Start streaming a token's price from its Raydium SOL pool; False if
+        it has no AMM v4 pool, leaving it to polling. Concurrent calls for
+        the same token share one setup.
+        """
+        if mint_address in self.pools:
+            return True
+        task = self.inflight.get(mint_address)
+        if task is None:
+            task = asyncio.create_task(self._track(mint_address))
+            self.inflight[mint_address] = task
+            task.add_done_callback(lambda _: self.inflight.pop(mint_address, None))
+        # Shield so one caller being cancelled doesn't abandon the setup for the rest
+        return await asyncio.shield(task)
+
+    async def _track(self, mint_address) -> bool:
+        pool_address = self.known.get(mint_address) or await self._find_pool(mint_address)
+        if pool_address is None:
+            return False
+
+        # CPMM and CLMM pools don't decode as AMM v4 and stay on polling
+        amm = event_decoder.decode_raydium_amm(await solana_client.get_account_data(pool_address))
+        if amm is None or SOL_MINT not in (amm.base_mint, amm.quote_mint) or mint_address not in (amm.base_mint, amm.quote_mint):
+            return False
+        pool = StreamedPool(mint_address, pool_address, amm)
+
+        # Every account the reserves are made of, read at one slot
+        response = await solana_client.rpc.call(
+            "get_multiple_accounts",
+            [Pubkey.from_string(address) for address in (*pool.vaults, pool_address, pool.open_orders)],
+            commitment=Commitment("confirmed")
+        )
+        slot = response.context.slot
+        *vaults, state, open_orders = response.value
+        for side, account in enumerate(vaults):
+            if account is None:
+                return False
+            pool.balances[side] = decode_token_amount(bytes(account.data))
+            pool.slots[side] = slot
+        amm = event_decoder.decode_raydium_amm(bytes(state.data)) if state is not None else None
+        if amm is not None:
+            pool.set_pnl(amm, slot)
+        totals = decode_open_orders_totals(bytes(open_orders.data)) if open_orders is not None else None
+        if totals is not None:
+            pool.set_orders(totals, slot)
+
+        # Registered only once every account is followed; pushes arriving
+        # before then update the reserves without publishing
+        try:
+            for side, vault in enumerate(pool.vaults):
+                pool.subscriptions.append(
+                    await solana_client.subscriptions.account_subscribe(vault, self._on_vault(pool, side))
+                )
+            pool.subscriptions.append(
+                await solana_client.subscriptions.account_subscribe(pool_address, self._on_pool_state(pool))
+            )
+            pool.subscriptions.append(
+                await solana_client.subscriptions.account_subscribe(pool.open_orders, self._on_open_orders(pool))
+            )
+        except BaseException:
+            for subscription in pool.subscriptions:
+                await solana_client.subscriptions.unsubscribe(subscription)
+            raise
+        self.pools[mint_address] = pool
+        if pool.price is not None:
+            await self.on_price(mint_address, pool.price)
+        return True
+
+    def _on_vault(self, pool: StreamedPool, side: int):
+        async def on_notification(notification):
+            result = notification.result
+            amount = decode_token_amount(bytes(result.value.data))
+            if amount is None or result.context.slot < pool.slots[side]:
+                return
+            pool.balances[side] = amount
+            pool.slots[side] = result.context.slot
+            # The other vault's update for this slot is still on its way
+            if pool.slots[0] != pool.slots[1] or pool.mint_address not in self.pools:
+                return
+            pool.updates += 1
+            price = pool.price
+            if price is not None:
+                await self.on_price(pool.mint_address, price)
+
+        return on_notification
+
+    def _on_pool_state(self, pool: StreamedPool):
+        # The pnl and open orders only move with the vaults, whose update
+        # publishes the price; these just keep the next one exact
+        async def on_notification(notification):
+            result = notification.result
+            amm = event_decoder.decode_raydium_amm(bytes(result.value.data))
+            if amm is not None:
+                pool.set_pnl(amm, result.context.slot)
+
+        return on_notification
+
+    def _on_open_orders(self, pool: StreamedPool):
+        async def on_notification(notification):
+            result = notification.result
+            totals = decode_open_orders_totals(bytes(result.value.data))
+            if totals is not None:
+                pool.set_orders(totals, result.context.slot)
+
+        return on_notification
+
+    async def untrack(self, mint_address):
+        """Stop streaming a token's price, abandoning a setup still in flight."""
+        task = self.inflight.get(mint_address)
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        pool = self.pools.pop(mint_address, None)
+        if pool is None:
+            return
+        for subscription in pool.subscriptions:
+            await solana_client.subscriptions.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Streamed pools and how many price updates they pushed"""
+        return {
+            "streamed": len(self.pools),
+            "known_pools": len(self.known),
+            "updates": sum(pool.updates for pool in self.pools.values())
+        }
+
+    async def close(self):
+        """Drop every vault subscription."""
+        for mint_address in [*self.inflight, *self.pools]:
+            await self.untrack(mint_address)
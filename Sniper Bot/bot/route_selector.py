@@ -0,0 +1,85 @@
+import asyncio
+from config.settings import ROUTE_MAX_SIMULATIONS, ROUTE_DEADLINE
+from utils.transaction_simulator import transaction_simulator
+
+class RouteCandidate:
+    """One built swap for a token: its route, trade size and expected output."""
+    __slots__ = ("label", "amount", "out_amount", "transaction", "simulation")
+
+    def __init__(self, label: str, amount: int, out_amount: int, transaction):
+        self.label = label
+        self.amount = amount  # lamports in
+        self.out_amount = out_amount  # tokens out, as quoted
+        self.transaction = transaction
+        self.simulation = None
+
+    @property
+    def units_consumed(self) -> int:
+        return self.simulation["units_consumed"] if self.simulation else 0
+
+    @property
+    def score(self) -> float:
+        """Quoted output per compute unit simulated"""
+        return self.out_amount / (self.units_consumed or 1)
+
+class RouteSelector:
+    """
+    Simulates candidate swaps for a token concurrently and picks the one
+    that passes with the best output per compute unit. At most
+    max_simulations run at once across every snipe, so a burst of
+    candidates doesn't flood the RPC node. Whatever hasn't finished by
+    the deadline is cancelled and left out.
+    """
+    def __init__(self, max_simulations: int = ROUTE_MAX_SIMULATIONS, deadline: float = ROUTE_DEADLINE):
+        self.simulations = asyncio.Semaphore(max_simulations)
+        self.deadline = deadline
+        self.selections = 0
+        self.simulated = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.reranked = 0  # picks that weren't the largest quoted output
+
+    async def _simulate(self, candidate: RouteCandidate) -> RouteCandidate:
+        async with self.simulations:
+            candidate.simulation = await transaction_simulator.simulate_transaction(candidate.transaction)
+        self.simulated += 1
+        return candidate
+
+    async def select(self, candidates: list) -> tuple:
+        """The best candidate that passes simulation, as (candidate, error)"""
+        if not candidates:
+            return None, "No candidate routes"
+        if len(candidates) == 1:
+            # Nothing to choose between, so nothing to cut short either
+            candidate = await self._simulate(candidates[0])
+            done = {candidate}
+        else:
+            tasks = [asyncio.create_task(self._simulate(candidate)) for candidate in candidates]
+            finished, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+            self.timed_out += len(pending)
+            done = {task.result() for task in finished if task.exception() is None}
+        self.selections += 1
+
+        passed = [candidate for candidate in done if candidate.simulation["success"]]
+        self.failed += len(done) - len(passed)
+        if passed:
+            best = max(passed, key=lambda candidate: candidate.score)
+            if best.out_amount < max(candidate.out_amount for candidate in passed):
+                self.reranked += 1
+            return best, None
+        errors = [f"{candidate.label}: {candidate.simulation['error']}" for candidate in done]
+        if len(done) < len(candidates):
+            errors.append(f"{len(candidates) - len(done)} not simulated within {self.deadline:.2f}s")
+        return None, f"Simulation failed: {'; '.join(errors)}"
+
+    def stats(self) -> dict:
+        """Selections made and what became of their candidates"""
+        return {
+            "selections": self.selections,
+            "simulated": self.simulated,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "reranked": self.reranked
+        }
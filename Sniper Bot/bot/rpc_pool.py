@@ -0,0 +1,203 @@
+import asyncio
+import time
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException
+from config.settings import (
+    RPC_LATENCY_ALPHA,
+    RPC_EJECT_AFTER_FAILURES,
+    RPC_EJECT_SECONDS,
+    RPC_PROBE_INTERVAL
+)
+from services.http_session import http_session_manager
+
+class RpcEndpoint:
+    """One HTTP RPC endpoint with a rolling latency and error score."""
+    def __init__(self, url: str, alpha: float = RPC_LATENCY_ALPHA):
+        self.url = url
+        self.client = AsyncClient(url)
+        self.alpha = alpha
+        self.latency = 0.0  # EWMA seconds; new endpoints get tried first
+        self.error_rate = 0.0  # EWMA of failures
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    @property
+    def score(self) -> float:
+        """Lower is better: latency inflated by the recent error rate"""
+        return self.latency * (1 + 10 * self.error_rate)
+
+    async def request(self, method: str, params: list = None):
+        """Raw JSON-RPC call, for methods AsyncClient doesn't wrap; returns the result"""
+        body = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}
+        async with http_session_manager.post(self.url, json=body) as response:
+            reply = await response.json(content_type=None)
+        if reply.get("error"):
+            raise RPCException(reply["error"])
+        return reply["result"]
+
+    def record_success(self, elapsed: float):
+        self.requests += 1
+        self.latency = elapsed if self.requests == 1 else self.latency + self.alpha * (elapsed - self.latency)
+        self.error_rate -= self.alpha * self.error_rate
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def record_failure(self, eject_after: int = RPC_EJECT_AFTER_FAILURES, eject_seconds: float = RPC_EJECT_SECONDS):
+        self.requests += 1
+        self.errors += 1
+        self.error_rate += self.alpha * (1 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= eject_after and self.healthy:
+            self.ejected_until = time.monotonic() + eject_seconds
+            self.ejections += 1
+            print(f"RPC endpoint {self.url} ejected after {self.consecutive_failures} failures")
+
+class RpcPool:
+    """
+    Routes RPC calls over several endpoints.
+    Reads go to the healthy endpoint with the best score and fail over to
+    the next one on transport errors; broadcast() sends to every healthy
+    endpoint at once and returns the first accepted result. A background
+    probe keeps scores current and re-admits ejected endpoints.
+    RPCExceptions are answers from a working node, so they are raised
+    without counting against the endpoint.
+    """
+    def __init__(self, urls: list, probe_interval: float = RPC_PROBE_INTERVAL):
+        if not urls:
+            raise ValueError("At least one RPC endpoint is required")
+        self.endpoints = [RpcEndpoint(url) for url in urls]
+        self.probe_interval = probe_interval
+        self.task = None
+        self.background = set()  # broadcast calls still running after the first result
+
+    def start(self):
+        """Start the health probe loop if it is not already running."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def ranked(self) -> list:
+        """Healthy endpoints best first, or every endpoint if none are healthy"""
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy]
+        return sorted(healthy or self.endpoints, key=lambda endpoint: endpoint.score)
+
+    async def _call_endpoint(self, endpoint: RpcEndpoint, method: str, *args, **kwargs):
+        return await self._timed(endpoint, getattr(endpoint.client, method)(*args, **kwargs))
+
+    async def _timed(self, endpoint: RpcEndpoint, call):
+        started = time.monotonic()
+        try:
+            result = await call
+        except RPCException:
+            endpoint.record_success(time.monotonic() - started)
+            raise
+        except Exception:
+            endpoint.record_failure()
+            raise
+        endpoint.record_success(time.monotonic() - started)
+        return result
+
+    async def call(self, method: str, *args, **kwargs):
+        """Call an AsyncClient method on the best endpoint, failing over on transport errors"""
+        return await self._failover(method, lambda endpoint: self._call_endpoint(endpoint, method, *args, **kwargs))
+
+    async def request(self, method: str, params: list = None):
+        """Raw JSON-RPC request for methods AsyncClient lacks, routed and failed over like call()"""
+        return await self._failover(method, lambda endpoint: self._timed(endpoint, endpoint.request(method, params)))
+
+    async def _failover(self, method: str, call):
+        last_error = None
+        for endpoint in self.ranked():
+            try:
+                return await call(endpoint)
+            except RPCException:
+                raise
+            except Exception as e:
+                last_error = e
+                print(f"RPC {method} failed on {endpoint.url}: {e}")
+        raise last_error
+
+    async def broadcast(self, method: str, *args, **kwargs):
+        """
+        Call a method on every healthy endpoint concurrently and return the
+        first successful result. The other calls are left to finish in the
+        background; if none succeed the first RPC error (or last transport
+        error) is raised.
+        """
+        pending = {
+            asyncio.create_task(self._call_endpoint(endpoint, method, *args, **kwargs))
+            for endpoint in self.ranked()
+        }
+        rpc_error = None
+        last_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if isinstance(error, RPCException):
+                        rpc_error = rpc_error or error
+                    else:
+                        last_error = error
+        finally:
+            for task in pending:
+                self.background.add(task)
+                task.add_done_callback(self._discard_background)
+        raise rpc_error or last_error
+
+    def _discard_background(self, task):
+        self.background.discard(task)
+        if not task.cancelled():
+            task.exception()  # Results of the losing calls aren't needed
+
+    async def probe_once(self):
+        """Measure every endpoint with a cheap call."""
+        async def probe(endpoint):
+            try:
+                await self._call_endpoint(endpoint, "get_slot")
+            except Exception:
+                pass
+
+        await asyncio.gather(*(probe(endpoint) for endpoint in self.endpoints))
+
+    async def _run(self):
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.probe_interval)
+
+    def stats(self) -> list:
+        """Score and health of every endpoint"""
+        return [
+            {
+                "url": endpoint.url,
+                "healthy": endpoint.healthy,
+                "latency": endpoint.latency,
+                "error_rate": endpoint.error_rate,
+                "requests": endpoint.requests,
+                "errors": endpoint.errors,
+                "ejections": endpoint.ejections
+            }
+            for endpoint in self.endpoints
+        ]
+
+    async def close(self):
+        """Stop probing and close every endpoint's client."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        for task in list(self.background):
+            task.cancel()
+        for endpoint in self.endpoints:
+            await endpoint.client.close()
@@ -1,40 +1,82 @@
 import asyncio
 import base64
 import time
-import aiohttp
 # from solders.pubkey import Pubkey  # Removed unused import
 from solana.transaction import Transaction
 from config.settings import (
     RAYDIUM_AMM_PROGRAM_ID, 
     RAYDIUM_CLMM_PROGRAM_ID, 
     PUMP_FUN_PROGRAM_ID,
+    SOL_MINT,
     SNIPE_TIMEOUT,
     MAX_SLIPPAGE,
     CHECK_RUG,
-    MAX_BUY_AMOUNT
+    MAX_BUY_AMOUNT,
+    SPECULATIVE_BUILD,
+    NATIVE_RAYDIUM_SWAP,
+    ROUTE_SIZE_FRACTIONS,
+    ROUTE_DIRECT_VARIANT,
+    STREAM_POOL_PRICES,
+    DEDUP_CAPACITY,
+    DEDUP_SIGNATURE_TTL,
+    DEDUP_MINT_TTL,
+    TELEGRAM_ADMIN_ID
 )
 from bot.solana_client import solana_client
+from bot.price_monitor import PriceMonitor
+from bot.reserve_feed import ReserveFeed
+from bot.event_queue import EventQueue
+from bot.presigned_swaps import PresignedSwaps
+from bot.route_selector import RouteCandidate, RouteSelector
 from services.jupiter_service import jupiter_service
-from utils.log_parser import log_parser
-from utils.token_analyzer import token_analyzer
-from utils.transaction_simulator import transaction_simulator
+from services.dexscreener_service import dexscreener_service
+from utils.log_parser import log_parser, ParsedLog
+from utils.event_decoder import event_decoder
+from utils.raydium_swap import raydium_swap
+from utils.dedup_cache import DedupCache
+from utils.latency_tracker import Trace, latency_tracker
+from utils.state_store import state_store
+from utils.token_analyzer import token_analyzer, analysis_ttl
+from utils.container import container
 
 class SniperBot:
     def __init__(self):
         self.auto_snipe_enabled = False
         self.monitored_tokens = {}
         self.pending_snipes = {}
+        self.reserve_feed = ReserveFeed(self._handle_price_update)
+        self.price_monitor = PriceMonitor(self.monitored_tokens, self._handle_price_update, streamed=self.reserve_feed)
+        self.stream_task = None
+        self.event_queue = EventQueue()
+        self.presigned = PresignedSwaps(self._build_swap_transaction)
+        self.route_selector = RouteSelector()
+        self.seen_signatures = DedupCache(DEDUP_CAPACITY, DEDUP_SIGNATURE_TTL)
+        self.seen_mints = DedupCache(DEDUP_CAPACITY, DEDUP_MINT_TTL)
+        self.confirmation_tasks = set()
+        self.notifier = None  # the Telegram notification queue, once the bot is up
         
     async def get_status(self):
         """Get bot status information."""
-        balance = await solana_client.get_balance()
+        balance = await solana_client.get_total_balance()
+        wallets = solana_client.wallets
+        analysis_cache = token_analyzer.cache.stats()
+        dexscreener_cache = dexscreener_service.token_cache.stats()
         status = f"""
         🤖 *Bot Status* 🤖
         
-        *Wallet Balance:* {balance:.4f} SOL
+        *Wallet Balance:* {balance:.4f} SOL across {len(wallets)} wallet(s)
+        *Busy Wallets:* {wallets.stats()["busy"]}
         *Auto Snipe:* {'Enabled' if self.auto_snipe_enabled else 'Disabled'}
-        *Monitored Tokens:* {len(self.monitored_tokens)}
+        *Monitored Tokens:* {len(self.monitored_tokens)} ({len(self.reserve_feed)} streamed from pools)
         *Pending Snipes:* {len(self.pending_snipes)}
+        *Pre-signed Buys:* {len(self.presigned)} of {len(self.presigned.watchlist)} watched
+        *Queued Events:* {len(self.event_queue)}
+        *Queued Notifications:* {len(self.notifier) if self.notifier is not None else 0}
+        *Unconfirmed Transactions:* {len(solana_client.confirmations)}
+        *Priority Fee:* {solana_client.fees.price("snipe"):,} µlamports/CU for snipes
+        *Duplicates Dropped:* {self.seen_signatures.hits + self.seen_mints.hits}
+        *Analysis Cache Hits:* {analysis_cache["hit_ratio"]:.0%}, {analysis_cache["saved_time"]:.1f}s of analysis saved
+        *DexScreener Cache Hits:* {dexscreener_cache["hit_ratio"]:.0%}, {dexscreener_cache["saved_time"]:.1f}s of lookups saved
         *RPC Connection:* Active
         *Telegram Connection:* Active
         
@@ -43,61 +85,60 @@ class SniperBot:
         return status
     
     async def get_balance(self):
-        """Get wallet balance."""
-        balance = await solana_client.get_balance()
+        """Get the balance of all wallets."""
+        balance = await solana_client.get_total_balance()
         return f"{balance:.4f} SOL"
     
+    def set_auto_snipe(self, enabled):
+        """Turn auto sniping on or off, remembered across restarts."""
+        self.auto_snipe_enabled = enabled
+        state_store.put("setting", "auto_snipe_enabled", enabled)
+    
     async def manual_snipe(self, mint_address, update):
         """Manually snipe a token."""
+        amount_lamports = int(MAX_BUY_AMOUNT * 10**9)
+        wallet = solana_client.wallets.acquire(amount_lamports)
+        if wallet is None:
+            await update.message.reply_text("❌ No wallet has enough SOL for this snipe.")
+            return
+        
+        sent = False
         try:
-            # Get quote from Jupiter
-            amount_lamports = int(MAX_BUY_AMOUNT * 10**9)  # Convert SOL to lamports
-            quote = await jupiter_service.get_quote(
-                "So11111111111111111111111111111111111111112",  # SOL mint
-                mint_address,
-                amount_lamports,
-                int(MAX_SLIPPAGE * 10000)  # Convert to basis points
-            )
-            
-            if not quote:
-                await update.message.reply_text("Failed to get quote for this token.")
-                return
-            
-            # Get swap transaction
-            swap_transaction = await jupiter_service.get_swap_transaction(
-                quote,
-                str(solana_client.keypair.pubkey())
-            )
-            
-            if not swap_transaction or 'swapTransaction' not in swap_transaction:
-                await update.message.reply_text("Failed to create swap transaction.")
+            candidates, error = await self._build_candidates(mint_address, payer=wallet.keypair)
+            if not candidates:
+                await update.message.reply_text(f"{error}.")
                 return
             
-            # Decode and send transaction
-            transaction_data = base64.b64decode(swap_transaction['swapTransaction'])
-            transaction = Transaction.deserialize(transaction_data)
-            
-            # Simulate transaction first
-            simulation = await transaction_simulator.simulate_transaction(transaction)
-            if not simulation["success"]:
-                await update.message.reply_text(f"❌ Simulation failed: {simulation['error']}")
+            # Simulate every candidate and keep the best that passes
+            best, error = await self.route_selector.select(candidates)
+            if best is None:
+                await update.message.reply_text(f"❌ {error}")
                 return
+            transaction = solana_client.fees.apply(best.transaction, best.units_consumed, "manual")
             
             # Execute the transaction
-            result = await solana_client.send_transaction(transaction)
+            send_started = time.monotonic()
+            result = await solana_client.send_transaction(transaction, signer=wallet.keypair)
             
             if result:
                 signature = result
+                sent = True
+                wallet.sends += 1
                 explorer_url = f"https://solscan.io/tx/{signature}"
                 await update.message.reply_text(
                     f"✅ Successfully sniped {mint_address[:8]}...!\n"
                     f"Transaction: {explorer_url}"
                 )
+                
+                confirmation = await solana_client.confirm_transaction(signature, transaction, send_started)
+                await update.message.reply_text(self._format_confirmation(confirmation))
             else:
                 await update.message.reply_text("❌ Failed to execute swap transaction.")
                 
         except Exception as e:
             await update.message.reply_text(f"❌ Error during snipe: {str(e)}")
+        finally:
+            solana_client.wallets.release(wallet, amount_lamports, settled=sent)
     
     async def monitor_token(self, mint_address, update):
         """Monitor a token's price."""
@@ -110,134 +151,489 @@ class SniperBot:
             "start_time": time.time(),
             "chat_id": update.effective_chat.id
         }
+        state_store.put("monitored_token", mint_address, self.monitored_tokens[mint_address])
         
         await update.message.reply_text(f"Started monitoring {mint_address[:8]}...")
+        if await self._stream_price(mint_address):
+            pool_address = self.reserve_feed.pools[mint_address].pool_address
+            await update.message.reply_text(f"Streaming its price from Raydium pool {pool_address[:8]}...")
         
-        # Start monitoring in background
-        asyncio.create_task(self._monitor_token_price(mint_address))
+        # Tokens without a streamed pool share one batched polling loop
+        self.price_monitor.ensure_running()
     
-    async def _monitor_token_price(self, mint_address):
-        """Background task to monitor token price."""
+    async def unmonitor_token(self, mint_address, update):
+        """Stop monitoring a token's price."""
+        if mint_address not in self.monitored_tokens:
+            await update.message.reply_text(f"Not monitoring {mint_address[:8]}...")
+            return
+        
+        del self.monitored_tokens[mint_address]
+        state_store.delete("monitored_token", mint_address)
+        await self.reserve_feed.untrack(mint_address)
+        await update.message.reply_text(f"Stopped monitoring {mint_address[:8]}...")
+    
+    async def _stream_price(self, mint_address):
+        """Follow a monitored token's pool reserves instead of polling its price; False if it can't be."""
+        if not STREAM_POOL_PRICES:
+            return False
         try:
-            while mint_address in self.monitored_tokens:
-                # Get price from Jupiter
-                url = f"https://price.jup.ag/v4/price?ids={mint_address}"
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            if mint_address in data.get('data', {}):
-                                price = data['data'][mint_address]['price']
-                                
-                                # Check if price has changed significantly
-                                monitor_data = self.monitored_tokens[mint_address]
-                                if monitor_data['last_price'] > 0 and abs(price - monitor_data['last_price']) / max(monitor_data['last_price'], 1e-9) > 0.05:  # 5% change
-                                    message = (
-                                        f"📈 Price Alert!\n"
-                                        f"Token: {mint_address[:8]}...\n"
-                                        f"Price: ${price:.8f}\n"
-                                        f"Change: {((price - monitor_data['last_price']) / max(monitor_data['last_price'], 1e-9) * 100):.2f}%"
-                                    )
-                                    
-                                    # This would need access to the telegram bot instance
-                                    # await self.telegram_bot.send_message(
-                                    #     monitor_data['chat_id'],
-                                    #     message
-                                    # )
-                                    print(message)  # For now, just print
-                                
-                                monitor_data['last_price'] = price
-                        
-                        await asyncio.sleep(10)  # Check every 10 seconds
-                
+            return await self.reserve_feed.track(mint_address)
         except Exception as e:
-            print(f"Error monitoring token {mint_address}: {e}")
-            if mint_address in self.monitored_tokens:
-                del self.monitored_tokens[mint_address]
+            print(f"Error streaming price of {mint_address}: {e}")
+            return False
+    
+    async def _stream_prices(self, mint_addresses):
+        await asyncio.gather(*(self._stream_price(mint_address) for mint_address in mint_addresses))
     
-    async def _handle_amm_pool_creation(self, logs, signature):
+    async def watch_token(self, mint_address, update):
+        """Keep a buy for a token signed ahead of time, sent as soon as its pool appears."""
+        if mint_address in self.presigned:
+            await update.message.reply_text(f"Already watching {mint_address[:8]}...")
+            return
+        
+        # A mint without a route is bought through the pool its market will
+        # get, which needs a price to bound the buy by or a slippage that doesn't
+        reason = await self.presigned.check(mint_address)
+        if reason:
+            await update.message.reply_text(f"Can't pre-sign a buy for {mint_address[:8]}...: {reason}")
+            return
+        
+        self.presigned.watch(mint_address)
+        state_store.put("watched_token", mint_address, True)
+        
+        if not solana_client.nonces.stats()["ready"]:
+            await update.message.reply_text(
+                f"Watching {mint_address[:8]}..., but there is no nonce account to pre-sign with. "
+                "Set NONCE_ACCOUNTS or use /nonce create."
+            )
+            return
+        await update.message.reply_text(f"Watching {mint_address[:8]}..., its buy will be pre-signed")
+    
+    async def unwatch_token(self, mint_address, update):
+        """Stop pre-signing a buy for a token."""
+        if mint_address not in self.presigned:
+            await update.message.reply_text(f"Not watching {mint_address[:8]}...")
+            return
+        
+        self.presigned.unwatch(mint_address)
+        state_store.delete("watched_token", mint_address)
+        await update.message.reply_text(f"Stopped watching {mint_address[:8]}...")
+    
+    async def manage_nonce_accounts(self, args, update):
+        """List, create or close the durable nonce accounts used for pre-signing."""
+        nonces = solana_client.nonces
+        if args and args[0] == "create":
+            await update.message.reply_text("Creating nonce account...")
+            address = await solana_client.create_nonce_account()
+            if address:
+                await update.message.reply_text(f"✅ Nonce account {address} created")
+            else:
+                await update.message.reply_text("❌ Failed to create nonce account.")
+        elif args and args[0] == "close" and len(args) > 1:
+            signature = await solana_client.close_nonce_account(args[1])
+            if signature:
+                await update.message.reply_text(f"✅ Closed nonce account {args[1][:8]}...\nTransaction: https://solscan.io/tx/{signature}")
+            else:
+                await update.message.reply_text(f"❌ Failed to close nonce account {args[1][:8]}...")
+        else:
+            lines = [
+                f"{address[:8]}... {account.lamports / 10**9:.4f} SOL, {account.bound} pre-signed, advanced {account.advances}x"
+                for address, account in nonces.accounts.items()
+            ]
+            await update.message.reply_text("\n".join(lines) or "No nonce accounts. Use /nonce create.")
+    
+    async def _handle_price_update(self, mint_address, price):
+        """Check a price, polled or streamed, against the last one and alert on big moves."""
+        monitor_data = self.monitored_tokens[mint_address]
+        
+        # Check if price has changed significantly
+        if monitor_data['last_price'] > 0 and abs(price - monitor_data['last_price']) / max(monitor_data['last_price'], 1e-9) > 0.05:  # 5% change
+            message = (
+                f"📈 Price Alert!\n"
+                f"Token: {mint_address[:8]}...\n"
+                f"Price: {price:.10f} SOL\n"
+                f"Change: {((price - monitor_data['last_price']) / max(monitor_data['last_price'], 1e-9) * 100):.2f}%"
+            )
+            
+            # A newer alert for the token replaces one that hasn't gone out yet
+            self._notify(monitor_data['chat_id'], message, "alert", key=f"price:{mint_address}")
+            print(message)
+        
+        monitor_data['last_price'] = price
+        state_store.put("monitored_token", mint_address, monitor_data)
+    
+    async def _handle_amm_pool_creation(self, logs, signature, received_at=None):
         """Handle AMM pool creation events."""
-        if not self.auto_snipe_enabled:
+        # Watched mints are bought even with auto-snipe off
+        if not self.auto_snipe_enabled and not self.presigned.watchlist:
             return
         
         try:
             # Parse logs
             log_data = log_parser.parse_raydium_amm_logs(logs, signature)
-            
-            if log_data.get("mint_address") and log_data.get("action") == "pool_creation":
-                mint_address = log_data["mint_address"]
-                
-                # Check if we're already processing this mint
-                if mint_address in self.pending_snipes:
-                    return
-                
-                # Add to pending snipes
-                self.pending_snipes[mint_address] = {
-                    "discovered_at": time.time(),
-                    "signature": signature,
-                    "program": "raydium_amm"
-                }
-                
-                # Analyze token
-                analysis = await token_analyzer.analyze_token(mint_address)
-                
-                if analysis["is_valid"] and not analysis["is_rug"]:
-                    # This is where we would auto-snipe
-                    print(f"✅ Valid token found: {mint_address}")
-                    # await self.auto_snipe(mint_address, analysis)
-                else:
-                    print(f"❌ Skipping token {mint_address}: {analysis['warnings']}")
-                    del self.pending_snipes[mint_address]
-                        
+            if log_data and log_data.action == "pool_creation":
+                trace = Trace(received_at)
+                trace.mark("parsed")
+                pool = None
+                if log_data.mint_address is None:
+                    market = await self._resolve_raydium_mint(log_data)
+                    trace.mark("resolved")
+                    if market is not None:
+                        self.reserve_feed.remember(log_data.mint_address, log_data.pool_address)
+                    # The market and the init log hold every key and reserve a direct swap needs
+                    if NATIVE_RAYDIUM_SWAP:
+                        pool = raydium_swap.pool_from_log(log_data, market)
+                await self._handle_new_token(log_data, trace, pool)
         except Exception as e:
             print(f"Error handling AMM pool creation: {e}")
     
-    async def auto_snipe(self, mint_address, analysis):
-        """Execute an auto-snipe for a token."""
+    async def _resolve_raydium_mint(self, log_data):
+        """Fill in the token mint of a new Raydium pool from its market account, returning the decoded market."""
+        data = await solana_client.get_account_data(log_data.market)
+        market = event_decoder.decode_serum_market(data)
+        if market is None:
+            return None
+        
+        # The sniped token is whichever side isn't SOL
+        log_data.mint_address = market.quote_mint if market.base_mint == SOL_MINT else market.base_mint
+        return market
+    
+    async def _handle_clmm_event(self, logs, signature, received_at=None):
+        """Handle Raydium CLMM events."""
+        # Watched mints are bought even with auto-snipe off
+        if not self.auto_snipe_enabled and not self.presigned.watchlist:
+            return
+        
+        try:
+            log_data = log_parser.parse_raydium_clmm_logs(logs, signature)
+            if log_data and log_data.action == "position_opened":
+                trace = Trace(received_at)
+                trace.mark("parsed")
+                await self._handle_new_token(log_data, trace)
+        except Exception as e:
+            print(f"Error handling CLMM event: {e}")
+    
+    async def _handle_pump_fun_event(self, logs, signature, received_at=None):
+        """Handle Pump.fun token creation and migration events."""
+        # Watched mints are bought even with auto-snipe off
+        if not self.auto_snipe_enabled and not self.presigned.watchlist:
+            return
+        
         try:
-            # Similar to manual_snipe but with auto parameters
-            amount_lamports = int(MAX_BUY_AMOUNT * 10**9)
-            quote = await jupiter_service.get_quote(
-                "So11111111111111111111111111111111111111112",
-                mint_address,
-                amount_lamports,
-                int(MAX_SLIPPAGE * 10000)
-            )
+            log_data = log_parser.parse_pump_fun_logs(logs, signature)
+            if log_data and log_data.action in ("token_creation", "migration_initiated"):
+                trace = Trace(received_at)
+                trace.mark("parsed")
+                await self._handle_new_token(log_data, trace)
+        except Exception as e:
+            print(f"Error handling Pump.fun event: {e}")
+    
+    async def _handle_new_token(self, log_data, trace=None, pool=None):
+        """
+        Analyze a newly discovered token and decide whether to snipe it.
+        pool holds the keys of a Raydium AMM v4 pool to swap through
+        directly; without it the swap goes through Jupiter.
+        """
+        mint_address = log_data.mint_address
+        if not mint_address:
+            return
+        
+        # With auto-snipe off only watched mints are bought
+        if not self.auto_snipe_enabled and mint_address not in self.presigned:
+            return
+        
+        # Drop repeats of the same event for this mint (reconnect replays,
+        # overlapping subscriptions); a later migration is still a new event.
+        # A skip that may not hold next time forgets the mark so a replay
+        # gets another chance
+        seen_key = (log_data.action, mint_address)
+        if self.seen_mints.seen(seen_key):
+            return
+        
+        trace = trace or Trace()
+        trace.mint_address = mint_address
+        trace.mark("deduped")
+        
+        # A watchlisted mint's buy was signed ahead of time; send it as is.
+        # One signed for a Raydium pool that doesn't exist yet waits for its creation
+        if mint_address in self.presigned:
+            if self.presigned.awaits_pool(mint_address, log_data.pool_address):
+                return
+            presigned = self.presigned.take(mint_address)
+            state_store.delete("watched_token", mint_address)
+            if presigned is not None:
+                try:
+                    await self._snipe_presigned(mint_address, presigned, trace)
+                finally:
+                    latency_tracker.finish(trace)
+                return
+        
+        # Each snipe gets its own fee payer, so parallel snipes don't spend
+        # the same balance or queue behind one wallet
+        amount_lamports = int(MAX_BUY_AMOUNT * 10**9)
+        wallet = solana_client.wallets.acquire(amount_lamports)
+        if wallet is None:
+            print(f"❌ Skipping token {mint_address}: no wallet can cover {MAX_BUY_AMOUNT} SOL")
+            self.seen_mints.discard(seen_key)
+            return
+        
+        # Add to pending snipes
+        self.pending_snipes[mint_address] = {
+            "discovered_at": time.time(),
+            "signature": log_data.signature,
+            "program": log_data.program,
+            "trace": trace
+        }
+        # Saved so a restart can retry it; most snipes finish before the next flush
+        state_store.put("pending_snipe", mint_address, {
+            "discovered_at": time.time(),
+            "signature": log_data.signature,
+            "program": log_data.program,
+            "action": log_data.action
+        }, time.time() + SNIPE_TIMEOUT)
+        
+        # Quote and build the swap while the token is being analyzed
+        prepared = None
+        if SPECULATIVE_BUILD:
+            prepared = asyncio.create_task(self._prepare_swap(mint_address, trace, wallet.keypair, pool))
+        
+        try:
+            # Analyze token
+            analysis = await token_analyzer.analyze_token(mint_address)
+            trace.mark("analyzed")
             
-            if not quote:
-                print(f"Failed to get quote for {mint_address}")
+            if analysis["is_valid"] and not analysis["is_rug"]:
+                print(f"✅ Valid token found: {mint_address}")
+                await self.auto_snipe(mint_address, analysis, prepared, trace, wallet, pool)
+            else:
+                print(f"❌ Skipping token {mint_address}: {analysis['warnings']}")
+                # An analysis that hit an API error isn't cached; don't dedup it either
+                if analysis_ttl(analysis) == 0:
+                    self.seen_mints.discard(seen_key)
+        except Exception:
+            self.seen_mints.discard(seen_key)
+            raise
+        finally:
+            if prepared is not None and not prepared.done():
+                prepared.cancel()
+            self.pending_snipes.pop(mint_address, None)
+            state_store.delete("pending_snipe", mint_address)
+            solana_client.wallets.release(wallet, amount_lamports)
+            latency_tracker.finish(trace)
+    
+    async def _build_swap_transaction(self, mint_address, trace=None, payer=None, pool=None):
+        """
+        Quote a SOL -> token swap of MAX_BUY_AMOUNT and build its
+        transaction, paid by payer (the primary wallet by default).
+        Returns (transaction, quote, error).
+        """
+        amount_lamports = int(MAX_BUY_AMOUNT * 10**9)  # Convert SOL to lamports
+        return await self._build_route(mint_address, amount_lamports, trace, payer, pool)
+    
+    def _routes(self, pool=None):
+        """(label, lamports in, direct only) of every candidate route for a snipe"""
+        routes = []
+        for fraction in ROUTE_SIZE_FRACTIONS:
+            amount_lamports = int(MAX_BUY_AMOUNT * min(fraction, 1.0) * 10**9)
+            size = f" {fraction:.0%}" if len(ROUTE_SIZE_FRACTIONS) > 1 else ""
+            if pool is not None:
+                routes.append((f"raydium{size}", amount_lamports, False))
+                continue
+            routes.append((f"jupiter{size}", amount_lamports, False))
+            if ROUTE_DIRECT_VARIANT:
+                routes.append((f"jupiter direct{size}", amount_lamports, True))
+        return routes
+    
+    async def _build_candidates(self, mint_address, trace=None, payer=None, pool=None):
+        """
+        Quote and build every candidate route concurrently. Returns
+        (candidates, error), the error saying why none could be built.
+        """
+        routes = self._routes(pool)
+        results = await asyncio.gather(
+            *(self._build_route(mint_address, amount_lamports, trace, payer, pool, direct) for _, amount_lamports, direct in routes),
+            return_exceptions=True
+        )
+        
+        candidates = []
+        errors = []
+        for (label, amount_lamports, _), result in zip(routes, results):
+            if isinstance(result, Exception):
+                errors.append((label, str(result)))
+                continue
+            transaction, quote, error = result
+            if transaction is None:
+                errors.append((label, error))
+                continue
+            candidates.append(RouteCandidate(label, amount_lamports, int(quote["outAmount"]), transaction))
+        if candidates:
+            return candidates, None
+        if len(errors) == 1:
+            return [], errors[0][1]
+        return [], "; ".join(f"{label}: {error}" for label, error in errors)
+    
+    async def _build_route(self, mint_address, amount_lamports, trace=None, payer=None, pool=None, direct=False):
+        """
+        Quote a SOL -> token swap and build its transaction, paid by payer
+        (the primary wallet by default). Returns (transaction, quote, error).
+        A Raydium pool's swap is quoted from its reserves and built locally;
+        anything else goes through Jupiter, direct restricting it to
+        single-hop routes.
+        """
+        payer = payer or solana_client.keypair
+        if pool is not None:
+            return await self._build_raydium_swap(pool, amount_lamports, trace, payer)
+        
+        quote = await jupiter_service.get_quote(
+            SOL_MINT,
+            mint_address,
+            amount_lamports,
+            int(MAX_SLIPPAGE * 10000),  # Convert to basis points
+            only_direct_routes=direct
+        )
+        
+        if not quote:
+            return None, None, "Failed to get quote for this token"
+        if trace:
+            trace.mark("quoted")
+        
+        swap_transaction = await jupiter_service.get_swap_transaction(
+            quote,
+            str(payer.pubkey())
+        )
+        
+        if not swap_transaction or 'swapTransaction' not in swap_transaction:
+            return None, None, "Failed to create swap transaction"
+        
+        transaction_data = base64.b64decode(swap_transaction['swapTransaction'])
+        transaction = Transaction.deserialize(transaction_data)
+        if trace:
+            trace.mark("built")
+        return transaction, quote, None
+    
+    async def _build_raydium_swap(self, pool, amount_lamports, trace, payer):
+        """Quote from the pool's reserves and build the swap in-process, without any HTTP round trip."""
+        quote = raydium_swap.get_quote(pool, SOL_MINT, amount_lamports, int(MAX_SLIPPAGE * 10000))
+        if int(quote["outAmount"]) <= 0:
+            return None, None, "Pool has no liquidity for this swap"
+        if trace:
+            trace.mark("quoted")
+        
+        # Stamped with the cached blockhash so sending doesn't have to
+        blockhash, _ = await solana_client.blockhash_cache.get()
+        transaction = raydium_swap.build_buy_transaction(pool, payer.pubkey(), quote, blockhash)
+        if trace:
+            trace.mark("built")
+        return transaction, quote, None
+    
+    async def _prepare_swap(self, mint_address, trace, payer=None, pool=None):
+        """Build the candidate swaps, printing why if none can be built."""
+        candidates, error = await self._build_candidates(mint_address, trace, payer, pool)
+        if not candidates:
+            print(f"{error} ({mint_address})")
+        return candidates
+    
+    async def _snipe_presigned(self, mint_address, presigned, trace):
+        """
+        Broadcast a pre-signed buy, skipping analysis, quoting, building
+        and simulation, which all happened when it was signed.
+        """
+        # Pre-signed buys are always paid by the primary wallet, the nonce authority
+        wallet = solana_client.wallets.primary
+        amount_lamports = int(MAX_BUY_AMOUNT * 10**9)
+        solana_client.wallets.retain(wallet, amount_lamports)
+        try:
+            signature = await solana_client.send_nonce_transaction(presigned.raw_transaction, presigned.nonce_address, presigned.nonce)
+            trace.mark("sent")
+            if not signature:
+                print(f"❌ Failed to send pre-signed buy for {mint_address}")
                 return
             
-            swap_transaction = await jupiter_service.get_swap_transaction(
-                quote,
-                str(solana_client.keypair.pubkey())
-            )
+            wallet.sends += 1
+            print(f"✅ Auto-sniped {mint_address[:8]}... with a pre-signed buy! Tx: {signature}")
+            self._notify(TELEGRAM_ADMIN_ID, f"✅ Auto-sniped {mint_address[:8]}... with a pre-signed buy!\nTx: https://solscan.io/tx/{signature}", "fill")
+            print(f"⏱ {mint_address[:8]}... received→sent {trace.elapsed('sent') * 1000:.0f}ms (pre-signed)")
+            
+            solana_client.wallets.retain(wallet, amount_lamports)
+            task = asyncio.create_task(self._report_confirmation(mint_address, signature, None, trace, wallet))
+            self.confirmation_tasks.add(task)
+            task.add_done_callback(self.confirmation_tasks.discard)
+        except Exception as e:
+            print(f"❌ Error sending pre-signed buy: {str(e)}")
+        finally:
+            solana_client.wallets.release(wallet, amount_lamports)
+    
+    def _notify(self, chat_id, text, priority, key=None):
+        """Queue a Telegram notification; never waits on Telegram."""
+        if self.notifier is not None and chat_id is not None:
+            self.notifier.put(chat_id, text, priority, key)
+    
+    def _report_latency(self, mint_address, trace, speculative):
+        """Print where the time went between the notification and the send."""
+        def ms(stage):
+            return trace.elapsed(stage) * 1000 if stage in trace.stages else 0
+        
+        line = (
+            f"⏱ {mint_address[:8]}... received→sent {ms('sent'):.0f}ms "
+            f"(parsed {ms('parsed'):.0f}ms, analyzed {ms('analyzed'):.0f}ms, quoted {ms('quoted'):.0f}ms, "
+            f"built {ms('built'):.0f}ms, simulated {ms('simulated'):.0f}ms)"
+        )
+        if speculative:
+            # The build started at dedup, so this much of it overlapped analysis
+            saved = min(ms('analyzed'), ms('built')) - ms('deduped')
+            line += f", {saved:.0f}ms saved by speculative build"
+        print(line)
+    
+    async def auto_snipe(self, mint_address, analysis, prepared=None, trace=None, wallet=None, pool=None):
+        """
+        Execute an auto-snipe for a token, using the candidate swaps from a
+        speculative _prepare_swap task when one was started. wallet is the
+        one acquired from the pool for this snipe; without it the primary
+        wallet pays. pool is a Raydium pool to swap through directly.
+        """
+        if trace is None:
+            trace = Trace()
+            trace.mint_address = mint_address
+        payer = wallet.keypair if wallet else None
+        
+        try:
+            if prepared is not None:
+                candidates = await prepared
+            else:
+                candidates = await self._prepare_swap(mint_address, trace, payer, pool)
             
-            if not swap_transaction or 'swapTransaction' not in swap_transaction:
+            if not candidates:
                 print(f"Failed to create swap transaction for {mint_address}")
                 return
             
-            transaction_data = base64.b64decode(swap_transaction['swapTransaction'])
-            transaction = Transaction.deserialize(transaction_data)
-            
-            # Simulate transaction first
-            simulation = await transaction_simulator.simulate_transaction(transaction)
-            if not simulation["success"]:
-                print(f"Simulation failed for {mint_address}: {simulation['error']}")
+            # Simulate every candidate and keep the best that passes
+            best, error = await self.route_selector.select(candidates)
+            if best is None:
+                print(f"{error} ({mint_address})")
                 return
+            trace.mark("simulated")
+            
+            # Size the compute budget to the simulation and bid from the sampled fees
+            transaction = solana_client.fees.apply(best.transaction, best.units_consumed, "snipe")
             
             # Execute the transaction
-            result = await solana_client.send_transaction(transaction)
+            result = await solana_client.send_transaction(transaction, signer=payer)
+            trace.mark("sent")
             
             if result:
                 signature = result
                 print(f"✅ Auto-sniped {mint_address[:8]}...! Tx: {signature}")
-                # Send Telegram notification
-                # await self.telegram_bot.send_message(
-                #     TELEGRAM_ADMIN_ID,
-                #     f"✅ Auto-sniped {mint_address[:8]}...!\nTx: https://solscan.io/tx/{signature}"
-                # )
+                self._report_latency(mint_address, trace, prepared is not None)
+                
+                # Don't hold an event worker while the transaction confirms;
+                # the wallet's buy stays reserved until it does
+                if wallet:
+                    wallet.sends += 1
+                    solana_client.wallets.retain(wallet, int(MAX_BUY_AMOUNT * 10**9))
+                task = asyncio.create_task(self._report_confirmation(mint_address, signature, transaction, trace, wallet))
+                self.confirmation_tasks.add(task)
+                task.add_done_callback(self.confirmation_tasks.discard)
+                self._notify(TELEGRAM_ADMIN_ID, f"✅ Auto-sniped {mint_address[:8]}...!\nTx: https://solscan.io/tx/{signature}", "fill")
             else:
                 print(f"❌ Failed to execute auto-snipe for {mint_address}")
                 
@@ -247,23 +643,129 @@ class SniperBot:
             # Remove from pending snipes
             if mint_address in self.pending_snipes:
                 del self.pending_snipes[mint_address]
+                state_store.delete("pending_snipe", mint_address)
+    
+    async def _report_confirmation(self, mint_address, signature, transaction, trace, wallet=None):
+        """Wait for an auto-snipe to land and print the outcome."""
+        try:
+            # Pre-signed buys go out straight after dedup, without a simulation
+            sent_at = trace.stages.get("simulated", trace.stages["deduped"])
+            confirmation = await solana_client.confirm_transaction(signature, transaction, sent_at)
+            if confirmation["status"] == "confirmed":
+                trace.mark("confirmed")
+                latency_tracker.finish(trace)
+            outcome = f"{mint_address[:8]}... {self._format_confirmation(confirmation)}"
+            print(outcome)
+            self._notify(TELEGRAM_ADMIN_ID, outcome, "fill")
+        except Exception as e:
+            print(f"Error tracking confirmation of {signature}: {e}")
+        finally:
+            if wallet:
+                solana_client.wallets.release(wallet, int(MAX_BUY_AMOUNT * 10**9), settled=True)
+    
+    @staticmethod
+    def _format_confirmation(confirmation):
+        """One-line summary of a confirmation tracker result."""
+        if confirmation["status"] == "expired":
+            return "⌛ Transaction expired before it landed."
+        
+        timing = (
+            f"slot {confirmation['slot']}, processed after {confirmation['time_to_processed'] * 1000:.0f}ms, "
+            f"confirmed after {confirmation['time_to_confirmed'] * 1000:.0f}ms"
+        )
+        if confirmation["status"] == "failed":
+            return f"❌ Transaction failed on-chain ({timing}): {confirmation['error']}"
+        return f"✅ Transaction confirmed ({timing})"
+    
+    def _ingest(self, program, handler):
+        """Websocket callback that hands notifications to the worker pool."""
+        async def enqueue(logs, signature):
+            received_at = time.monotonic()
+            # Duplicates are dropped before they cost a queue slot or a parse
+            if self.seen_signatures.seen(signature):
+                return
+            await self.event_queue.put(program, handler, logs, signature, received_at)
+        return enqueue
+    
+    def log_callbacks(self):
+        """Log notification callback for each monitored program id."""
+        return {
+            RAYDIUM_AMM_PROGRAM_ID: self._ingest("raydium_amm", self._handle_amm_pool_creation),
+            RAYDIUM_CLMM_PROGRAM_ID: self._ingest("raydium_clmm", self._handle_clmm_event),
+            PUMP_FUN_PROGRAM_ID: self._ingest("pump_fun", self._handle_pump_fun_event)
+        }
+    
+    async def restore_state(self):
+        """
+        Reload what was saved before a restart: the auto-snipe setting,
+        monitored and watched tokens, cached analyses, and snipes
+        interrupted while still within SNIPE_TIMEOUT, which are queued again.
+        """
+        state = await state_store.load()
+        if not state:
+            return
+        
+        setting = state.get("setting", {}).get("auto_snipe_enabled")
+        if setting is not None:
+            self.auto_snipe_enabled = setting[0]
+        
+        for mint_address, (monitor_data, _) in state.get("monitored_token", {}).items():
+            self.monitored_tokens.setdefault(mint_address, monitor_data)
+        if self.monitored_tokens:
+            self.price_monitor.ensure_running()
+            # Pool lookups run in the background so they don't hold up startup
+            self.stream_task = asyncio.create_task(self._stream_prices(list(self.monitored_tokens)))
+        
+        for mint_address in state.get("watched_token", {}):
+            self.presigned.watch(mint_address)
+        
+        analyses = state.get("analysis", {})
+        token_analyzer.restore(analyses)
+        
+        resumed = 0
+        for mint_address, (pending, _) in state.get("pending_snipe", {}).items():
+            state_store.delete("pending_snipe", mint_address)
+            if not self.auto_snipe_enabled:
+                continue
+            log_data = ParsedLog(pending["program"], pending["signature"], pending["action"])
+            log_data.mint_address = mint_address
+            await self.event_queue.put(pending["program"], self._handle_new_token, log_data)
+            resumed += 1
+        
+        print(
+            f"Restored {len(self.monitored_tokens)} monitored tokens, {len(self.presigned.watchlist)} watched tokens "
+            f"and {len(analyses)} analyses, "
+            f"resumed {resumed} snipes"
+        )
     
     async def start_monitoring(self):
         """Start monitoring for new pools."""
-        # Monitor Raydium AMM
-        asyncio.create_task(
-            solana_client.monitor_logs(
-                RAYDIUM_AMM_PROGRAM_ID,
-                self._handle_amm_pool_creation
-            )
-        )
+        self.event_queue.start()
+        state_store.start()
+        solana_client.start()
+        latency_tracker.start()
+        await solana_client.start_nonces()
+        await solana_client.start_balances()
+        await self.restore_state()
+        self.presigned.start()
         
-        # Could add monitoring for other programs here
-        # (CLMM, Pump.fun, etc.)
+        # All programs share the client's multiplexed websocket
+        for program_id, callback in self.log_callbacks().items():
+            await solana_client.monitor_logs(program_id, callback)
     
     async def close(self):
         """Cleanup resources."""
+        if self.stream_task and not self.stream_task.done():
+            self.stream_task.cancel()
+        await self.reserve_feed.close()
+        await self.price_monitor.close()
+        await self.presigned.close()
+        await self.event_queue.close()
+        await state_store.close()
+        await latency_tracker.close()
+        for task in list(self.confirmation_tasks):
+            task.cancel()
         await solana_client.close()
 
-# Global instance
-sniper_bot = SniperBot()
+# Global instance, built on first use
+sniper_bot = container.register("sniper_bot", SniperBot)
@@ -1,64 +1,113 @@
 import asyncio
 import base64
 import base58
-from solana.rpc.async_api import AsyncClient
-from solana.rpc.websocket_api import connect
+import time
 from solana.rpc.commitment import Commitment
 from solana.transaction import Transaction
 from solana.publickey import PublicKey
 from solana.rpc.types import Signature
-from solders.rpc.config import RpcTransactionLogsFilterMode
 from solana.rpc.types import TxOpts
+from solana.rpc.core import RPCException
+from solders.pubkey import Pubkey
+from solders.signature import Signature as SoldersSignature
 from solana.keypair import Keypair
-from config.settings import SOLANA_RPC_HTTP_URL, SOLANA_RPC_WS_URL
+from config.settings import (
+    SOLANA_RPC_HTTP_URLS,
+    SOLANA_RPC_WS_URLS,
+    WS_POOL_SIZE,
+    RECORD_LOG_STREAM,
+    BLOCKHASH_MIN_REMAINING_BLOCKS,
+    SEND_RETRY_INTERVAL,
+    NONCE_ACCOUNTS,
+    PRESIGN_SEND_WINDOW
+)
+from bot.rpc_pool import RpcPool
+from bot.subscription_manager import SubscriptionManager
+from bot.blockhash_cache import BlockhashCache
+from bot.confirmation_tracker import ConfirmationTracker
+from bot.wallet_pool import WalletPool
+from bot.nonce_manager import NonceManager, NONCE_ACCOUNT_SIZE
+from bot.fee_estimator import FeeEstimator
+from bot.balance_cache import BalanceCache
 from utils.security import security_manager
+from utils.stream_recorder import stream_recorder
+from utils.container import container
 
 class SolanaClient:
     def __init__(self):
-        self.http_client = AsyncClient(SOLANA_RPC_HTTP_URL)
-        self.ws_client = None
-        self.keypair = self._load_wallet()
+        self.rpc = RpcPool(SOLANA_RPC_HTTP_URLS)
+        self.subscriptions = SubscriptionManager(SOLANA_RPC_WS_URLS, WS_POOL_SIZE)
+        self.blockhash_cache = BlockhashCache(self.rpc)
+        self.confirmations = ConfirmationTracker(self.subscriptions, self.rpc, self.blockhash_cache)
+        self.wallets = WalletPool(self.rpc, self._load_wallets())
+        self.keypair = self.wallets.primary.keypair
+        self.nonces = NonceManager(self.rpc, self.subscriptions, self.keypair, NONCE_ACCOUNTS)
+        self.fees = FeeEstimator(self.rpc)
+        self.balances = BalanceCache(self.rpc, self.subscriptions, self.wallets)
         
-    def _load_wallet(self):
-        """Load wallet from encrypted private key."""
-        from config.settings import WALLET_PRIVATE_KEY
+    def _load_wallets(self):
+        """Load the pool's wallets from encrypted private keys."""
+        from config.settings import WALLET_PRIVATE_KEYS
         
-        if not WALLET_PRIVATE_KEY:
+        if not WALLET_PRIVATE_KEYS:
             raise ValueError("Wallet private key not found in environment variables")
         
-        try:
-            # Decrypt the private key
-            decrypted_key = security_manager.decrypt_data(WALLET_PRIVATE_KEY)
-            
-            # Decode base58 private key
-            private_key_bytes = base58.b58decode(decrypted_key)
-            return Keypair.from_bytes(private_key_bytes)
-        except Exception as e:
-            raise ValueError(f"Failed to load wallet: {e}")
+        keypairs = []
+        for index, encrypted_key in enumerate(WALLET_PRIVATE_KEYS):
+            try:
+                # Decrypt the private key
+                decrypted_key = security_manager.decrypt_data(encrypted_key)
+                
+                # Decode base58 private key
+                private_key_bytes = base58.b58decode(decrypted_key)
+                keypairs.append(Keypair.from_bytes(private_key_bytes))
+            except Exception as e:
+                raise ValueError(f"Failed to load wallet {index + 1}: {e}")
+        return keypairs
     
     async def get_balance(self):
-        """Get the wallet balance."""
+        """Get the primary wallet's balance, from the balance cache."""
         try:
-            balance = await self.http_client.get_balance(self.keypair.pubkey(), Commitment("confirmed"))
-            return balance.value / 10**9  # Convert lamports to SOL
+            balance = await self.balances.sol_balance(self.wallets.primary)
+            return balance / 10**9  # Convert lamports to SOL
         except Exception as e:
             print(f"Error getting balance: {e}")
             return 0
     
+    async def get_total_balance(self):
+        """Get the combined balance of every wallet in the pool, from the balance cache."""
+        try:
+            return await self.balances.sol_balance() / 10**9
+        except Exception as e:
+            print(f"Error getting balances: {e}")
+            return 0
+    
     async def get_token_balance(self, mint_address):
-        """Get the balance of a specific token."""
+        """Get the primary wallet's balance of a token, from the balance cache; None until its mint is visible."""
         try:
-            # This would need to find the associated token account
-            # Implementation depends on your specific needs
-            pass
+            return await self.balances.token_balance(mint_address)
         except Exception as e:
             print(f"Error getting token balance: {e}")
             return 0
     
+    async def get_account_data(self, address):
+        """Get the raw data of an account."""
+        try:
+            response = await self.rpc.call(
+                "get_account_info",
+                Pubkey.from_string(address),
+                commitment=Commitment("confirmed")
+            )
+            return bytes(response.value.data) if response.value else None
+        except Exception as e:
+            print(f"Error getting account {address}: {e}")
+            return None
+    
     async def get_transaction(self, signature):
         """Get transaction details by signature."""
         try:
-            transaction = await self.http_client.get_transaction(
+            transaction = await self.rpc.call(
+                "get_transaction",
                 Signature.from_string(signature),
                 encoding="json",
                 commitment=Commitment("confirmed")
@@ -68,56 +117,190 @@ class SolanaClient:
             print(f"Error getting transaction: {e}")
             return None
     
-    async def send_transaction(self, transaction, max_retries=3):
-        """Send a transaction with retry logic."""
-        for attempt in range(max_retries):
+    async def send_transaction(self, transaction, last_valid_block_height=None, signer=None, co_signers=()):
+        """
+        Sign and send a transaction, retrying every slot until it is accepted
+        or its blockhash expires. It is only re-stamped with the cached
+        blockhash (and re-signed) when its own blockhash is missing, of
+        unknown age or too close to expiry. signer defaults to the primary
+        wallet; co_signers are any other keypairs the transaction needs,
+        e.g. a new account's, so a re-stamp can sign it again.
+        """
+        signers = (signer or self.keypair, *co_signers)
+        cache = self.blockhash_cache
+        if last_valid_block_height is None:
+            last_valid_block_height = cache.expiry_of(transaction.recent_blockhash)
+        
+        if last_valid_block_height is None or cache.estimated_block_height() + BLOCKHASH_MIN_REMAINING_BLOCKS > last_valid_block_height:
+            transaction.recent_blockhash, last_valid_block_height = await cache.get()
+            transaction.sign(*signers)
+        elif not self._is_signed(transaction):
+            transaction.sign(*signers)
+        
+        return await self._send_raw(
+            transaction.serialize(),
+            lambda: cache.estimated_block_height() >= last_valid_block_height
+        )
+    
+    async def send_nonce_transaction(self, raw_transaction, nonce_address, nonce):
+        """
+        Send a transaction signed ahead of time against a durable nonce,
+        retrying every slot until it is accepted, the nonce advances (it
+        landed, or another transaction used the nonce) or
+        PRESIGN_SEND_WINDOW passes.
+        """
+        deadline = time.monotonic() + PRESIGN_SEND_WINDOW
+        return await self._send_raw(
+            raw_transaction,
+            lambda: time.monotonic() >= deadline or self.nonces.has_advanced(nonce_address, nonce)
+        )
+    
+    async def _send_raw(self, raw_transaction, expired):
+        """Broadcast a signed transaction until an endpoint accepts it or expired() says to give up."""
+        opts = TxOpts(skip_preflight=False, preflight_commitment=Commitment("confirmed"))
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                # Sign the transaction
-                transaction.sign(self.keypair)
-                
-                # Send the transaction
-                opts = TxOpts(skip_preflight=False, preflight_commitment=Commitment("confirmed"))
-                result = await self.http_client.send_transaction(transaction, opts=opts)
-                
+                # Every endpoint gets the transaction; the first to accept it wins
+                result = await self.rpc.broadcast("send_raw_transaction", raw_transaction, opts=opts)
                 if result.value:
                     return result.value
-                
+            except RPCException as e:
+                # Preflight failures won't fix themselves; a lagging node may
+                # just not have seen the blockhash yet
+                if "Blockhash not found" not in str(e):
+                    print(f"Transaction rejected: {e}")
+                    return None
+                print(f"Attempt {attempt} failed: {e}")
             except Exception as e:
-                print(f"Attempt {attempt + 1} failed: {e}")
-                await asyncio.sleep(1)  # Wait before retrying
+                print(f"Attempt {attempt} failed: {e}")
+            
+            # Retry on the next slot, but never past the last valid block
+            if expired():
+                print(f"Transaction expired after {attempt} attempts")
+                return None
+            await asyncio.sleep(SEND_RETRY_INTERVAL)
+    
+    async def confirm_transaction(self, signature, transaction=None, sent_at=None):
+        """
+        Wait for a sent transaction to be confirmed, fail or expire.
+        Returns the tracker's result dict with the landed slot and the time
+        from sent_at to processed and confirmed.
+        """
+        last_valid_block_height = None
+        if transaction is not None:
+            last_valid_block_height = self.blockhash_cache.expiry_of(transaction.recent_blockhash)
+        return await (await self.confirmations.track(signature, last_valid_block_height, sent_at))
+    
+    async def create_nonce_account(self):
+        """
+        Create a rent-exempt durable nonce account authorized by the primary
+        wallet and start using it. Returns its address, None on failure.
+        """
+        try:
+            nonce_keypair = Keypair()
+            rent, (blockhash, last_valid_block_height) = await asyncio.gather(
+                self.rpc.call("get_minimum_balance_for_rent_exemption", NONCE_ACCOUNT_SIZE),
+                self.blockhash_cache.get()
+            )
+            transaction = Transaction(
+                recent_blockhash=blockhash,
+                fee_payer=self.keypair.pubkey(),
+                instructions=self.nonces.create_instructions(nonce_keypair.pubkey(), rent.value)
+            )
+            transaction.sign(self.keypair, nonce_keypair)
+            signature = await self.send_transaction(transaction, last_valid_block_height, co_signers=(nonce_keypair,))
+            if not signature:
+                return None
+            
+            confirmation = await self.confirm_transaction(signature, transaction)
+            if confirmation["status"] != "confirmed":
+                print(f"Nonce account creation {confirmation['status']}: {confirmation['error']}")
+                return None
+            address = str(nonce_keypair.pubkey())
+            await self.nonces.track(address)
+            return address
+        except Exception as e:
+            print(f"Error creating nonce account: {e}")
+            return None
+    
+    async def close_nonce_account(self, address):
+        """
+        Withdraw a nonce account's balance to the primary wallet and stop
+        using it once that is confirmed. If the withdraw doesn't land the
+        account stays in use, still funded.
+        """
+        account = self.nonces.accounts.get(address)
+        if account is None:
+            return None
+        try:
+            await self.nonces.refresh([address])
+            transaction = Transaction(fee_payer=self.keypair.pubkey(), instructions=[self.nonces.withdraw_instruction(account)])
+            signature = await self.send_transaction(transaction)
+            if signature:
+                confirmation = await self.confirm_transaction(signature, transaction)
+                if confirmation["status"] == "confirmed":
+                    await self.nonces.untrack(address)
+                    return signature
+                print(f"Nonce account withdrawal {confirmation['status']}: {confirmation['error']}")
+        except Exception as e:
+            print(f"Error closing nonce account {address}: {e}")
         
+        # Still funded, so keep it in use with its current nonce
+        try:
+            await self.nonces.track(address)
+        except Exception as e:
+            print(f"Error re-tracking nonce account {address}: {e}")
         return None
     
-    async def monitor_logs(self, program_id, callback):
-        """Monitor logs for a specific program."""
-        program_pubkey = PublicKey(program_id)
-        
+    @staticmethod
+    def _is_signed(transaction):
+        signatures = transaction.signatures
+        return bool(signatures) and all(signature != SoldersSignature.default() for signature in signatures)
+    
+    def start(self):
+        """Start the background blockhash refresher, wallet balance refresh, fee sampler and RPC health probes."""
+        self.rpc.start()
+        self.blockhash_cache.start()
+        self.wallets.start()
+        self.fees.start()
+    
+    async def start_nonces(self):
+        """Load the configured nonce accounts and follow their changes."""
+        self.subscriptions.start()
         try:
-            async with connect(SOLANA_RPC_WS_URL) as websocket:
-                await websocket.logs_subscribe(
-                    program_pubkey,
-                    commitment=Commitment("confirmed"),
-                    filter_=RpcTransactionLogsFilterMode.All
-                )
-                
-                first_resp = await websocket.recv()
-                subscription_id = first_resp.result
-                
-                async for response in websocket:
-                    if response.result and hasattr(response.result, 'value'):
-                        logs = response.result.value.logs
-                        signature = response.result.value.signature
-                        await callback(logs, signature)
-                        
+            await self.nonces.start()
+        except Exception as e:
+            print(f"Error loading nonce accounts: {e}")
+    
+    async def start_balances(self):
+        """Load the wallet's token accounts and follow every balance."""
+        self.subscriptions.start()
+        try:
+            await self.balances.start()
         except Exception as e:
-            print(f"Error monitoring logs: {e}")
-            # Reconnect after a delay
-            await asyncio.sleep(5)
-            await self.monitor_logs(program_id, callback)
+            print(f"Error loading balances: {e}")
+    
+    async def monitor_logs(self, program_id, callback):
+        """Monitor logs for a specific program over the shared websocket."""
+        if RECORD_LOG_STREAM:
+            callback = stream_recorder.wrap(program_id, callback)
+        key = await self.subscriptions.logs_subscribe(program_id, callback)
+        self.subscriptions.start()
+        return key
     
     async def close(self):
-        """Close the HTTP client."""
-        await self.http_client.close()
+        """Close the RPC pool, blockhash refresher, wallet pool, fee sampler, balance cache and websocket subscriptions."""
+        await self.confirmations.close()
+        await self.wallets.close()
+        await self.balances.close()
+        await self.fees.close()
+        await self.nonces.close()
+        await self.blockhash_cache.close()
+        await self.subscriptions.close()
+        await self.rpc.close()
+        stream_recorder.close()
 
-# Global instance
-solana_client = SolanaClient()
+# Global instance, built on first use
+solana_client = container.register("solana_client", SolanaClient)
@@ -0,0 +1,299 @@
+import asyncio
+import itertools
+import random
+import time
+import websockets
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.commitment_config import CommitmentLevel
+from solders.account_decoder import UiAccountEncoding
+from solders.rpc.config import (
+    RpcTransactionLogsConfig,
+    RpcTransactionLogsFilterMentions,
+    RpcSignatureSubscribeConfig,
+    RpcAccountInfoConfig
+)
+from solders.rpc.requests import (
+    LogsSubscribe,
+    LogsUnsubscribe,
+    SignatureSubscribe,
+    SignatureUnsubscribe,
+    AccountSubscribe,
+    AccountUnsubscribe
+)
+from solders.rpc.responses import SubscriptionResult, SubscriptionError, parse_websocket_message
+from config.settings import WS_RECONNECT_BASE_DELAY, WS_RECONNECT_MAX_DELAY, WS_RECONNECT_RESET_AFTER
+
+_COMMITMENTS = {
+    "processed": CommitmentLevel.Processed,
+    "confirmed": CommitmentLevel.Confirmed,
+    "finalized": CommitmentLevel.Finalized
+}
+
+class Subscription:
+    """A registered subscription that survives reconnects."""
+    __slots__ = ("key", "build_request", "unsubscribe_request", "callback", "one_shot", "subscription_id")
+
+    def __init__(self, key, build_request, unsubscribe_request, callback, one_shot=False):
+        self.key = key
+        self.build_request = build_request  # request_id -> solders request body
+        self.unsubscribe_request = unsubscribe_request
+        self.callback = callback  # async callable taking the notification
+        self.one_shot = one_shot
+        self.subscription_id = None
+
+class SubscriptionConnection:
+    """
+    One websocket carrying many subscriptions, reconnecting with jittered
+    backoff. The backoff only starts over once a connection has stayed up
+    for reset_after seconds, so a server that accepts and then drops every
+    connection isn't hammered at base_delay.
+    """
+    def __init__(self, url: str, base_delay: float = WS_RECONNECT_BASE_DELAY, max_delay: float = WS_RECONNECT_MAX_DELAY,
+                 reset_after: float = WS_RECONNECT_RESET_AFTER):
+        self.url = url
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reset_after = reset_after
+        self.subscriptions = {}  # key -> Subscription
+        self.pending = {}  # request id -> Subscription
+        self.routes = {}  # server subscription id -> Subscription
+        self.request_ids = itertools.count(1)
+        self.websocket = None
+        self.task = None
+        self.closed = False
+        self.disconnected_at = None
+        self.reconnects = 0
+        self.last_downtime = 0.0
+        self.total_downtime = 0.0
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.closed = False
+            self.task = asyncio.create_task(self._run())
+
+    async def add(self, subscription: Subscription):
+        self.subscriptions[subscription.key] = subscription
+        if self.websocket is not None:
+            await self._send_subscribe(subscription)
+
+    async def remove(self, key):
+        subscription = self.subscriptions.pop(key, None)
+        if subscription is None or subscription.subscription_id is None:
+            return
+        self.routes.pop(subscription.subscription_id, None)
+        await self._send_unsubscribe(subscription)
+
+    async def _send_unsubscribe(self, subscription: Subscription):
+        if self.websocket is None:
+            return
+        try:
+            request = subscription.unsubscribe_request(subscription.subscription_id, next(self.request_ids))
+            await self.websocket.send(request.to_json())
+        except Exception as e:
+            print(f"Error unsubscribing {subscription.key}: {e}")
+
+    async def _send_subscribe(self, subscription: Subscription):
+        request_id = next(self.request_ids)
+        self.pending[request_id] = subscription
+        await self.websocket.send(subscription.build_request(request_id).to_json())
+
+    async def _run(self):
+        attempt = 0
+        while not self.closed:
+            connected_at = None
+            try:
+                async with websockets.connect(self.url, ping_interval=20, max_size=None) as websocket:
+                    self.websocket = websocket
+                    if self.disconnected_at is not None:
+                        self.last_downtime = time.monotonic() - self.disconnected_at
+                        self.total_downtime += self.last_downtime
+                        self.disconnected_at = None
+                        print(f"Websocket {self.url} reconnected after {self.last_downtime * 1000:.0f}ms")
+                    connected_at = time.monotonic()
+
+                    # Pipeline every subscribe request without waiting for replies
+                    for subscription in list(self.subscriptions.values()):
+                        await self._send_subscribe(subscription)
+
+                    async for raw in websocket:
+                        await self._dispatch(raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Websocket error on {self.url}: {e}")
+            finally:
+                self.websocket = None
+                self.pending.clear()
+                self.routes.clear()
+                for subscription in self.subscriptions.values():
+                    subscription.subscription_id = None
+
+            if self.closed:
+                break
+
+            if connected_at is not None and time.monotonic() - connected_at >= self.reset_after:
+                attempt = 0
+            if self.disconnected_at is None:
+                self.disconnected_at = time.monotonic()
+            self.reconnects += 1
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _dispatch(self, raw):
+        try:
+            messages = parse_websocket_message(raw)
+        except Exception:
+            # Unsubscribe acknowledgements and other replies we don't route
+            return
+
+        for message in messages:
+            if isinstance(message, SubscriptionResult):
+                subscription = self.pending.pop(message.id, None)
+                if subscription is None:
+                    continue
+                subscription.subscription_id = message.result
+                if subscription.key in self.subscriptions:
+                    self.routes[message.result] = subscription
+                else:
+                    # Removed while the subscribe request was in flight
+                    await self._send_unsubscribe(subscription)
+            elif isinstance(message, SubscriptionError):
+                subscription = self.pending.pop(message.id, None)
+                key = subscription.key if subscription else message.id
+                print(f"Subscription {key} failed: {message.error}")
+            else:
+                subscription = self.routes.get(message.subscription)
+                if subscription is None:
+                    continue
+                if subscription.one_shot:
+                    self.routes.pop(message.subscription, None)
+                    self.subscriptions.pop(subscription.key, None)
+                try:
+                    await subscription.callback(message)
+                except Exception as e:
+                    print(f"Error in subscription callback {subscription.key}: {e}")
+
+    async def close(self):
+        self.closed = True
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+
+class SubscriptionManager:
+    """
+    Multiplexes many Solana websocket subscriptions over a small pool of
+    connections per endpoint and routes notifications by subscription id.
+    Redundant subscriptions are placed on every endpoint so the fastest
+    provider delivers first; the caller drops the duplicates.
+    """
+    def __init__(self, urls: list, pool_size: int = 1):
+        self.endpoints = [
+            [SubscriptionConnection(url) for _ in range(max(1, pool_size))]
+            for url in urls
+        ]
+        self.connections = [connection for endpoint in self.endpoints for connection in endpoint]
+        self.owners = {}  # subscription key -> list of SubscriptionConnection
+        self.keys = itertools.count(1)
+
+    def start(self):
+        """Open every connection in the pool."""
+        for connection in self.connections:
+            connection.start()
+
+    async def subscribe(self, build_request, unsubscribe_request, callback, one_shot=False, redundant=False):
+        """
+        Register a subscription on the least loaded connection (of every
+        endpoint if redundant) and return its key
+        """
+        key = next(self.keys)
+        if one_shot:
+            handler = callback
+
+            async def callback(message):
+                # Only the first endpoint to deliver fires; drop the others
+                connections = self.owners.pop(key, None)
+                if connections is None:
+                    return
+                for connection in connections:
+                    await connection.remove(key)
+                await handler(message)
+
+        pools = self.endpoints if redundant else [self.connections]
+        connections = [min(pool, key=lambda c: len(c.subscriptions)) for pool in pools]
+        self.owners[key] = connections
+        for connection in connections:
+            await connection.add(Subscription(key, build_request, unsubscribe_request, callback, one_shot))
+            connection.start()
+        return key
+
+    async def unsubscribe(self, key):
+        """Cancel a subscription by key."""
+        for connection in self.owners.pop(key, ()):
+            await connection.remove(key)
+
+    async def logs_subscribe(self, program_id: str, callback, commitment: str = "confirmed"):
+        """
+        Subscribe to logs mentioning a program on every endpoint; callback
+        receives (logs, signature) once per endpoint that delivers it
+        """
+        log_filter = RpcTransactionLogsFilterMentions(Pubkey.from_string(program_id))
+        config = RpcTransactionLogsConfig(_COMMITMENTS[commitment])
+
+        async def on_notification(notification):
+            value = notification.result.value
+            await callback(value.logs, str(value.signature))
+
+        return await self.subscribe(
+            lambda request_id: LogsSubscribe(log_filter, config, request_id),
+            LogsUnsubscribe,
+            on_notification,
+            redundant=True
+        )
+
+    async def signature_subscribe(self, signature: str, callback, commitment: str = "confirmed"):
+        """
+        One-shot subscription on every endpoint that fires when a signature
+        reaches the commitment, whichever endpoint reports it first
+        """
+        sig = Signature.from_string(signature)
+        config = RpcSignatureSubscribeConfig(commitment=_COMMITMENTS[commitment])
+        return await self.subscribe(
+            lambda request_id: SignatureSubscribe(sig, config, request_id),
+            SignatureUnsubscribe,
+            callback,
+            one_shot=True,
+            redundant=True
+        )
+
+    async def account_subscribe(self, pubkey: str, callback, commitment: str = "confirmed"):
+        """Subscribe to changes of a single account (base64 encoded data)"""
+        account = Pubkey.from_string(pubkey)
+        config = RpcAccountInfoConfig(encoding=UiAccountEncoding.Base64, commitment=_COMMITMENTS[commitment])
+        return await self.subscribe(
+            lambda request_id: AccountSubscribe(account, config, request_id),
+            AccountUnsubscribe,
+            callback
+        )
+
+    def stats(self) -> dict:
+        """Aggregate subscription and reconnect statistics"""
+        return {
+            "endpoints": len(self.endpoints),
+            "connections": len(self.connections),
+            "connected": sum(1 for c in self.connections if c.websocket is not None),
+            "subscriptions": sum(len(c.subscriptions) for c in self.connections),
+            "reconnects": sum(c.reconnects for c in self.connections),
+            "last_downtime": max((c.last_downtime for c in self.connections), default=0.0),
+            "total_downtime": sum(c.total_downtime for c in self.connections)
+        }
+
+    async def close(self):
+        """Close every connection in the pool."""
+        for connection in self.connections:
+            await connection.close()
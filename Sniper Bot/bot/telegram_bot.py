@@ -1,9 +1,21 @@
 import logging
+import time
 from telegram import Update, ReplyKeyboardMarkup
+from telegram.error import RetryAfter
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 import asyncio
-from config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_ADMIN_ID
+from config.settings import (
+    TELEGRAM_BOT_TOKEN,
+    TELEGRAM_ADMIN_ID,
+    TELEGRAM_GLOBAL_RATE,
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_CHAT_BURST,
+    TELEGRAM_GROUP_RATE,
+    TELEGRAM_QUEUE_CAPACITY
+)
 from bot.sniper_bot import sniper_bot
+from utils.latency_tracker import latency_tracker
+from utils.container import container
 
 # Set up logging
 logging.basicConfig(
@@ -12,9 +24,255 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PRIORITIES = {"fill": 0, "alert": 1, "info": 2}  # lower goes out first
+MESSAGE_LIMIT = 4096  # characters per Telegram message
+
+class TokenBucket:
+    """Allows rate events a second on average, with up to burst saved up."""
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until the next event is allowed"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, now: float, seconds: float):
+        """Allow nothing for the next seconds."""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+class Notification:
+    __slots__ = ("priority", "sequence", "text", "key", "queued_at")
+
+    def __init__(self, priority: int, sequence: int, text: str, key, queued_at: float):
+        self.priority = priority
+        self.sequence = sequence
+        self.text = text
+        self.key = key
+        self.queued_at = queued_at
+
+class ChatQueue:
+    """Notifications waiting for one chat, and that chat's rate limit."""
+    __slots__ = ("chat_id", "pending", "bucket", "sending")
+
+    def __init__(self, chat_id, bucket: TokenBucket):
+        self.chat_id = chat_id
+        self.pending = []
+        self.bucket = bucket
+        self.sending = False
+
+    def head(self) -> tuple:
+        """Sort key of the notification that would go out first"""
+        return min((notification.priority, notification.sequence) for notification in self.pending)
+
+class NotificationQueue:
+    """
+    Outbound Telegram notifications. put() only appends to the chat's
+    pending list, so callers on the snipe path never wait on Telegram.
+    A sender task goes out within Telegram's limits, held by token
+    buckets: one for the bot as a whole and one per chat (a slower one
+    for groups). The chat with the most urgent notification goes first,
+    fills ahead of alerts, and everything that piled up for it while it
+    was rate limited goes out as one digest. An alert with the key of one
+    still waiting replaces it rather than queueing behind it.
+    """
+    def __init__(
+        self,
+        bot,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        chat_rate: float = TELEGRAM_CHAT_RATE,
+        chat_burst: float = TELEGRAM_CHAT_BURST,
+        group_rate: float = TELEGRAM_GROUP_RATE,
+        capacity: int = TELEGRAM_QUEUE_CAPACITY
+    ):
+        self.bot = bot  # anything with an async send_message(chat_id=, text=)
+        self.bucket = TokenBucket(global_rate, 1)  # Telegram counts any second, so no bursts
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.capacity = capacity  # pending notifications per chat
+        self.chats = {}  # chat id -> ChatQueue
+        self.wake = asyncio.Event()
+        self.sequence = 0
+        self.task = None
+        self.sends = set()
+        self.sent = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.replaced = 0
+        self.dropped = 0
+        self.retries = 0
+        self.failed = 0
+        self.max_wait = 0.0
+
+    def __len__(self):
+        return sum(len(chat.pending) for chat in self.chats.values())
+
+    def _chat(self, chat_id) -> ChatQueue:
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            # Group and channel ids are negative; a burst there would still
+            # count against the same minute, so groups get none
+            if str(chat_id).startswith("-"):
+                bucket = TokenBucket(self.group_rate / 60, 1)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            chat = self.chats[chat_id] = ChatQueue(chat_id, bucket)
+        return chat
+
+    def put(self, chat_id, text: str, priority: str = "info", key=None):
+        """
+        Queue a notification without waiting for it to be sent. When the
+        chat's queue is full the oldest of its least urgent notifications
+        is dropped, or this one if nothing waiting is less urgent.
+        """
+        chat = self._chat(chat_id)
+        level = PRIORITIES[priority]
+        if key is not None:
+            for notification in chat.pending:
+                if notification.key == key:
+                    notification.text = text
+                    notification.priority = min(notification.priority, level)
+                    self.replaced += 1
+                    return
+        if len(chat.pending) >= self.capacity:
+            worst = max(chat.pending, key=lambda notification: (notification.priority, -notification.sequence))
+            if worst.priority < level:
+                self.dropped += 1
+                return
+            chat.pending.remove(worst)
+            self.dropped += 1
+        self.sequence += 1
+        chat.pending.append(Notification(level, self.sequence, text, key, time.monotonic()))
+        self.wake.set()
+
+    def _next(self, now: float) -> tuple:
+        """The chat to send to next and how long until it may be sent to"""
+        best, best_delay = None, None
+        for chat in self.chats.values():
+            if not chat.pending or chat.sending:
+                continue
+            delay = chat.bucket.delay(now)
+            if best is None or (delay, chat.head()) < (best_delay, best.head()):
+                best, best_delay = chat, delay
+        if best is None:
+            return None, None
+        return best, max(best_delay, self.bucket.delay(now))
+
+    @staticmethod
+    def _take(chat: ChatQueue) -> list:
+        """The most urgent notifications of a chat that fit in one message"""
+        chat.pending.sort(key=lambda notification: (notification.priority, notification.sequence))
+        batch, length = [chat.pending[0]], len(chat.pending[0].text) + 32
+        for notification in chat.pending[1:]:
+            length += len(notification.text) + 2
+            if length > MESSAGE_LIMIT:
+                break
+            batch.append(notification)
+        del chat.pending[:len(batch)]
+        return batch
+
+    @staticmethod
+    def _digest(batch: list) -> str:
+        if len(batch) == 1:
+            return batch[0].text[:MESSAGE_LIMIT]
+        return f"🔔 {len(batch)} notifications\n\n" + "\n\n".join(notification.text for notification in batch)
+
+    async def _send(self, chat: ChatQueue, batch: list):
+        try:
+            await self.bot.send_message(chat_id=chat.chat_id, text=self._digest(batch))
+        except RetryAfter as e:
+            # Flood control: put the batch back and hold everything off
+            self.retries += 1
+            chat.pending.extend(batch)
+            self.bucket.pause(time.monotonic(), float(e.retry_after))
+            return
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Error sending Telegram notification to {chat.chat_id}: {e}")
+            return
+        finally:
+            chat.sending = False
+            self.wake.set()
+        now = time.monotonic()
+        self.sent += 1
+        self.delivered += len(batch)
+        self.coalesced += len(batch) - 1
+        self.max_wait = max(self.max_wait, now - min(notification.queued_at for notification in batch))
+
+    async def _run(self):
+        while True:
+            self.wake.clear()
+            now = time.monotonic()
+            chat, delay = self._next(now)
+            if chat is None:
+                await self.wake.wait()
+                continue
+            if delay > 0:
+                # Something more urgent may turn up in the meantime
+                try:
+                    await asyncio.wait_for(self.wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self.bucket.take(now)
+            chat.bucket.take(now)
+            chat.sending = True  # one message in flight per chat keeps them in order
+            task = asyncio.create_task(self._send(chat, self._take(chat)))
+            self.sends.add(task)
+            task.add_done_callback(self.sends.discard)
+
+    def start(self):
+        """Start the sender task."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def stats(self) -> dict:
+        """Queue depth and what became of the notifications sent"""
+        return {
+            "pending": len(self),
+            "sent": self.sent,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "replaced": self.replaced,
+            "dropped": self.dropped,
+            "retries": self.retries,
+            "failed": self.failed,
+            "max_wait": self.max_wait
+        }
+
+    async def close(self, timeout: float = 2.0):
+        """Give pending notifications up to timeout to go out, then stop."""
+        deadline = time.monotonic() + timeout
+        while (len(self) or self.sends) and self.task and not self.task.done() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        for task in [self.task, *self.sends]:
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.task = None
+
 class TelegramBot:
     def __init__(self):
         self.application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+        self.notifications = NotificationQueue(self.application.bot)
         self.setup_handlers()
 
     def setup_handlers(self):
@@ -26,7 +284,12 @@ class TelegramBot:
         self.application.add_handler(CommandHandler("auto_snipe", self.auto_snipe))
         self.application.add_handler(CommandHandler("manual_snipe", self.manual_snipe))
         self.application.add_handler(CommandHandler("monitor", self.monitor))
+        self.application.add_handler(CommandHandler("unmonitor", self.unmonitor))
+        self.application.add_handler(CommandHandler("watch", self.watch))
+        self.application.add_handler(CommandHandler("unwatch", self.unwatch))
+        self.application.add_handler(CommandHandler("nonce", self.nonce))
         self.application.add_handler(CommandHandler("settings", self.settings))
+        self.application.add_handler(CommandHandler("latency", self.latency))
         
         # Message handlers
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
@@ -59,11 +322,17 @@ class TelegramBot:
         /auto_snipe - Toggle auto sniping on/off
         /manual_snipe <mint_address> - Manually snipe a token
         /monitor <mint_address> - Monitor a token's price
+        /unmonitor <mint_address> - Stop monitoring a token's price
+        /watch <mint_address> - Pre-sign a buy, sent when its pool appears, even with auto sniping off
+        /unwatch <mint_address> - Stop pre-signing a buy
+        /nonce [create | close <address>] - Manage durable nonce accounts
         /settings - Configure bot settings
+        /latency - Show pipeline latency percentiles
         
         *Usage Examples:*
         `/manual_snipe CwP5d...` - Snipe a specific token
         `/monitor CwP5d...` - Monitor a token's price
+        `/watch CwP5d...` - Snipe a token the moment its pool is created
         """
         await update.message.reply_text(help_text, parse_mode='Markdown')
 
@@ -80,10 +349,10 @@ class TelegramBot:
     async def auto_snipe(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Toggle auto sniping on/off."""
         if sniper_bot.auto_snipe_enabled:
-            sniper_bot.auto_snipe_enabled = False
+            sniper_bot.set_auto_snipe(False)
             await update.message.reply_text("Auto snipe disabled.")
         else:
-            sniper_bot.auto_snipe_enabled = True
+            sniper_bot.set_auto_snipe(True)
             await update.message.reply_text("Auto snipe enabled.")
 
     async def manual_snipe(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -107,11 +376,44 @@ class TelegramBot:
         mint_address = context.args[0]
         asyncio.create_task(sniper_bot.monitor_token(mint_address, update))
 
+    async def unmonitor(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Stop monitoring a token's price."""
+        if not context.args:
+            await update.message.reply_text("Please provide a mint address. Usage: /unmonitor <mint_address>")
+            return
+            
+        await sniper_bot.unmonitor_token(context.args[0], update)
+
+    async def watch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Keep a pre-signed buy ready for a token."""
+        if not context.args:
+            await update.message.reply_text("Please provide a mint address. Usage: /watch <mint_address>")
+            return
+            
+        await sniper_bot.watch_token(context.args[0], update)
+
+    async def unwatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Stop pre-signing a buy for a token."""
+        if not context.args:
+            await update.message.reply_text("Please provide a mint address. Usage: /unwatch <mint_address>")
+            return
+            
+        await sniper_bot.unwatch_token(context.args[0], update)
+
+    async def nonce(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """List, create or close durable nonce accounts."""
+        asyncio.create_task(sniper_bot.manage_nonce_accounts(context.args, update))
+
     async def settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Configure bot settings."""
         # This would typically show a keyboard with configurable options
         await update.message.reply_text("Settings menu is under development.")
 
+    async def latency(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show p50/p90/p99 time from notification to each pipeline stage."""
+        report = latency_tracker.report()
+        await update.message.reply_text(f"```\n{report}\n```", parse_mode='Markdown')
+
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle non-command messages."""
         text = update.message.text
@@ -125,5 +427,5 @@ class TelegramBot:
         """Start the bot."""
         self.application.run_polling()
 
-# Global instance
-telegram_bot = TelegramBot()
+# Global instance, built on first use
+telegram_bot = container.register("telegram_bot", TelegramBot)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from solana.rpc.commitment import Commitment
+from config.settings import WALLET_FEE_RESERVE, WALLET_REFRESH_INTERVAL
+
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+
+class Wallet:
+    """One fee payer in the pool and what is currently riding on it."""
+    __slots__ = ("keypair", "address", "balance", "slot", "reserved", "in_flight", "sends", "last_used")
+
+    def __init__(self, keypair):
+        self.keypair = keypair
+        self.address = keypair.pubkey()
+        self.balance = None  # lamports at the last refresh, None until the first
+        self.slot = 0  # slot the balance was read at, so an older read doesn't overwrite it
+        self.reserved = 0  # lamports committed to snipes that haven't confirmed yet
+        self.in_flight = 0
+        self.sends = 0
+        self.last_used = 0.0
+
+    @property
+    def available(self) -> int:
+        return (self.balance or 0) - self.reserved
+
+class WalletPool:
+    """
+    Fee-paying wallets shared by concurrent snipes.
+    acquire() hands out the least busy wallet that can cover the buy,
+    reserving the amount until release() so parallel snipes don't count
+    the same SOL twice. Balances of every wallet are refreshed together
+    with getMultipleAccounts, periodically and after snipes settle.
+    """
+    def __init__(self, rpc, keypairs: list, fee_reserve: float = WALLET_FEE_RESERVE, refresh_interval: float = WALLET_REFRESH_INTERVAL):
+        if not keypairs:
+            raise ValueError("Wallet pool needs at least one keypair")
+        self.rpc = rpc
+        self.wallets = [Wallet(keypair) for keypair in keypairs]
+        self.fee_reserve = int(fee_reserve * 10**9)
+        self.refresh_interval = refresh_interval
+        self.refresh_requested = asyncio.Event()
+        self.task = None
+        self.refreshes = 0
+        self.exhausted = 0
+
+    @property
+    def primary(self) -> Wallet:
+        return self.wallets[0]
+
+    def __len__(self):
+        return len(self.wallets)
+
+    def acquire(self, amount: int = 0) -> Wallet:
+        """
+        Reserve a wallet for a snipe spending amount lamports, None if none
+        can cover it. Prefers the fewest in-flight snipes, then the most
+        available SOL; wallets not refreshed yet are tried last.
+        """
+        needed = amount + self.fee_reserve
+        candidates = [wallet for wallet in self.wallets if wallet.balance is None or wallet.available >= needed]
+        if not candidates:
+            self.exhausted += 1
+            return None
+        wallet = min(candidates, key=lambda w: (w.in_flight, w.balance is None, -w.available))
+        wallet.in_flight += 1
+        wallet.reserved += amount
+        wallet.last_used = time.monotonic()
+        return wallet
+
+    def retain(self, wallet: Wallet, amount: int = 0):
+        """Take another reference on a wallet, e.g. for a confirmation that outlives the snipe"""
+        wallet.in_flight += 1
+        wallet.reserved += amount
+
+    def release(self, wallet: Wallet, amount: int = 0, settled: bool = False):
+        """
+        Return a reference. settled means SOL moved, so balances are
+        refreshed early once nothing else is riding on the wallet.
+        """
+        wallet.in_flight -= 1
+        wallet.reserved -= amount
+        if settled and not wallet.in_flight:
+            self.refresh_requested.set()
+
+    async def refresh_balances(self) -> int:
+        """Update every wallet's balance in batched getMultipleAccounts calls; returns the total in lamports"""
+        for i in range(0, len(self.wallets), MAX_ACCOUNTS_PER_CALL):
+            chunk = self.wallets[i:i + MAX_ACCOUNTS_PER_CALL]
+            response = await self.rpc.call(
+                "get_multiple_accounts",
+                [wallet.address for wallet in chunk],
+                commitment=Commitment("confirmed")
+            )
+            slot = response.context.slot
+            for wallet, account in zip(chunk, response.value):
+                # A balance pushed while the call was in flight may be newer
+                if slot < wallet.slot:
+                    continue
+                wallet.balance = account.lamports if account is not None else 0
+                wallet.slot = slot
+        self.refreshes += 1
+        return sum(wallet.balance for wallet in self.wallets)
+
+    def start(self):
+        """Start the background balance refresh."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh_balances()
+            except Exception as e:
+                print(f"Error refreshing wallet balances: {e}")
+            self.refresh_requested.clear()
+            try:
+                await asyncio.wait_for(self.refresh_requested.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        """Per-wallet balance and load"""
+        return {
+            "wallets": [
+                {
+                    "address": str(wallet.address),
+                    "balance": wallet.balance / 10**9 if wallet.balance is not None else None,
+                    "reserved": wallet.reserved / 10**9,
+                    "in_flight": wallet.in_flight,
+                    "sends": wallet.sends
+                }
+                for wallet in self.wallets
+            ],
+            "busy": sum(1 for wallet in self.wallets if wallet.in_flight),
+            "exhausted": self.exhausted,
+            "refreshes": self.refreshes
+        }
+
+    async def close(self):
+        """Stop the balance refresh."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
@@ -12,12 +12,61 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SOLANA_RPC_HTTP_URL = os.getenv("SOLANA_RPC_HTTP_URL", "https://api.mainnet-beta.solana.com")
 SOLANA_RPC_WS_URL = os.getenv("SOLANA_RPC_WS_URL", "wss://api.mainnet-beta.solana.com")
 
+# Comma separated endpoint pools, defaulting to the single URLs above
+SOLANA_RPC_HTTP_URLS = [url.strip() for url in os.getenv("SOLANA_RPC_HTTP_URLS", SOLANA_RPC_HTTP_URL).split(",") if url.strip()]
+SOLANA_RPC_WS_URLS = [url.strip() for url in os.getenv("SOLANA_RPC_WS_URLS", SOLANA_RPC_WS_URL).split(",") if url.strip()]
+
+# RPC Endpoint Pool
+RPC_LATENCY_ALPHA = float(os.getenv("RPC_LATENCY_ALPHA", "0.2"))  # weight of the newest sample
+RPC_EJECT_AFTER_FAILURES = int(os.getenv("RPC_EJECT_AFTER_FAILURES", "3"))  # consecutive
+RPC_EJECT_SECONDS = float(os.getenv("RPC_EJECT_SECONDS", "15"))
+RPC_PROBE_INTERVAL = float(os.getenv("RPC_PROBE_INTERVAL", "5"))  # seconds
+
+# Websocket Subscriptions
+WS_POOL_SIZE = int(os.getenv("WS_POOL_SIZE", "1"))  # connections per endpoint, shared by all subscriptions
+WS_RECONNECT_BASE_DELAY = float(os.getenv("WS_RECONNECT_BASE_DELAY", "0.05"))  # seconds
+WS_RECONNECT_MAX_DELAY = float(os.getenv("WS_RECONNECT_MAX_DELAY", "5"))  # seconds
+WS_RECONNECT_RESET_AFTER = float(os.getenv("WS_RECONNECT_RESET_AFTER", "10"))  # seconds a connection must stay up to reset the backoff
+
+# Transaction Sending
+BLOCKHASH_REFRESH_INTERVAL = float(os.getenv("BLOCKHASH_REFRESH_INTERVAL", "1"))  # seconds
+BLOCKHASH_MIN_REMAINING_BLOCKS = int(os.getenv("BLOCKHASH_MIN_REMAINING_BLOCKS", "20"))  # re-stamp below this
+SEND_RETRY_INTERVAL = float(os.getenv("SEND_RETRY_INTERVAL", "0.4"))  # seconds, about one slot
+CONFIRMATION_POLL_INTERVAL = float(os.getenv("CONFIRMATION_POLL_INTERVAL", "2"))  # seconds before falling back to polling
+CONFIRMATION_TIMEOUT = float(os.getenv("CONFIRMATION_TIMEOUT", "90"))  # seconds, when the blockhash expiry is unknown
+
 # Wallet Configuration (encrypted)
 WALLET_PRIVATE_KEY = os.getenv("WALLET_PRIVATE_KEY")  # Will be decrypted at runtime
 
+# Comma separated pool of encrypted keys sharing the snipes, defaulting to the single key above
+WALLET_PRIVATE_KEYS = [key.strip() for key in os.getenv("WALLET_PRIVATE_KEYS", WALLET_PRIVATE_KEY or "").split(",") if key.strip()]
+WALLET_FEE_RESERVE = float(os.getenv("WALLET_FEE_RESERVE", "0.01"))  # SOL kept back in each wallet for fees and rent
+WALLET_REFRESH_INTERVAL = float(os.getenv("WALLET_REFRESH_INTERVAL", "10"))  # seconds between balance refreshes
+
+# Durable Nonce Pre-signing
+NONCE_ACCOUNTS = [address.strip() for address in os.getenv("NONCE_ACCOUNTS", "").split(",") if address.strip()]  # authorized by the primary wallet
+PRESIGN_REFRESH_INTERVAL = float(os.getenv("PRESIGN_REFRESH_INTERVAL", "30"))  # seconds before a pre-signed buy is re-quoted
+PRESIGN_SEND_WINDOW = float(os.getenv("PRESIGN_SEND_WINDOW", "60"))  # seconds a nonce transaction is retried for
+
+# Priority Fees
+PRIORITY_FEE_SAMPLE_INTERVAL = float(os.getenv("PRIORITY_FEE_SAMPLE_INTERVAL", "0.4"))  # seconds, about one slot
+# Percentile of recent fees paid per urgency class, e.g. "snipe:90,manual:75"
+PRIORITY_FEE_PERCENTILES = {
+    name.strip(): float(percentile)
+    for name, percentile in (item.split(":") for item in os.getenv("PRIORITY_FEE_PERCENTILES", "snipe:90,manual:75").split(",") if item.strip())
+}
+PRIORITY_FEE_MIN = int(os.getenv("PRIORITY_FEE_MIN", "1000"))  # micro-lamports per compute unit
+PRIORITY_FEE_MAX = int(os.getenv("PRIORITY_FEE_MAX", "5000000"))  # micro-lamports per compute unit
+COMPUTE_UNIT_MARGIN = float(os.getenv("COMPUTE_UNIT_MARGIN", "0.15"))  # headroom over simulated consumption
+
 # Telegram Configuration
 TELEGRAM_BOT_TOKEN = os.getenv("7983726333:AAEbIGhlQQ96HgIh18tlwJgxCLrqj_cqZD8")
 TELEGRAM_ADMIN_ID = os.getenv("3336273897")
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))  # messages a second across all chats
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))  # messages a second to one private chat
+TELEGRAM_CHAT_BURST = float(os.getenv("TELEGRAM_CHAT_BURST", "3"))  # messages a chat can take back to back
+TELEGRAM_GROUP_RATE = float(os.getenv("TELEGRAM_GROUP_RATE", "20"))  # messages a minute to one group
+TELEGRAM_QUEUE_CAPACITY = int(os.getenv("TELEGRAM_QUEUE_CAPACITY", "200"))  # pending notifications per chat
 
 # Bot Configuration
 SNIPE_TIMEOUT = int(os.getenv("SNIPE_TIMEOUT", "30"))
@@ -25,20 +74,59 @@ MAX_SLIPPAGE = float(os.getenv("MAX_SLIPPAGE", "100"))
 CHECK_RUG = os.getenv("CHECK_RUG", "True").lower() == "true"
 MIN_LIQUIDITY = float(os.getenv("MIN_LIQUIDITY", "1.0"))  # SOL
 MAX_BUY_AMOUNT = float(os.getenv("MAX_BUY_AMOUNT", "50"))  # SOL
+SPECULATIVE_BUILD = os.getenv("SPECULATIVE_BUILD", "True").lower() == "true"  # build the swap while analysis runs
+NATIVE_RAYDIUM_SWAP = os.getenv("NATIVE_RAYDIUM_SWAP", "True").lower() == "true"  # build Raydium AMM v4 buys locally, not through Jupiter
+
+# Route Selection
+ROUTE_SIZE_FRACTIONS = [float(fraction) for fraction in os.getenv("ROUTE_SIZE_FRACTIONS", "1.0").split(",") if fraction.strip()]  # of MAX_BUY_AMOUNT, one candidate each
+ROUTE_DIRECT_VARIANT = os.getenv("ROUTE_DIRECT_VARIANT", "True").lower() == "true"  # also quote Jupiter single-hop routes
+ROUTE_MAX_SIMULATIONS = int(os.getenv("ROUTE_MAX_SIMULATIONS", "4"))  # in flight across all snipes
+ROUTE_DEADLINE = float(os.getenv("ROUTE_DEADLINE", "1.0"))  # seconds to simulate candidates before picking
+
+# Event Processing
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "1000"))
+EVENT_WORKERS = int(os.getenv("EVENT_WORKERS", "8"))
+EVENT_OVERFLOW_POLICY = os.getenv("EVENT_OVERFLOW_POLICY", "drop_oldest")  # block, drop_oldest or drop_program
+
+# Deduplication
+DEDUP_CAPACITY = int(os.getenv("DEDUP_CAPACITY", "100000"))  # entries per cache
+DEDUP_SIGNATURE_TTL = float(os.getenv("DEDUP_SIGNATURE_TTL", "300"))  # seconds
+DEDUP_MINT_TTL = float(os.getenv("DEDUP_MINT_TTL", "3600"))  # seconds
+
+# Lookup Caching
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+CACHE_FRESH_TTL = float(os.getenv("CACHE_FRESH_TTL", "5"))  # seconds, tokens without an established pair
+CACHE_ESTABLISHED_TTL = float(os.getenv("CACHE_ESTABLISHED_TTL", "120"))  # seconds
+CACHE_ESTABLISHED_AGE = float(os.getenv("CACHE_ESTABLISHED_AGE", "3600"))  # pair age in seconds
 
 # Program IDs
 RAYDIUM_AMM_PROGRAM_ID = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
 RAYDIUM_CLMM_PROGRAM_ID = "CAMMCzo5YL8w4VFF8KVHrK22GGUsp5VTaW7grrKgrWqK"
 PUMP_FUN_PROGRAM_ID = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+OPENBOOK_PROGRAM_ID = "srmqPvymJeFKQ4zGQed1GFppgkRHL9kaELCbyksJtPX"
+SOL_MINT = "So11111111111111111111111111111111111111112"
 
 # API URLs
-JUPITER_API_URL = "https://quote-api.jup.ag/v6"
-JUPITER_PRICE_API_URL = "https://price.jup.ag/v4"
-DEXSCREENER_API_URL = "https://api.dexscreener.com/latest/dex"
+JUPITER_API_URL = os.getenv("JUPITER_API_URL", "https://quote-api.jup.ag/v6")
+JUPITER_PRICE_API_URL = os.getenv("JUPITER_PRICE_API_URL", "https://price.jup.ag/v4")
+DEXSCREENER_API_URL = os.getenv("DEXSCREENER_API_URL", "https://api.dexscreener.com/latest/dex")
+
+# HTTP Connection Pool
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+HTTP_POOL_HOST_LIMITS = os.getenv("HTTP_POOL_HOST_LIMITS", "")  # e.g. "quote-api.jup.ag=50,api.dexscreener.com=10"
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))  # seconds
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60"))  # seconds
+HTTP_REQUEST_TIMEOUT = float(os.getenv("HTTP_REQUEST_TIMEOUT", "10"))  # seconds
+HTTP_WARMUP_CONNECTIONS = int(os.getenv("HTTP_WARMUP_CONNECTIONS", "2"))  # per host
 
 # Monitoring
 MONITOR_INTERVAL = int(os.getenv("MONITOR_INTERVAL", "5"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+PRICE_POLL_INTERVAL = float(os.getenv("PRICE_POLL_INTERVAL", "10"))  # seconds
+PRICE_API_MAX_IDS = int(os.getenv("PRICE_API_MAX_IDS", "100"))  # ids per price request
+STREAM_POOL_PRICES = os.getenv("STREAM_POOL_PRICES", "True").lower() == "true"  # price Raydium pools from vault subscriptions, not polling
+LATENCY_REPORT_INTERVAL = float(os.getenv("LATENCY_REPORT_INTERVAL", "300"))  # seconds, 0 disables
+RECORD_LOG_STREAM = os.getenv("RECORD_LOG_STREAM", "False").lower() == "true"  # for offline replay
 
 # Security
 ENCRYPTION_KEY = os.getenv("Crypt0_Kingzs") or "default-key-please-change-in-production"
@@ -46,9 +134,12 @@ ENCRYPTION_KEY = os.getenv("Crypt0_Kingzs") or "default-key-please-change-in-pro
 # Paths
 LOG_DIR = BASE_DIR / "logs"
 CACHE_DIR = BASE_DIR / "cache"
+RECORDINGS_DIR = CACHE_DIR / "recordings"
 LOG_DIR.mkdir(exist_ok=True)
 CACHE_DIR.mkdir(exist_ok=True)
 
 # Database (for persistent state)
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/data/bot.db")
+STATE_PERSISTENCE = os.getenv("STATE_PERSISTENCE", "True").lower() == "true"  # restore monitoring and analyses on restart
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL", "0.5"))  # seconds between write-behind flushes
 
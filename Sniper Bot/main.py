@@ -1,33 +1,74 @@
+import time
+PROCESS_STARTED = time.monotonic()  # taken before the heavier imports below
+
 import asyncio
 import signal
 import sys
 from bot.telegram_bot import telegram_bot
 from bot.sniper_bot import sniper_bot
+from services.http_session import http_session_manager
+from utils.container import container
+from config.settings import JUPITER_API_URL, JUPITER_PRICE_API_URL, DEXSCREENER_API_URL
 
 class SniperBotApp:
     def __init__(self):
         self.is_running = False
+        self.telegram_started = False
+        self.startup_times = {}
+        self.first_event_task = None
         
+    async def _timed(self, phase, coro):
+        """Await a startup phase and record how long it took."""
+        started = time.monotonic()
+        try:
+            return await coro
+        finally:
+            self.startup_times[phase] = time.monotonic() - started
+    
     async def initialize(self):
         """Initialize the application components."""
         try:
             # Initialize components
             print("Initializing Solana Sniper Bot...")
+            imported = time.monotonic() - PROCESS_STARTED
             
-            # Test connection to Solana
-            balance = await sniper_bot.get_balance()
-            print(f"Wallet balance: {balance} SOL")
+            # The warm-ups don't depend on each other, so they run side by side
+            await asyncio.gather(
+                self._timed("rpc", self.warm_up_rpc()),
+                self._timed("http", http_session_manager.warm_up([
+                    JUPITER_API_URL,
+                    JUPITER_PRICE_API_URL,
+                    DEXSCREENER_API_URL
+                ])),
+                self._timed("telegram", self.start_telegram_bot())
+            )
             
             # Start monitoring for new pools
-            await sniper_bot.start_monitoring()
+            await self._timed("monitoring", sniper_bot.start_monitoring())
             
-            print("Application initialized successfully")
+            phases = ", ".join(f"{phase} {seconds * 1000:.0f}ms" for phase, seconds in self.startup_times.items())
+            builds = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in container.build_times.items())
+            print(f"Startup: imports {imported * 1000:.0f}ms, {phases} (built {builds})")
+            print(f"Application initialized {time.monotonic() - PROCESS_STARTED:.2f}s after process start")
+            self.first_event_task = asyncio.create_task(self.report_first_event())
             return True
             
         except Exception as e:
             print(f"Failed to initialize application: {e}")
             return False
     
+    async def warm_up_rpc(self):
+        """Decrypt the wallet on a worker thread, then test the connection to Solana."""
+        await container.build("security_manager", "solana_client")
+        balance = await sniper_bot.get_balance()
+        print(f"Wallet balance: {balance} SOL")
+    
+    async def report_first_event(self):
+        """Print how long after process start the first event was handled."""
+        queue = sniper_bot.event_queue
+        await queue.first_processed.wait()
+        print(f"First event processed {queue.first_processed_at - PROCESS_STARTED:.2f}s after process start")
+    
     async def run(self):
         """Run the application."""
         if not await self.initialize():
@@ -35,7 +76,7 @@ class SniperBotApp:
         
         self.is_running = True
         
-        # Start Telegram bot in a separate task
+        # Keep the Telegram bot alive in a separate task
         telegram_task = asyncio.create_task(self.run_telegram_bot())
         
         # Main loop
@@ -47,14 +88,23 @@ class SniperBotApp:
         finally:
             await self.shutdown()
     
-    async def run_telegram_bot(self):
-        """Run the Telegram bot."""
+    async def start_telegram_bot(self):
+        """Build and start the Telegram bot; the application runs on without it."""
         try:
+            await container.build("telegram_bot")
             await telegram_bot.application.initialize()
             await telegram_bot.application.start()
             await telegram_bot.application.updater.start_polling()
+            telegram_bot.notifications.start()
+            sniper_bot.notifier = telegram_bot.notifications
+            self.telegram_started = True
             print("Telegram bot is running")
-            
+        except Exception as e:
+            print(f"Telegram bot error: {e}")
+    
+    async def run_telegram_bot(self):
+        """Run the Telegram bot."""
+        try:
             # Keep the task running
             while self.is_running:
                 await asyncio.sleep(1)
@@ -62,12 +112,14 @@ class SniperBotApp:
         except Exception as e:
             print(f"Telegram bot error: {e}")
         finally:
-            if telegram_bot.application.updater:
-                await telegram_bot.application.updater.stop()
-            if telegram_bot.application:
-                await telegram_bot.application.stop()
-            if telegram_bot.application.updater:
-                await telegram_bot.application.updater.shutdown()
+            if self.telegram_started:
+                await telegram_bot.notifications.close()
+                if telegram_bot.application.updater:
+                    await telegram_bot.application.updater.stop()
+                if telegram_bot.application:
+                    await telegram_bot.application.stop()
+                if telegram_bot.application.updater:
+                    await telegram_bot.application.updater.shutdown()
     
     async def shutdown(self, signal=None):
         """Cleanup resources."""
@@ -77,7 +129,10 @@ class SniperBotApp:
         self.is_running = False
         print("Shutting down application...")
         
+        if self.first_event_task:
+            self.first_event_task.cancel()
         await sniper_bot.close()
+        await http_session_manager.close()
         
         print("Application shutdown complete")
 
@@ -1,22 +1,53 @@
-import aiohttp
-from config.settings import DEXSCREENER_API_URL
+import time
+from config.settings import (
+    DEXSCREENER_API_URL,
+    CACHE_MAX_ENTRIES,
+    CACHE_FRESH_TTL,
+    CACHE_ESTABLISHED_TTL,
+    CACHE_ESTABLISHED_AGE
+)
+from services.http_session import http_session_manager
+from utils.async_cache import AsyncTTLCache
+from utils.container import container
+
+def token_info_ttl(token_info: dict) -> float:
+    """
+    Cache lifetime for a token lookup: failed lookups aren't cached, new or
+    unindexed pools expire quickly, established pairs are kept longer
+    """
+    if token_info is None:
+        return 0
+    pairs = token_info.get("pairs") or []
+    created = [pair["pairCreatedAt"] for pair in pairs if pair.get("pairCreatedAt")]
+    if not created:
+        return CACHE_FRESH_TTL
+    # pairCreatedAt is in milliseconds
+    age = time.time() - min(created) / 1000
+    return CACHE_ESTABLISHED_TTL if age >= CACHE_ESTABLISHED_AGE else CACHE_FRESH_TTL
 
 class DexScreenerService:
     def __init__(self):
         self.base_url = DEXSCREENER_API_URL
+        self.token_cache = AsyncTTLCache(CACHE_MAX_ENTRIES, CACHE_FRESH_TTL)
     
     async def get_token_info(self, mint_address: str) -> dict:
-        """Get token information from DexScreener"""
+        """Get token information from DexScreener, cached per mint"""
+        return await self.token_cache.get_or_load(
+            mint_address,
+            lambda: self._fetch_token_info(mint_address),
+            ttl=token_info_ttl
+        )
+    
+    async def _fetch_token_info(self, mint_address: str) -> dict:
         try:
             url = f"{self.base_url}/tokens/{mint_address}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        print(f"DexScreener API error: {response.status}")
-                        return None
+            async with http_session_manager.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                else:
+                    print(f"DexScreener API error: {response.status}")
+                    return None
         except Exception as e:
             print(f"Error getting DexScreener token info: {e}")
             return None
@@ -26,16 +57,15 @@ class DexScreenerService:
         try:
             url = f"{self.base_url}/pairs/{pair_address}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        print(f"DexScreener API error: {response.status}")
-                        return None
+            async with http_session_manager.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+                else:
+                    print(f"DexScreener API error: {response.status}")
+                    return None
         except Exception as e:
             print(f"Error getting DexScreener pair info: {e}")
             return None
 
-# Global instance
-dexscreener_service = DexScreenerService()
+# Global instance, built on first use
+dexscreener_service = container.register("dexscreener_service", DexScreenerService)
@@ -0,0 +1,91 @@
+import asyncio
+import aiohttp
+from urllib.parse import urlsplit
+from config.settings import (
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_POOL_HOST_LIMITS,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_REQUEST_TIMEOUT,
+    HTTP_WARMUP_CONNECTIONS
+)
+from utils.container import container
+
+def parse_host_limits(spec: str) -> dict:
+    """Parse a "host=limit,host=limit" string into a dict"""
+    limits = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        host, limit = item.split("=", 1)
+        limits[host.strip().lower()] = int(limit)
+    return limits
+
+class HttpSessionManager:
+    """
+    Shared HTTP client for all outbound API calls.
+    Keeps one keep-alive connection pool per host so repeated calls skip
+    the TCP/TLS handshake and DNS lookup.
+    """
+    def __init__(self, default_limit: int = HTTP_POOL_LIMIT_PER_HOST, host_limits: dict = None):
+        self.default_limit = default_limit
+        self.host_limits = host_limits if host_limits is not None else parse_host_limits(HTTP_POOL_HOST_LIMITS)
+        self.sessions = {}
+
+    @staticmethod
+    def _host_key(url: str) -> tuple:
+        parts = urlsplit(url)
+        return (parts.scheme, (parts.hostname or "").lower(), parts.port)
+
+    def session_for(self, url: str) -> aiohttp.ClientSession:
+        """Get (or lazily create) the pooled session for the host of a URL"""
+        key = self._host_key(url)
+        session = self.sessions.get(key)
+
+        if session is None or session.closed:
+            limit = self.host_limits.get(key[1], self.default_limit)
+            connector = aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit,
+                use_dns_cache=True,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
+            )
+            self.sessions[key] = session
+
+        return session
+
+    def get(self, url: str, **kwargs):
+        """Pooled equivalent of aiohttp.ClientSession.get"""
+        return self.session_for(url).get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """Pooled equivalent of aiohttp.ClientSession.post"""
+        return self.session_for(url).post(url, **kwargs)
+
+    async def warm_up(self, urls: list, connections: int = HTTP_WARMUP_CONNECTIONS):
+        """Open keep-alive connections to each host ahead of the first real request"""
+        async def touch(url):
+            try:
+                async with self.session_for(url).head(url, allow_redirects=False) as response:
+                    await response.read()
+            except Exception as e:
+                print(f"HTTP warm-up failed for {url}: {e}")
+
+        # Concurrent requests to the same host force separate pooled connections
+        await asyncio.gather(*(touch(url) for url in urls for _ in range(connections)))
+
+    async def close(self):
+        """Close all pooled sessions."""
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+# Global instance, built on first use
+http_session_manager = container.register("http_session_manager", HttpSessionManager)
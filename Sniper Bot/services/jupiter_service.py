@@ -1,14 +1,16 @@
-import aiohttp
 import base64
 import json
-from config.settings import JUPITER_API_URL
+from config.settings import JUPITER_API_URL, JUPITER_PRICE_API_URL
+from services.http_session import http_session_manager
+from utils.container import container
 
 class JupiterService:
     def __init__(self):
         self.base_url = JUPITER_API_URL
+        self.price_url = JUPITER_PRICE_API_URL
     
-    async def get_quote(self, input_mint: str, output_mint: str, amount: int, slippage_bps: int) -> dict:
-        """Get a quote from Jupiter API"""
+    async def get_quote(self, input_mint: str, output_mint: str, amount: int, slippage_bps: int, only_direct_routes: bool = False) -> dict:
+        """Get a quote from Jupiter API, optionally restricted to single-hop routes"""
         try:
             url = f"{self.base_url}/quote"
             params = {
@@ -17,14 +19,15 @@ class JupiterService:
                 "amount": amount,
                 "slippageBps": slippage_bps
             }
+            if only_direct_routes:
+                params["onlyDirectRoutes"] = "true"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        print(f"Jupiter API error: {response.status}")
-                        return None
+            async with http_session_manager.get(url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                else:
+                    print(f"Jupiter API error: {response.status}")
+                    return None
         except Exception as e:
             print(f"Error getting Jupiter quote: {e}")
             return None
@@ -42,17 +45,39 @@ class JupiterService:
                 "dynamicSlippage": True
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        error_text = await response.text()
-                        print(f"Jupiter API error: {response.status} - {error_text}")
-                        return None
+            async with http_session_manager.post(url, json=payload) as response:
+                if response.status == 200:
+                    return await response.json()
+                else:
+                    error_text = await response.text()
+                    print(f"Jupiter API error: {response.status} - {error_text}")
+                    return None
         except Exception as e:
             print(f"Error getting Jupiter swap transaction: {e}")
             return None
+    
+    async def get_prices(self, mint_addresses: list, vs_token: str = None) -> dict:
+        """Get prices for several mints in one request, keyed by mint, in USDC or in vs_token"""
+        try:
+            url = f"{self.price_url}/price"
+            params = {"ids": ",".join(mint_addresses)}
+            if vs_token:
+                params["vsToken"] = vs_token
+            
+            async with http_session_manager.get(url, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {
+                        mint: float(info["price"])
+                        for mint, info in (data.get("data") or {}).items()
+                        if info and info.get("price") is not None
+                    }
+                else:
+                    print(f"Jupiter price API error: {response.status}")
+                    return {}
+        except Exception as e:
+            print(f"Error getting Jupiter prices: {e}")
+            return {}
 
-# Global instance
-jupiter_service = JupiterService()
+# Global instance, built on first use
+jupiter_service = container.register("jupiter_service", JupiterService)
@@ -0,0 +1,205 @@
+"""
+Load test SniperBot against tools/mock_server.py.
+
+Starts the mock server, points the bot's RPC, websocket, Jupiter and
+DexScreener URLs at it with a throwaway wallet, pushes synthetic pool
+creations at a fixed rate and reports sustained throughput, drops and
+per-stage latency. Bot output is silenced unless --verbose is given.
+
+Run from the "Sniper Bot" directory:
+    python -m tools.load_generator --event-rate 2000 --duration 30
+    python -m tools.load_generator --event-rate 5000 --noise-rate 20000 --workers 16 --accept-all
+    python -m tools.load_generator --event-rate 50 --watch 20 --nonce-accounts 5
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import socket
+import sys
+import time
+import base58
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def configure(args) -> str:
+    """
+    Point the settings at the mock server. Settings are read at import, so
+    this must run before config.settings (or anything using it) is imported.
+    """
+    url = f"http://127.0.0.1:{args.port or _free_port()}"
+    ws_url = url.replace("http://", "ws://", 1)
+    os.environ.update({
+        "SOLANA_RPC_HTTP_URL": url,
+        "SOLANA_RPC_HTTP_URLS": url,
+        "SOLANA_RPC_WS_URL": ws_url,
+        "SOLANA_RPC_WS_URLS": ws_url,
+        "JUPITER_API_URL": url,
+        "JUPITER_PRICE_API_URL": url,
+        "DEXSCREENER_API_URL": url,
+        "LATENCY_REPORT_INTERVAL": "0",
+        "STATE_PERSISTENCE": "false"
+    })
+    if args.workers:
+        os.environ["EVENT_WORKERS"] = str(args.workers)
+    if args.queue_size:
+        os.environ["EVENT_QUEUE_SIZE"] = str(args.queue_size)
+    if args.overflow_policy:
+        os.environ["EVENT_OVERFLOW_POLICY"] = args.overflow_policy
+
+    # Throwaway wallets, encrypted the way SolanaClient expects to find them
+    import config.settings as settings
+    from utils.security import security_manager
+    settings.WALLET_PRIVATE_KEYS = [
+        security_manager.encrypt_data(base58.b58encode(bytes(Keypair())).decode())
+        for _ in range(args.wallets)
+    ]
+    settings.WALLET_PRIVATE_KEY = settings.WALLET_PRIVATE_KEYS[0]
+    return url
+
+async def _prepare_watchlist(args, server, sniper_bot, solana_client):
+    """
+    Create nonce accounts through the bot's own lifecycle, have the server
+    list markets for fresh mints and create their pools first, and watch
+    them until every buy is pre-signed against a pool that doesn't exist yet.
+    """
+    created = await asyncio.gather(*(solana_client.create_nonce_account() for _ in range(args.nonce_accounts or args.watch)))
+    if not all(created):
+        raise RuntimeError("Could not create nonce accounts on the mock server")
+
+    mints = [str(Pubkey.new_unique()) for _ in range(args.watch)]
+    server.announce(mints)
+    for mint in mints:
+        sniper_bot.presigned.watch(mint)
+    deadline = time.monotonic() + 10
+    while len(sniper_bot.presigned) < args.watch:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"Only {len(sniper_bot.presigned)} of {args.watch} buys were pre-signed")
+        await asyncio.sleep(0.05)
+
+def _handled(queue) -> int:
+    return queue.processed + queue.failed + sum(queue.dropped.values())
+
+async def run(args, url, out):
+    from tools.mock_server import MockServer, config_from_args
+    from tools.stubs import accept_all_analyses
+
+    server = MockServer(config_from_args(args))
+    await server.start(port=int(url.rsplit(":", 1)[1]))
+
+    from bot.sniper_bot import sniper_bot
+    from bot.solana_client import solana_client
+    from services.http_session import http_session_manager
+    from utils.latency_tracker import latency_tracker
+
+    if args.accept_all:
+        accept_all_analyses()
+    sniper_bot.auto_snipe_enabled = True
+    queue = sniper_bot.event_queue
+
+    try:
+        await sniper_bot.start_monitoring()
+        deadline = time.monotonic() + 10
+        while server.stats()["log_subscriptions"] < 3:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Bot did not subscribe to the mock server's logs")
+            await asyncio.sleep(0.05)
+
+        if args.watch:
+            await _prepare_watchlist(args, server, sniper_bot, solana_client)
+
+        print(f"Mock server on {url}, {args.event_rate:.0f} creations/s and {args.noise_rate:.0f} swaps/s for {args.duration:.0f}s", file=out)
+        server.start_events()
+        started = time.monotonic()
+        last_events = last_handled = 0
+        while time.monotonic() - started < args.duration:
+            await asyncio.sleep(1)
+            stats = server.stats()
+            events = stats["creations"] + stats["noise"]
+            handled = _handled(queue)
+            print(
+                f"t={time.monotonic() - started:4.0f}s  emitted {events - last_events:6d}/s  "
+                f"handled {handled - last_handled:6d}/s  depth {len(queue):5d}  dropped {sum(queue.dropped.values())}",
+                file=out
+            )
+            last_events, last_handled = events, handled
+        await server.stop_events()
+        emit_time = time.monotonic() - started
+
+        # Let the queue and in-flight snipes drain
+        deadline = time.monotonic() + args.drain_timeout
+        while (_handled(queue) < queue.enqueued or sniper_bot.pending_snipes) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        queue_time = time.monotonic() - started
+        if sniper_bot.confirmation_tasks:
+            await asyncio.wait(list(sniper_bot.confirmation_tasks), timeout=max(0.0, deadline - time.monotonic()))
+
+        stats = server.stats()
+        queue_stats = queue.stats()
+        emitted = stats["creations"] + stats["noise"]
+        received = sniper_bot.seen_signatures.hits + sniper_bot.seen_signatures.misses
+        print("", file=out)
+        print(f"emitted    {emitted} notifications ({stats['creations']} creations, {stats['noise']} swaps) in {emit_time:.1f}s, {emitted / emit_time:,.0f}/s", file=out)
+        print(f"received   {received} by the bot, {emitted - received} lost in transit", file=out)
+        print(f"handled    {queue_stats['processed']} in {queue_time:.1f}s, {queue_stats['processed'] / queue_time:,.0f}/s sustained, {queue_stats['failed']} failed", file=out)
+        print(f"dropped    {queue_stats['dropped']}, {queue.enqueued - _handled(queue)} still queued", file=out)
+        print(f"queue      max depth {queue_stats['max_depth']}, avg wait {queue_stats['avg_wait'] * 1000:.1f}ms, max wait {queue_stats['max_wait'] * 1000:.1f}ms", file=out)
+        print(f"snipes     {latency_tracker.traces} candidates, {stats['sent']} sent, {len(sniper_bot.confirmation_tasks)} unconfirmed, {stats['injected_errors']} injected errors", file=out)
+        if args.watch:
+            presigned = sniper_bot.presigned.stats()
+            print(
+                f"presigned  {presigned['used']} of {args.watch} watched sent pre-signed, {presigned['builds']} builds "
+                f"({presigned['pending_pools']} for pools not created yet), "
+                f"{presigned['invalidated']} invalidated by nonce advances, {presigned['failures']} failed",
+                file=out
+            )
+        wallets = solana_client.wallets.stats()
+        print(f"wallets    {', '.join(str(wallet['sends']) for wallet in wallets['wallets'])} sends each, {wallets['exhausted']} snipes without a wallet, {wallets['refreshes']} balance refreshes", file=out)
+        routes = sniper_bot.route_selector.stats()
+        print(f"routes     {routes['simulated']} candidates simulated for {routes['selections']} snipes, {routes['failed']} failed, {routes['timed_out']} cut off at the deadline, "
+              f"{routes['reranked']} picked over a larger quote for fewer compute units", file=out)
+        fees = solana_client.fees.stats()
+        print(f"fees       {fees['fees']} micro-lamports/CU from {fees['samples']} samples of {fees['accounts']} accounts", file=out)
+        print(f"requests   {stats['requests']}", file=out)
+        print(latency_tracker.report(), file=out)
+    finally:
+        await sniper_bot.close()
+        await http_session_manager.close()
+        await server.close()
+
+def main():
+    # The options that end up in settings are parsed and applied first, as
+    # the mock server's own import already reads the settings
+    overrides = argparse.ArgumentParser(add_help=False)
+    overrides.add_argument("--port", type=int, default=0, help="Mock server port, 0 for any free port")
+    overrides.add_argument("--workers", type=int, default=0, help="Override EVENT_WORKERS")
+    overrides.add_argument("--queue-size", type=int, default=0, help="Override EVENT_QUEUE_SIZE")
+    overrides.add_argument("--overflow-policy", default="", help="Override EVENT_OVERFLOW_POLICY")
+    overrides.add_argument("--wallets", type=int, default=1, help="Number of throwaway wallets in the pool")
+    url = configure(overrides.parse_known_args()[0])
+
+    from tools.mock_server import add_config_arguments
+
+    parser = argparse.ArgumentParser(description="Load test SniperBot against a local mock server", parents=[overrides])
+    add_config_arguments(parser)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of event generation")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to wait for the backlog afterwards")
+    parser.add_argument("--accept-all", action="store_true", help="Pass every analysis to load the send path")
+    parser.add_argument("--watch", type=int, default=0, help="Mints to watch with pre-signed buys, created first")
+    parser.add_argument("--nonce-accounts", type=int, default=0, help="Nonce accounts to create for them, default one per mint")
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's own output")
+    args = parser.parse_args()
+
+    out = sys.stdout
+    with contextlib.ExitStack() as stack:
+        if not args.verbose:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        asyncio.run(run(args, url, out))
+
+if __name__ == "__main__":
+    main()
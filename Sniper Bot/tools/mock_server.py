@@ -0,0 +1,783 @@
+"""
+Local stand-in for a Solana RPC node, Jupiter and DexScreener, for load
+testing SniperBot without touching mainnet.
+
+One aiohttp app serves:
+    POST /                       JSON-RPC, the methods SolanaClient uses
+    GET  /                       websocket logs/signature/account subscriptions
+    GET  /quote, POST /swap      Jupiter quote and swap APIs
+    GET  /price                  Jupiter price API
+    GET  /tokens/{mint}          DexScreener
+    GET  /pairs/{address}        DexScreener
+and pushes synthetic Raydium AMM and Pump.fun pool creations, plus swap
+noise, to log subscribers at a configurable rate. Sent transactions land
+after the configured confirmation latency. System program nonce
+instructions are honoured: accounts can be initialized, advanced
+(rejecting transactions signed against a stale nonce) and withdrawn, and
+account subscribers see the changes.
+
+Run standalone from the "Sniper Bot" directory and point the bot at it:
+    python -m tools.mock_server --port 8899 --event-rate 500
+    SOLANA_RPC_HTTP_URL=http://127.0.0.1:8899 SOLANA_RPC_WS_URL=ws://127.0.0.1:8899 \\
+    JUPITER_API_URL=http://127.0.0.1:8899 JUPITER_PRICE_API_URL=http://127.0.0.1:8899 \\
+    DEXSCREENER_API_URL=http://127.0.0.1:8899 python main.py
+tools/load_generator.py does all of this in one process.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import struct
+import time
+from aiohttp import web, WSMsgType
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import Transaction as SoldersTransaction
+from config.settings import RAYDIUM_AMM_PROGRAM_ID, PUMP_FUN_PROGRAM_ID, OPENBOOK_PROGRAM_ID, SOL_MINT
+from tools.stubs import swap_transaction, market_account
+
+SLOT_TIME = 0.4
+BLOCKHASH_VALID_BLOCKS = 150
+MAX_TRACKED = 100000  # tokens, markets and transactions remembered
+
+_PUMP_CREATE_DISCRIMINATOR = bytes([27, 114, 169, 77, 222, 235, 99, 118])
+_PUMP_TRADE_DISCRIMINATOR = bytes([189, 219, 127, 211, 78, 230, 97, 238])
+_RAY_INIT_LAYOUT = struct.Struct("<BQBBQQQQ")
+_RAY_SWAP_BASE_IN = 3
+_SYSTEM_PROGRAM = Pubkey.from_string("11111111111111111111111111111111")
+_ADVANCE_NONCE, _WITHDRAW_NONCE, _INITIALIZE_NONCE = 4, 5, 6
+_NONCE_ACCOUNT_SIZE = 80
+
+class RpcError(Exception):
+    """Returned to the caller as a JSON-RPC error"""
+    def __init__(self, message: str, code: int, data: dict = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+def preflight_failure(err, description: str) -> RpcError:
+    """sendTransaction's error when its preflight simulation fails"""
+    simulation = {"err": err, "logs": [], "accounts": None, "unitsConsumed": 0, "returnData": None}
+    return RpcError(f"Transaction simulation failed: {description}", -32002, simulation)
+
+def _string(value: str) -> bytes:
+    encoded = value.encode()
+    return struct.pack("<I", len(encoded)) + encoded
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+def pump_fun_create_logs(mint: Pubkey, curve: Pubkey, user: Pubkey) -> list:
+    """Logs of a Pump.fun create instruction with a current CreateEvent"""
+    payload = (
+        _PUMP_CREATE_DISCRIMINATOR + _string("Mock") + _string("MOCK") + _string("https://example.com/mock.json")
+        + bytes(mint) + bytes(curve) + bytes(user) + bytes(user)
+        + struct.pack("<qQQQQ", int(time.time()), 1_073_000_000_000_000, 30_000_000_000, 793_100_000_000_000, 10**15)
+    )
+    return [
+        f"Program {PUMP_FUN_PROGRAM_ID} invoke [1]",
+        "Program log: Instruction: Create",
+        f"Program data: {_b64(payload)}",
+        f"Program {PUMP_FUN_PROGRAM_ID} consumed 120000 of 200000 compute units",
+        f"Program {PUMP_FUN_PROGRAM_ID} success"
+    ]
+
+def raydium_init_logs(market: Pubkey) -> list:
+    """Logs of a Raydium AMM v4 initialize2 with its InitLog"""
+    init = _RAY_INIT_LAYOUT.pack(0, int(time.time()), 9, 6, 1, 1, 50 * 10**9, 10**15) + bytes(market)
+    return [
+        f"Program {RAYDIUM_AMM_PROGRAM_ID} invoke [1]",
+        "Program log: initialize2: InitializeInstruction2 { nonce: 254, open_time: 0 }",
+        f"Program log: ray_log: {_b64(init)}",
+        f"Program {RAYDIUM_AMM_PROGRAM_ID} consumed 60000 of 200000 compute units",
+        f"Program {RAYDIUM_AMM_PROGRAM_ID} success"
+    ]
+
+def swap_logs(program_id: str) -> list:
+    """Logs of an ordinary swap, which the bot should reject cheaply"""
+    if program_id == PUMP_FUN_PROGRAM_ID:
+        data = f"Program data: {_b64(_PUMP_TRADE_DISCRIMINATOR + random.randbytes(121))}"
+    else:
+        data = f"Program log: ray_log: {_b64(bytes([_RAY_SWAP_BASE_IN]) + random.randbytes(56))}"
+    return [
+        f"Program {program_id} invoke [1]",
+        "Program log: Instruction: Swap",
+        data,
+        f"Program {program_id} consumed 30000 of 200000 compute units",
+        f"Program {program_id} success"
+    ]
+
+class MockConfig:
+    """Latencies in seconds, rates per second, error rates as probabilities."""
+    def __init__(
+        self,
+        rpc_latency: float = 0.005,
+        jupiter_latency: float = 0.03,
+        dexscreener_latency: float = 0.05,
+        confirm_latency: float = 0.8,
+        rpc_error_rate: float = 0.0,
+        api_error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        event_rate: float = 0.0,
+        noise_rate: float = 0.0,
+        pump_share: float = 0.5,
+        balance: int = 10_000 * 10**9
+    ):
+        self.rpc_latency = rpc_latency
+        self.jupiter_latency = jupiter_latency
+        self.dexscreener_latency = dexscreener_latency
+        self.confirm_latency = confirm_latency
+        self.rpc_error_rate = rpc_error_rate
+        self.api_error_rate = api_error_rate
+        self.drop_rate = drop_rate  # sent transactions that never land
+        self.event_rate = event_rate  # pool creations
+        self.noise_rate = noise_rate  # swaps
+        self.pump_share = pump_share  # of creations, the rest are Raydium AMM pools
+        self.balance = balance  # lamports, of every wallet
+
+class MockServer:
+    def __init__(self, config: MockConfig = None):
+        self.config = config or MockConfig()
+        self.genesis = time.monotonic()
+        self.runner = None
+        self.url = None
+        self.emitter = None
+        self.tasks = set()
+
+        self.tokens = {}  # mint -> pair created at, unix ms
+        self.markets = {}  # market -> base mint
+        self.prices = {}  # mint -> last price
+        self.transactions = {}  # signature -> (processed_at, confirmed_at, slot), None if dropped
+        self.nonces = {}  # nonce account -> (authority, stored nonce)
+        self.upcoming = []  # announced mints, created before any random ones
+        self.listed = {}  # announced mint -> its market, listed before the pool is created
+
+        # Websocket subscriptions
+        self.next_subscription = 1
+        self.subscriptions = {}  # id -> (index, key)
+        self.log_subscribers = {}  # program id -> {subscription id: websocket}
+        self.signature_subscribers = {}  # signature -> {subscription id: (websocket, commitment)}
+        self.account_subscribers = {}  # address -> {subscription id: websocket}
+
+        # Counters
+        self.requests = {}
+        self.errors = 0
+        self.creations = 0
+        self.noise = 0
+        self.notifications = 0
+        self.sent = 0
+
+        self.methods = {
+            "getSlot": self._get_slot,
+            "getBlockHeight": self._get_block_height,
+            "getLatestBlockhash": self._get_latest_blockhash,
+            "getBalance": self._get_balance,
+            "getAccountInfo": self._get_account_info,
+            "getMultipleAccounts": self._get_multiple_accounts,
+            "getTokenAccountsByOwner": self._get_token_accounts_by_owner,
+            "getProgramAccounts": self._get_program_accounts,
+            "getMinimumBalanceForRentExemption": self._get_minimum_balance_for_rent_exemption,
+            "getRecentPrioritizationFees": self._get_recent_prioritization_fees,
+            "simulateTransaction": self._simulate_transaction,
+            "sendTransaction": self._send_transaction,
+            "getSignatureStatuses": self._get_signature_statuses
+        }
+
+    # Chain clock
+
+    def slot(self) -> int:
+        return int((time.monotonic() - self.genesis) / SLOT_TIME) + 1
+
+    def blockhash(self, slot: int = None) -> Hash:
+        return Hash.hash(struct.pack("<Q", slot or self.slot()))
+
+    def _context(self, value) -> dict:
+        return {"context": {"slot": self.slot()}, "value": value}
+
+    def _count(self, name: str):
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+    @staticmethod
+    async def _delay(latency: float):
+        if latency > 0:
+            await asyncio.sleep(latency * random.uniform(0.8, 1.2))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    @staticmethod
+    def _remember(mapping: dict, key, value):
+        mapping[key] = value
+        if len(mapping) > MAX_TRACKED:
+            del mapping[next(iter(mapping))]
+
+    # JSON-RPC
+
+    async def _rpc(self, request):
+        body = await request.json()
+        method = body.get("method")
+        self._count(method)
+        await self._delay(self.config.rpc_latency)
+        if random.random() < self.config.rpc_error_rate:
+            self.errors += 1
+            return web.Response(status=503)
+
+        handler = self.methods.get(method)
+        if handler is None:
+            error = {"code": -32601, "message": "Method not found"}
+            return web.json_response({"jsonrpc": "2.0", "id": body.get("id"), "error": error})
+        try:
+            result = handler(body.get("params") or [])
+        except RpcError as e:
+            error = {"code": e.code, "message": str(e), "data": e.data}
+            return web.json_response({"jsonrpc": "2.0", "id": body.get("id"), "error": error})
+        return web.json_response({"jsonrpc": "2.0", "id": body.get("id"), "result": result})
+
+    def _get_slot(self, params):
+        return self.slot()
+
+    def _get_block_height(self, params):
+        return self.slot()
+
+    def _get_latest_blockhash(self, params):
+        slot = self.slot()
+        return self._context({"blockhash": str(self.blockhash(slot)), "lastValidBlockHeight": slot + BLOCKHASH_VALID_BLOCKS})
+
+    def _get_balance(self, params):
+        return self._context(self.config.balance)
+
+    def _account(self, address: str) -> dict:
+        if address in self.nonces:
+            return self._nonce_account(address)
+        mint = self.markets.get(address)
+        if mint is None:
+            # Anything that isn't a market is taken for a wallet
+            return {
+                "data": ["", "base64"],
+                "executable": False,
+                "lamports": self.config.balance,
+                "owner": "11111111111111111111111111111111",
+                "rentEpoch": 0,
+                "space": 0
+            }
+        return {
+            "data": [_b64(market_account(mint, address)), "base64"],
+            "executable": False,
+            "lamports": 3_000_000_000,
+            "owner": "srmqPvymJeFKQ4zGQed1GFppgkRHL9kaELCbyksJtPX",
+            "rentEpoch": 0,
+            "space": 388
+        }
+
+    def _nonce_account(self, address: str) -> dict:
+        authority, nonce = self.nonces[address]
+        data = struct.pack("<II", 1, 1) + bytes(authority) + bytes(nonce) + struct.pack("<Q", 5000)
+        return {
+            "data": [_b64(data), "base64"],
+            "executable": False,
+            "lamports": self._rent_exemption(_NONCE_ACCOUNT_SIZE),
+            "owner": str(_SYSTEM_PROGRAM),
+            "rentEpoch": 0,
+            "space": _NONCE_ACCOUNT_SIZE
+        }
+
+    def add_nonce_account(self, address: str, authority: Pubkey):
+        """Create an initialized nonce account holding the current blockhash"""
+        self.nonces[address] = (authority, self.blockhash())
+
+    @staticmethod
+    def _rent_exemption(size: int) -> int:
+        # Two years of rent at 3480 lamports per byte-year, counting 128 bytes of account overhead
+        return (128 + size) * 6960
+
+    def _get_minimum_balance_for_rent_exemption(self, params):
+        return self._rent_exemption(params[0])
+
+    def _get_recent_prioritization_fees(self, params):
+        """
+        The last 150 slots' fees: most slots cheap, a tail of contested ones.
+        Seeded by slot, so every call agrees on a slot's fee.
+        """
+        current = self.slot()
+        fees = []
+        for slot in range(max(1, current - 149), current + 1):
+            rng = random.Random(slot)
+            fee = 0 if rng.random() < 0.3 else int(rng.lognormvariate(9, 1.5))
+            fees.append({"slot": slot, "prioritizationFee": fee})
+        return fees
+
+    def _get_account_info(self, params):
+        return self._context(self._account(params[0]))
+
+    def _get_multiple_accounts(self, params):
+        return self._context([self._account(address) for address in params[0]])
+
+    def _get_token_accounts_by_owner(self, params):
+        # The wallet holds no tokens yet
+        return self._context([])
+
+    def _get_program_accounts(self, params):
+        """Markets of announced mints, matched on the memcmp filters; any other program owns nothing"""
+        config = params[1] if len(params) > 1 and params[1] else {}
+        if params[0] != OPENBOOK_PROGRAM_ID:
+            return []
+        matches = []
+        for mint, market in self.listed.items():
+            data = market_account(mint, market)
+            if all(
+                data[f["memcmp"]["offset"]:f["memcmp"]["offset"] + 32] == bytes(Pubkey.from_string(f["memcmp"]["bytes"]))
+                for f in config.get("filters", []) if "memcmp" in f
+            ):
+                matches.append({"pubkey": market, "account": self._account(market)})
+        return matches
+
+    def _simulate_transaction(self, params):
+        """
+        Every instruction succeeds, consuming a made-up number of compute
+        units. The numbers are seeded by the message, so candidate routes
+        differ but simulating the same transaction twice agrees.
+        """
+        config = params[1] if len(params) > 1 and params[1] else {}
+        transaction = SoldersTransaction.from_bytes(base64.b64decode(params[0]))
+        if config.get("sigVerify"):
+            try:
+                transaction.verify()
+            except Exception:
+                raise RpcError("Transaction signature verification failure", -32003)
+        message = transaction.message
+        rng = random.Random(bytes(message))
+        logs = []
+        total = 0
+        for instruction in message.instructions:
+            program = message.account_keys[instruction.program_id_index]
+            units = rng.randint(150, 40_000)
+            total += units
+            logs += [
+                f"Program {program} invoke [1]",
+                f"Program {program} consumed {units} of 200000 compute units",
+                f"Program {program} success"
+            ]
+        return self._context({
+            "err": None,
+            "logs": logs,
+            "accounts": None,
+            "unitsConsumed": total,
+            "returnData": None
+        })
+
+    def _apply_nonce_instructions(self, transaction: SoldersTransaction, signature: str):
+        """Execute the transaction's system program nonce instructions, rejecting a stale nonce"""
+        message = transaction.message
+        keys = [str(key) for key in message.account_keys]
+        changed = []
+        for index, instruction in enumerate(message.instructions):
+            if message.account_keys[instruction.program_id_index] != _SYSTEM_PROGRAM or len(instruction.data) < 4:
+                continue
+            kind = struct.unpack_from("<I", instruction.data)[0]
+            address = keys[instruction.accounts[0]]
+            if kind == _ADVANCE_NONCE and index == 0:
+                stored = self.nonces.get(address)
+                if stored is None or stored[1] != message.recent_blockhash:
+                    raise preflight_failure("BlockhashNotFound", "Blockhash not found")
+                self.nonces[address] = (stored[0], Hash.hash(bytes(Signature.from_string(signature))))
+                changed.append(address)
+            elif kind == _INITIALIZE_NONCE:
+                self.nonces[address] = (Pubkey.from_bytes(bytes(instruction.data[4:36])), self.blockhash())
+                changed.append(address)
+            elif kind == _WITHDRAW_NONCE:
+                self.nonces.pop(address, None)
+        for address in changed:
+            self._spawn(self._notify_account(address))
+
+    async def _notify_account(self, address: str):
+        if address not in self.nonces:
+            return
+        result = self._context(self._nonce_account(address))
+        for subscription, websocket in list(self.account_subscribers.get(address, {}).items()):
+            await self._notify(websocket, "accountNotification", subscription, result)
+
+    def _send_transaction(self, params):
+        raw = base64.b64decode(params[0])
+        transaction = SoldersTransaction.from_bytes(raw)
+        signature = str(transaction.signatures[0])
+        if signature not in self.transactions:
+            self._apply_nonce_instructions(transaction, signature)
+            self.sent += 1
+            if random.random() < self.config.drop_rate:
+                self._remember(self.transactions, signature, None)
+            else:
+                self._spawn(self._land(signature))
+        return signature
+
+    def _signature_status(self, signature: str, now: float) -> dict:
+        landed = self.transactions.get(signature)
+        if landed is None or now < landed[0]:
+            return None
+        processed_at, confirmed_at, slot = landed
+        return {
+            "slot": slot,
+            "confirmations": None if now >= confirmed_at else 0,
+            "err": None,
+            "status": {"Ok": None},
+            "confirmationStatus": "confirmed" if now >= confirmed_at else "processed"
+        }
+
+    def _get_signature_statuses(self, params):
+        now = time.monotonic()
+        return self._context([self._signature_status(signature, now) for signature in params[0]])
+
+    async def _land(self, signature: str):
+        """Process, then confirm, a sent transaction, pushing both commitments"""
+        sent_at = time.monotonic()
+        processed_at = sent_at + self.config.confirm_latency / 2
+        confirmed_at = sent_at + self.config.confirm_latency
+        self._remember(self.transactions, signature, (processed_at, confirmed_at, int((processed_at - self.genesis) / SLOT_TIME) + 1))
+        for commitment, at in (("processed", processed_at), ("confirmed", confirmed_at)):
+            await asyncio.sleep(max(0.0, at - time.monotonic()))
+            await self._notify_signature(signature, commitment)
+
+    async def _notify_signature(self, signature: str, commitment: str):
+        subscribers = self.signature_subscribers.get(signature, {})
+        for subscription, (websocket, wanted) in list(subscribers.items()):
+            if (wanted == "processed") == (commitment == "processed"):
+                self._drop_subscription(subscription)
+                await self._notify(websocket, "signatureNotification", subscription, self._context({"err": None}))
+
+    # Jupiter
+
+    async def _api_call(self, name: str, latency: float) -> bool:
+        """Count and delay an API request; False if it should fail"""
+        self._count(name)
+        await self._delay(latency)
+        if random.random() < self.config.api_error_rate:
+            self.errors += 1
+            return False
+        return True
+
+    async def _quote(self, request):
+        if not await self._api_call("quote", self.config.jupiter_latency):
+            return web.Response(status=429, text="Rate limit exceeded")
+        query = request.query
+        amount = query.get("amount", "0")
+        # Single-hop routes come out a little worse than the best route
+        out_amount = str(int(amount) * 99 // 100) if query.get("onlyDirectRoutes") == "true" else amount
+        # Like Jupiter, no route to a token that doesn't trade yet
+        if query.get("outputMint") in self.upcoming:
+            return web.json_response({"error": "Could not find any route", "errorCode": "COULD_NOT_FIND_ANY_ROUTE"}, status=400)
+        return web.json_response({
+            "inputMint": query.get("inputMint"),
+            "inAmount": amount,
+            "outputMint": query.get("outputMint"),
+            "outAmount": out_amount,
+            "otherAmountThreshold": out_amount,
+            "swapMode": "ExactIn",
+            "slippageBps": int(query.get("slippageBps", 0)),
+            "priceImpactPct": "0",
+            "routePlan": []
+        })
+
+    async def _swap(self, request):
+        body = await request.json()
+        if not await self._api_call("swap", self.config.jupiter_latency):
+            return web.Response(status=429, text="Rate limit exceeded")
+        slot = self.slot()
+        payer = Pubkey.from_string(body["userPublicKey"])
+        # Paying the output mint keeps each swap's signature distinct, and
+        # the quoted amount each route's, so their simulations differ
+        quote = body["quoteResponse"]
+        destination = Pubkey.from_string(quote["outputMint"])
+        lamports = max(1, int(quote.get("outAmount", 1)))
+        return web.json_response({
+            "swapTransaction": swap_transaction(payer, self.blockhash(slot), destination, lamports),
+            "lastValidBlockHeight": slot + BLOCKHASH_VALID_BLOCKS
+        })
+
+    async def _price(self, request):
+        if not await self._api_call("price", self.config.jupiter_latency):
+            return web.Response(status=429, text="Rate limit exceeded")
+        data = {}
+        for mint in filter(None, request.query.get("ids", "").split(",")):
+            # A small random walk so price alerts have something to do
+            price = self.prices.get(mint, 1.0) * random.uniform(0.97, 1.03)
+            self._remember(self.prices, mint, price)
+            data[mint] = {"id": mint, "mintSymbol": "MOCK", "vsToken": SOL_MINT, "vsTokenSymbol": "SOL", "price": price}
+        return web.json_response({"data": data, "timeTaken": 0.0})
+
+    # DexScreener
+
+    def _pair(self, mint: str, created_at: int) -> dict:
+        return {
+            "chainId": "solana",
+            "dexId": "raydium",
+            "baseToken": {"address": mint, "name": "Mock", "symbol": "MOCK"},
+            "quoteToken": {"address": SOL_MINT, "name": "Wrapped SOL", "symbol": "SOL"},
+            "priceUsd": "0.0001",
+            "liquidity": {"usd": 12000, "base": 10**9, "quote": 50},
+            "pairCreatedAt": created_at
+        }
+
+    async def _tokens(self, request):
+        if not await self._api_call("tokens", self.config.dexscreener_latency):
+            return web.Response(status=429, text="Rate limit exceeded")
+        mint = request.match_info["mint"]
+        created_at = self.tokens.get(mint)
+        pairs = [self._pair(mint, created_at)] if created_at else []
+        return web.json_response({"schemaVersion": "1.0.0", "pairs": pairs})
+
+    async def _pairs(self, request):
+        if not await self._api_call("pairs", self.config.dexscreener_latency):
+            return web.Response(status=429, text="Rate limit exceeded")
+        mint = self.markets.get(request.match_info["address"])
+        pairs = [self._pair(mint, self.tokens[mint])] if mint in self.tokens else []
+        return web.json_response({"schemaVersion": "1.0.0", "pairs": pairs})
+
+    # Websocket
+
+    async def _websocket(self, request):
+        websocket = web.WebSocketResponse(max_msg_size=0)
+        await websocket.prepare(request)
+        owned = set()
+        try:
+            async for message in websocket:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                body = json.loads(message.data)
+                reply = {"jsonrpc": "2.0", "id": body.get("id"), "result": self._ws_request(websocket, body, owned)}
+                await websocket.send_str(json.dumps(reply))
+        finally:
+            for subscription in owned:
+                self._drop_subscription(subscription)
+        return websocket
+
+    def _ws_request(self, websocket, body: dict, owned: set):
+        method = body.get("method", "")
+        params = body.get("params") or []
+        self._count(method)
+
+        if method.endswith("Unsubscribe"):
+            owned.discard(params[0])
+            return self._drop_subscription(params[0])
+
+        subscription = self.next_subscription
+        self.next_subscription += 1
+        options = params[1] if len(params) > 1 and params[1] else {}
+
+        if method == "logsSubscribe":
+            index, key, value = self.log_subscribers, params[0]["mentions"][0], websocket
+        elif method == "signatureSubscribe":
+            index, key, value = self.signature_subscribers, params[0], (websocket, options.get("commitment", "finalized"))
+        elif method == "accountSubscribe":
+            index, key, value = self.account_subscribers, params[0], websocket
+        else:
+            return None
+
+        index.setdefault(key, {})[subscription] = value
+        self.subscriptions[subscription] = (index, key)
+        owned.add(subscription)
+
+        if method == "signatureSubscribe":
+            # Already landed: notify as soon as the subscription id is out
+            status = self._signature_status(key, time.monotonic())
+            if status is not None and (value[1] == "processed" or status["confirmationStatus"] == "confirmed"):
+                self._spawn(self._notify_signature(key, "processed" if value[1] == "processed" else "confirmed"))
+        return subscription
+
+    def _drop_subscription(self, subscription: int) -> bool:
+        entry = self.subscriptions.pop(subscription, None)
+        if entry is None:
+            return False
+        index, key = entry
+        subscribers = index.get(key)
+        if subscribers is not None:
+            subscribers.pop(subscription, None)
+            if not subscribers:
+                del index[key]
+        return True
+
+    async def _notify(self, websocket, method: str, subscription: int, result: dict):
+        if websocket.closed:
+            return
+        message = {"jsonrpc": "2.0", "method": method, "params": {"result": result, "subscription": subscription}}
+        try:
+            await websocket.send_str(json.dumps(message))
+            self.notifications += 1
+        except ConnectionResetError:
+            pass
+
+    # Event generation
+
+    def _creation(self) -> tuple:
+        created_at = int(time.time() * 1000)
+        mint = Pubkey.from_string(self.upcoming.pop(0)) if self.upcoming else Pubkey.new_unique()
+        self._remember(self.tokens, str(mint), created_at)
+        # An announced mint's pool is created on the market listed for it
+        listed = self.listed.pop(str(mint), None)
+        if listed is not None:
+            return RAYDIUM_AMM_PROGRAM_ID, raydium_init_logs(Pubkey.from_string(listed))
+        if random.random() < self.config.pump_share:
+            return PUMP_FUN_PROGRAM_ID, pump_fun_create_logs(mint, Pubkey.new_unique(), Pubkey.new_unique())
+        market = Pubkey.new_unique()
+        self._remember(self.markets, str(market), str(mint))
+        return RAYDIUM_AMM_PROGRAM_ID, raydium_init_logs(market)
+
+    def announce(self, mints: list):
+        """
+        List an OpenBook market for each of these mints, as happens before
+        a Raydium pool is created, and have the next pool creations be theirs
+        """
+        for mint in mints:
+            market = str(Pubkey.new_unique())
+            self.listed[mint] = market
+            self._remember(self.markets, market, mint)
+        self.upcoming.extend(mints)
+
+    async def publish(self, program_id: str, logs: list):
+        """Send one log notification to every subscriber of the program"""
+        value = {"signature": str(Signature.new_unique()), "err": None, "logs": logs}
+        result = self._context(value)
+        for subscription, websocket in list(self.log_subscribers.get(program_id, {}).items()):
+            await self._notify(websocket, "logsNotification", subscription, result)
+
+    async def _emit(self, interval: float = 0.01):
+        """Publish creations and noise at the configured rates, in 10ms batches"""
+        creations = noise = 0.0
+        next_tick = time.monotonic()
+        while True:
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            creations += self.config.event_rate * interval
+            noise += self.config.noise_rate * interval
+            while creations >= 1:
+                creations -= 1
+                self.creations += 1
+                await self.publish(*self._creation())
+            while noise >= 1:
+                noise -= 1
+                self.noise += 1
+                program_id = PUMP_FUN_PROGRAM_ID if random.random() < self.config.pump_share else RAYDIUM_AMM_PROGRAM_ID
+                await self.publish(program_id, swap_logs(program_id))
+
+    def start_events(self, event_rate: float = None, noise_rate: float = None):
+        """Start (or retune) the event generator"""
+        if event_rate is not None:
+            self.config.event_rate = event_rate
+        if noise_rate is not None:
+            self.config.noise_rate = noise_rate
+        if self.emitter is None or self.emitter.done():
+            self.emitter = asyncio.create_task(self._emit())
+
+    async def stop_events(self):
+        if self.emitter and not self.emitter.done():
+            self.emitter.cancel()
+            try:
+                await self.emitter
+            except asyncio.CancelledError:
+                pass
+        self.emitter = None
+
+    # Lifecycle
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/", self._rpc)
+        app.router.add_get("/", self._websocket)
+        app.router.add_get("/quote", self._quote)
+        app.router.add_post("/swap", self._swap)
+        app.router.add_get("/price", self._price)
+        app.router.add_get("/tokens/{mint}", self._tokens)
+        app.router.add_get("/pairs/{address}", self._pairs)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base http URL"""
+        self.runner = web.AppRunner(self.app())
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    @property
+    def ws_url(self) -> str:
+        return self.url.replace("http://", "ws://", 1)
+
+    def stats(self) -> dict:
+        return {
+            "creations": self.creations,
+            "noise": self.noise,
+            "notifications": self.notifications,
+            "log_subscriptions": sum(len(subscribers) for subscribers in self.log_subscribers.values()),
+            "sent": self.sent,
+            "injected_errors": self.errors,
+            "requests": dict(self.requests)
+        }
+
+    async def close(self):
+        await self.stop_events()
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.runner:
+            await self.runner.cleanup()
+        self.runner = None
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """Options shared with the load generator"""
+    parser.add_argument("--event-rate", type=float, default=100.0, help="Pool creations per second")
+    parser.add_argument("--noise-rate", type=float, default=0.0, help="Swap notifications per second")
+    parser.add_argument("--pump-share", type=float, default=0.5, help="Fraction of events from Pump.fun, the rest Raydium AMM")
+    parser.add_argument("--rpc-ms", type=float, default=5.0)
+    parser.add_argument("--jupiter-ms", type=float, default=30.0)
+    parser.add_argument("--dexscreener-ms", type=float, default=50.0)
+    parser.add_argument("--confirm-ms", type=float, default=800.0)
+    parser.add_argument("--rpc-error-rate", type=float, default=0.0)
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="Jupiter and DexScreener failure probability")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Sent transactions that never land")
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(
+        rpc_latency=args.rpc_ms / 1000,
+        jupiter_latency=args.jupiter_ms / 1000,
+        dexscreener_latency=args.dexscreener_ms / 1000,
+        confirm_latency=args.confirm_ms / 1000,
+        rpc_error_rate=args.rpc_error_rate,
+        api_error_rate=args.api_error_rate,
+        drop_rate=args.drop_rate,
+        event_rate=args.event_rate,
+        noise_rate=args.noise_rate,
+        pump_share=args.pump_share
+    )
+
+async def serve(args):
+    server = MockServer(config_from_args(args))
+    url = await server.start(args.host, args.port)
+    print(f"Mock RPC, Jupiter and DexScreener on {url} (websocket {server.ws_url})")
+    server.start_events()
+    try:
+        while True:
+            await asyncio.sleep(10)
+            stats = server.stats()
+            print(
+                f"{stats['creations']} creations, {stats['noise']} swaps, {stats['notifications']} notifications, "
+                f"{stats['log_subscriptions']} log subscriptions, {stats['sent']} transactions sent"
+            )
+    finally:
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Solana RPC, Jupiter and DexScreener server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    add_config_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Replay a recorded log stream (RECORD_LOG_STREAM=true) through SniperBot's
+handlers with the network services stubbed out, and report throughput,
+queue behaviour and per-stage latency.
+
+Run from the "Sniper Bot" directory:
+    python -m tools.replay cache/recordings/logs-20250101-120000.jsonl.gz --speed 10
+    python -m tools.replay recording.jsonl.gz --speed 0 --accept-all --jupiter-ms 20
+--speed 1 replays in real time, N is N times faster and 0 is as fast as
+the bot can take it.
+"""
+import argparse
+import asyncio
+import time
+from tools.stubs import StubLatency, install
+
+async def replay(bot, entries: list, speed: float) -> float:
+    """Feed entries to the bot's log callbacks, paced by their arrival times"""
+    callbacks = bot.log_callbacks()
+    started = time.monotonic()
+    for i, entry in enumerate(entries):
+        callback = callbacks.get(entry["program"])
+        if callback is None:
+            continue
+        if speed > 0:
+            delay = entry["t"] / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif i % 64 == 0:
+            # Yield the way a socket read would
+            await asyncio.sleep(0)
+        await callback(entry["logs"], entry["signature"])
+    return time.monotonic() - started
+
+async def drain(bot):
+    """Wait for every queued event and confirmation to finish"""
+    queue = bot.event_queue
+    while queue.processed + queue.failed + sum(queue.dropped.values()) < queue.enqueued or bot.pending_snipes:
+        await asyncio.sleep(0.01)
+    while bot.confirmation_tasks:
+        await asyncio.gather(*bot.confirmation_tasks, return_exceptions=True)
+
+async def run(args):
+    latency = StubLatency(
+        rpc=args.rpc_ms / 1000,
+        jupiter=args.jupiter_ms / 1000,
+        dexscreener=args.dexscreener_ms / 1000,
+        confirm=args.confirm_ms / 1000
+    )
+    client = install(latency, accept_all=args.accept_all)
+
+    from bot.sniper_bot import sniper_bot
+    from utils.latency_tracker import latency_tracker
+    from utils.stream_recorder import read_recording
+
+    entries = list(read_recording(args.recording))
+    sniper_bot.auto_snipe_enabled = True
+    sniper_bot.event_queue.start()
+
+    started = time.monotonic()
+    feed_time = await replay(sniper_bot, entries, args.speed)
+    await drain(sniper_bot)
+    total_time = time.monotonic() - started
+    recorded_span = entries[-1]["t"] - entries[0]["t"] if entries else 0.0
+
+    stats = sniper_bot.event_queue.stats()
+    print(f"replayed   {len(entries)} notifications ({recorded_span:.1f}s recorded) in {feed_time:.2f}s, {len(entries) / max(feed_time, 1e-9):,.0f} events/s")
+    print(f"handled    {stats['processed']} in {total_time:.2f}s, {stats['failed']} failed, dropped {stats['dropped']}")
+    print(f"queue      max depth {stats['max_depth']}, avg wait {stats['avg_wait'] * 1000:.3f}ms, max wait {stats['max_wait'] * 1000:.3f}ms")
+    print(f"dedup      {sniper_bot.seen_signatures.hits} signatures, {sniper_bot.seen_mints.hits} mints")
+    print(f"snipes     {latency_tracker.traces} candidates, {client.sent} sent")
+    print(latency_tracker.report())
+
+    await sniper_bot.event_queue.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded log stream through SniperBot")
+    parser.add_argument("recording", help="gzip JSONL recording")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier, 0 for max speed")
+    parser.add_argument("--accept-all", action="store_true", help="Pass every analysis to exercise the send path")
+    parser.add_argument("--rpc-ms", type=float, default=5.0)
+    parser.add_argument("--jupiter-ms", type=float, default=30.0)
+    parser.add_argument("--dexscreener-ms", type=float, default=50.0)
+    parser.add_argument("--confirm-ms", type=float, default=400.0)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+In-process stand-ins for the RPC node, Jupiter and DexScreener with
+configurable latency, for running the detection path offline.
+
+install() must run before bot.sniper_bot is imported: it registers a
+stub bot.solana_client module (so no wallet or RPC endpoint is needed),
+turns off state persistence and patches the Jupiter and DexScreener
+service instances.
+"""
+import asyncio
+import base64
+import os
+import struct
+import sys
+import time
+import types
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.system_program import transfer, TransferParams
+from solders.transaction import Transaction as SoldersTransaction
+
+SOL_MINT = Pubkey.from_string("So11111111111111111111111111111111111111112")
+_MARKET_SIZE = 388
+
+class StubLatency:
+    """Simulated round trip per service, in seconds."""
+    def __init__(self, rpc: float = 0.005, jupiter: float = 0.03, dexscreener: float = 0.05, confirm: float = 0.4):
+        self.rpc = rpc
+        self.jupiter = jupiter
+        self.dexscreener = dexscreener
+        self.confirm = confirm
+
+def swap_transaction(payer: Pubkey, blockhash: Hash = None, destination: Pubkey = None, lamports: int = 1) -> str:
+    """Base64 unsigned legacy transaction, in the shape of a Jupiter /swap reply"""
+    instruction = transfer(TransferParams(from_pubkey=payer, to_pubkey=destination or payer, lamports=lamports))
+    message = Message.new_with_blockhash([instruction], payer, blockhash or Hash.default())
+    transaction = SoldersTransaction.new_unsigned(message)
+    return base64.b64encode(bytes(transaction)).decode()
+
+def market_account(base_mint: str, market: str = None) -> bytes:
+    """
+    Serum market state for base_mint quoted in SOL. Given the market's own
+    address, it also gets a vault signer nonce that derives a valid address.
+    """
+    data = bytearray(_MARKET_SIZE)
+    if market is not None:
+        from utils.raydium_swap import vault_signer_address
+        address = Pubkey.from_string(market)
+        nonce = next(n for n in range(256) if vault_signer_address(address, n) is not None)
+        data[45:53] = struct.pack("<Q", nonce)
+    data[53:85] = bytes(Pubkey.from_string(base_mint))
+    data[85:117] = bytes(SOL_MINT)
+    return bytes(data)
+
+class StubRpc:
+    def __init__(self, latency: StubLatency):
+        self.latency = latency
+        self.calls = 0
+
+    async def call(self, method: str, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency.rpc)
+        if method == "simulate_transaction":
+            logs = [
+                "Program 11111111111111111111111111111111 invoke [1]",
+                "Program 11111111111111111111111111111111 consumed 150 of 200000 compute units",
+                "Program 11111111111111111111111111111111 success"
+            ]
+            return types.SimpleNamespace(value=types.SimpleNamespace(err=None, logs=logs))
+        if method == "get_latest_blockhash":
+            # A fresh blockhash each time, valid for the usual 150 blocks
+            return types.SimpleNamespace(value=types.SimpleNamespace(blockhash=Hash.new_unique(), last_valid_block_height=150))
+        if method == "get_block_height":
+            return types.SimpleNamespace(value=0)
+        if method == "get_multiple_accounts":
+            # Wallet balances: 100 SOL each
+            return types.SimpleNamespace(
+                context=types.SimpleNamespace(slot=0),
+                value=[types.SimpleNamespace(lamports=100 * 10**9) for _ in args[0]]
+            )
+        raise NotImplementedError(f"Stub RPC has no {method}")
+
+    async def request(self, method: str, params: list = None):
+        self.calls += 1
+        await asyncio.sleep(self.latency.rpc)
+        if method == "getRecentPrioritizationFees":
+            return [{"slot": slot, "prioritizationFee": slot * 1000} for slot in range(1, 151)]
+        raise NotImplementedError(f"Stub RPC has no {method}")
+
+class StubSolanaClient:
+    """The parts of SolanaClient used by SniperBot and the simulator."""
+    def __init__(self, latency: StubLatency):
+        self.latency = latency
+        from bot.wallet_pool import WalletPool
+        from bot.nonce_manager import NonceManager
+        from bot.fee_estimator import FeeEstimator
+        from bot.blockhash_cache import BlockhashCache
+        self.keypair = Keypair()
+        self.rpc = StubRpc(latency)
+        self.blockhash_cache = BlockhashCache(self.rpc)  # fetched on first use, never refreshed
+        self.wallets = WalletPool(self.rpc, [self.keypair])
+        self.nonces = NonceManager(self.rpc, None, self.keypair)  # none configured, so nothing is pre-signed
+        self.fees = FeeEstimator(self.rpc)
+        self.confirmations = {}
+        self.sent = 0
+
+    def start(self):
+        pass
+
+    async def start_nonces(self):
+        pass
+
+    async def start_balances(self):
+        pass
+
+    async def get_balance(self):
+        return 100.0
+
+    async def get_total_balance(self):
+        return await self.wallets.refresh_balances() / 10**9
+
+    async def get_account_data(self, address):
+        await asyncio.sleep(self.latency.rpc)
+        # The market address doubles as the token mint
+        return market_account(address, address)
+
+    async def send_transaction(self, transaction, last_valid_block_height=None, signer=None):
+        await asyncio.sleep(self.latency.rpc)
+        self.sent += 1
+        return Signature.new_unique()
+
+    async def confirm_transaction(self, signature, transaction=None, sent_at=None):
+        await asyncio.sleep(self.latency.confirm)
+        elapsed = time.monotonic() - (sent_at or time.monotonic())
+        return {
+            "signature": str(signature),
+            "status": "confirmed",
+            "slot": 0,
+            "error": None,
+            "time_to_processed": elapsed / 2,
+            "time_to_confirmed": elapsed
+        }
+
+    async def monitor_logs(self, program_id, callback):
+        return None
+
+    async def close(self):
+        pass
+
+def install(latency: StubLatency, accept_all: bool = False) -> StubSolanaClient:
+    """
+    Replace the network facing services with stubs. With accept_all every
+    analysis passes, so the whole path through sending is exercised.
+    """
+    # Stubbed runs shouldn't touch the bot's saved state
+    os.environ.setdefault("STATE_PERSISTENCE", "false")
+    client = StubSolanaClient(latency)
+    module = types.ModuleType("bot.solana_client")
+    module.solana_client = client
+    module.SolanaClient = StubSolanaClient
+    sys.modules["bot.solana_client"] = module
+
+    from services.jupiter_service import jupiter_service
+    from services.dexscreener_service import dexscreener_service
+
+    swap_reply = {"swapTransaction": swap_transaction(client.keypair.pubkey())}
+
+    async def get_quote(input_mint, output_mint, amount, slippage_bps, only_direct_routes=False):
+        await asyncio.sleep(latency.jupiter)
+        return {"inputMint": input_mint, "outputMint": output_mint, "inAmount": str(amount), "outAmount": str(amount)}
+
+    async def get_swap_transaction(quote_response, user_public_key):
+        await asyncio.sleep(latency.jupiter)
+        return swap_reply
+
+    async def get_prices(mint_addresses, vs_token=None):
+        await asyncio.sleep(latency.jupiter)
+        return {mint: 1.0 for mint in mint_addresses}
+
+    async def fetch_token_info(mint_address):
+        await asyncio.sleep(latency.dexscreener)
+        pair = {
+            "liquidity": {"usd": 50000, "lock": {"locked": True}},
+            "pairCreatedAt": int(time.time() * 1000)
+        }
+        return {"pairs": [pair]}
+
+    jupiter_service.get_quote = get_quote
+    jupiter_service.get_swap_transaction = get_swap_transaction
+    jupiter_service.get_prices = get_prices
+    dexscreener_service._fetch_token_info = fetch_token_info
+
+    if accept_all:
+        accept_all_analyses()
+
+    return client
+
+def accept_all_analyses():
+    """
+    Make every token analysis pass. The analyzer's risk score never gets
+    low enough for synthetic tokens, so this is the only way to exercise
+    the quote, build and send path offline.
+    """
+    from utils.token_analyzer import token_analyzer
+
+    analyze = token_analyzer._analyze
+
+    async def accepting_analyze(mint_address):
+        analysis = await analyze(mint_address)
+        analysis["is_valid"] = True
+        analysis["is_rug"] = False
+        return analysis
+
+    token_analyzer._analyze = accepting_analyze
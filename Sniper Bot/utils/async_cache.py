@@ -0,0 +1,99 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+class AsyncTTLCache:
+    """
+    Size-bounded LRU cache for coroutine results with a per-entry TTL.
+    Concurrent lookups of a missing key share a single in-flight load.
+    """
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expiry, value), least recently used first
+        self.inflight = {}  # key -> Future of the load in progress
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.loads = 0
+        self.load_time = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    async def get_or_load(self, key, loader, ttl=None):
+        """
+        Return the cached value for key, or await loader() to produce it.
+        ttl overrides the default and may be a callable taking the loaded
+        value; a TTL of 0 or less leaves the value uncached.
+        """
+        while True:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self.entries[key]
+
+            pending = self.inflight.get(key)
+            if pending is None:
+                break
+
+            # Shield so one waiter being cancelled doesn't cancel the load
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The loading caller was cancelled; try again ourselves
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        started = time.monotonic()
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self.inflight[key]
+
+        self.loads += 1
+        self.load_time += time.monotonic() - started
+        self.set(key, value, self.ttl if ttl is None else ttl(value) if callable(ttl) else ttl)
+        future.set_result(value)
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value directly, e.g. one restored from disk; a TTL of 0 or less is ignored"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Hit ratio and the load latency avoided by hits and coalesced calls"""
+        lookups = self.hits + self.coalesced + self.misses
+        avg_load = self.load_time / self.loads if self.loads else 0.0
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "avg_load_time": avg_load,
+            "saved_time": (self.hits + self.coalesced) * avg_load
+        }
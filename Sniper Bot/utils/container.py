@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+class LazyComponent:
+    """
+    Stands in for a registered component and builds it on first attribute
+    access, so modules can keep exporting a global instance that costs
+    nothing to import.
+    """
+    __slots__ = ("_container", "_name")
+
+    def __init__(self, container, name: str):
+        object.__setattr__(self, "_container", container)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attribute):
+        return getattr(self._container.get(self._name), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self._container.get(self._name), attribute, value)
+
+    def __repr__(self):
+        state = "built" if self._container.is_built(self._name) else "not built"
+        return f"<lazy {self._name} ({state})>"
+
+class Container:
+    """
+    Registry of the bot's singletons. Each is built once, either on first
+    use or ahead of time in a startup phase with build(), which runs the
+    factories on a worker thread so slow constructors (key derivation,
+    wallet decryption) don't stall the event loop.
+    """
+    def __init__(self):
+        self.factories = {}
+        self.instances = {}
+        self.locks = {}  # one per component, so unrelated builds don't wait on each other
+        self.build_times = {}
+
+    def register(self, name: str, factory) -> LazyComponent:
+        """Register a factory and return the lazy stand-in for its instance"""
+        self.factories[name] = factory
+        self.locks[name] = threading.RLock()
+        return LazyComponent(self, name)
+
+    def is_built(self, name: str) -> bool:
+        return name in self.instances
+
+    def get(self, name: str):
+        """The component's instance, building it if needed"""
+        instance = self.instances.get(name)
+        if instance is not None:
+            return instance
+        with self.locks[name]:
+            if name not in self.instances:
+                started = time.perf_counter()
+                self.instances[name] = self.factories[name]()
+                self.build_times[name] = time.perf_counter() - started
+            return self.instances[name]
+
+    async def build(self, *names: str):
+        """Build components in order on a worker thread."""
+        def build_all():
+            for name in names:
+                self.get(name)
+        await asyncio.to_thread(build_all)
+
+# Global instance
+container = Container()
@@ -0,0 +1,58 @@
+import time
+from collections import OrderedDict
+
+class DedupCache:
+    """
+    Fixed-capacity set of recently seen keys with a per-entry TTL.
+    Memory is bounded by capacity regardless of how long the bot runs.
+    """
+    def __init__(self, capacity: int, ttl: float):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> expiry, oldest first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def seen(self, key) -> bool:
+        """Record a key, returning True if it was already present and unexpired"""
+        now = time.monotonic()
+        expiry = self.entries.get(key)
+        if expiry is not None and expiry > now:
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        self.entries[key] = now + self.ttl
+        self.entries.move_to_end(key)
+        self._evict(now)
+        return False
+
+    def discard(self, key):
+        """Forget a key so it is processed again next time."""
+        self.entries.pop(key, None)
+
+    def _evict(self, now: float):
+        # Every entry gets the same TTL, so insertion order is expiry order
+        entries = self.entries
+        while entries:
+            oldest = next(iter(entries.values()))
+            if oldest > now and len(entries) <= self.capacity:
+                break
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,214 @@
+import binascii
+import struct
+from solders.pubkey import Pubkey
+from config.settings import RAYDIUM_AMM_PROGRAM_ID
+
+RAY_LOG_PREFIX = "Program log: ray_log: "
+PROGRAM_DATA_PREFIX = "Program data: "
+
+RAYDIUM_AMM_PROGRAM = Pubkey.from_string(RAYDIUM_AMM_PROGRAM_ID)
+TOKEN_PROGRAM = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+TOKEN_2022_PROGRAM = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
+ASSOCIATED_TOKEN_PROGRAM = Pubkey.from_string("ATokenGPvbdGVxr1b2hvZbsiqW5xWH25efTNsLJA8knL")
+
+# Raydium AMM v4 ray_log InitLog:
+# log_type u8, time u64, pc_decimals u8, coin_decimals u8, pc_lot_size u64,
+# coin_lot_size u64, pc_amount u64, coin_amount u64, market Pubkey
+_RAY_LOG_INIT = 0
+_RAY_INIT_LAYOUT = struct.Struct("<BQBBQQQQ")
+
+# A log type byte of 0 always encodes as "A" followed by one of "A".."P" in
+# base64; swaps, deposits and withdrawals never do
+_RAY_LOG_TAG = "ray_log: A"
+_RAY_INIT_SECOND_CHARS = frozenset("ABCDEFGHIJKLMNOP")
+_RAY_INIT_CHAR_INDEX = len(RAY_LOG_PREFIX) + 1
+
+# Anchor events are prefixed with sha256("event:<Name>")[:8]. The first ten
+# base64 characters depend only on those eight bytes, so other events can be
+# rejected on the text alone.
+_PUMP_CREATE_DISCRIMINATOR = bytes([27, 114, 169, 77, 222, 235, 99, 118])
+_PUMP_COMPLETE_DISCRIMINATOR = bytes([95, 114, 97, 156, 212, 46, 152, 8])
+_PUMP_CREATE_PREFIX = PROGRAM_DATA_PREFIX + "G3KpTd7rY3"
+_PUMP_COMPLETE_PREFIX = PROGRAM_DATA_PREFIX + "X3JhnNQumA"
+_PUMP_PREFIXES = (_PUMP_CREATE_PREFIX, _PUMP_COMPLETE_PREFIX)
+_PUMP_CREATE_TAIL = struct.Struct("<qQQQQ")  # timestamp, virtual token/sol reserves, real token reserves, supply
+_PUMP_TOKEN_DECIMALS = 6
+
+# Serum / OpenBook market state v3 (388 bytes)
+_MARKET_SIZE = 388
+
+# Raydium AMM v4 pool state (752 bytes); CPMM and CLMM pools have other sizes
+_AMM_SIZE = 752
+
+class RaydiumInitEvent:
+    """Decoded Raydium AMM v4 pool initialization."""
+    __slots__ = (
+        "market", "pool_address", "base_vault", "quote_vault", "open_time",
+        "base_reserve", "quote_reserve", "base_decimals", "quote_decimals"
+    )
+
+class PumpFunEvent:
+    """Decoded Pump.fun create or bonding-curve complete event."""
+    __slots__ = (
+        "kind", "mint_address", "pool_address", "base_vault", "quote_vault", "creator",
+        "open_time", "base_reserve", "quote_reserve", "base_decimals", "quote_decimals"
+    )
+
+class SerumMarket:
+    """Account keys from a Serum / OpenBook market state."""
+    __slots__ = (
+        "vault_signer_nonce", "base_mint", "quote_mint", "base_vault", "quote_vault",
+        "request_queue", "event_queue", "bids", "asks"
+    )
+
+class RaydiumAmm:
+    """Vaults, mints, decimals and the pnl owed out from a Raydium AMM v4 pool state."""
+    __slots__ = (
+        "base_decimals", "quote_decimals", "need_take_pnl_base", "need_take_pnl_quote",
+        "base_vault", "quote_vault", "base_mint", "quote_mint", "open_orders", "market"
+    )
+
+def _pubkey(view, offset: int) -> str:
+    return str(Pubkey(view[offset:offset + 32]))
+
+def _skip_string(view, offset: int) -> int:
+    (length,) = struct.unpack_from("<I", view, offset)
+    return offset + 4 + length
+
+def raydium_pool_address(market: Pubkey, seed: bytes) -> Pubkey:
+    """Derive a Raydium AMM v4 account that initialize2 places at a market-associated address"""
+    return Pubkey.find_program_address([bytes(RAYDIUM_AMM_PROGRAM), bytes(market), seed], RAYDIUM_AMM_PROGRAM)[0]
+
+def associated_token_address(owner: Pubkey, mint: Pubkey, token_program: Pubkey = TOKEN_PROGRAM) -> Pubkey:
+    return Pubkey.find_program_address([bytes(owner), bytes(token_program), bytes(mint)], ASSOCIATED_TOKEN_PROGRAM)[0]
+
+class EventDecoder:
+    """
+    Decodes binary event payloads straight from log notifications.
+    Payloads are base64 decoded once and read in place through a
+    memoryview, without slicing copies.
+    """
+    @staticmethod
+    def decode_raydium_init(logs: list) -> RaydiumInitEvent:
+        """Find and decode a ray_log InitLog, None if the logs contain none"""
+        for line in logs:
+            if _RAY_LOG_TAG not in line or not line.startswith(RAY_LOG_PREFIX):
+                continue
+            if line[_RAY_INIT_CHAR_INDEX] not in _RAY_INIT_SECOND_CHARS:
+                continue
+
+            view = memoryview(binascii.a2b_base64(line[len(RAY_LOG_PREFIX):]))
+            if view[0] != _RAY_LOG_INIT or len(view) < _RAY_INIT_LAYOUT.size + 32:
+                continue
+
+            _, open_time, pc_decimals, coin_decimals, _, _, pc_amount, coin_amount = _RAY_INIT_LAYOUT.unpack_from(view, 0)
+            market = Pubkey(view[_RAY_INIT_LAYOUT.size:_RAY_INIT_LAYOUT.size + 32])
+
+            event = RaydiumInitEvent()
+            event.market = str(market)
+            event.pool_address = str(raydium_pool_address(market, b"amm_associated_seed"))
+            event.base_vault = str(raydium_pool_address(market, b"coin_vault_associated_seed"))
+            event.quote_vault = str(raydium_pool_address(market, b"pc_vault_associated_seed"))
+            event.open_time = open_time
+            event.base_reserve = coin_amount
+            event.quote_reserve = pc_amount
+            event.base_decimals = coin_decimals
+            event.quote_decimals = pc_decimals
+            return event
+
+        return None
+
+    @staticmethod
+    def decode_pump_fun_event(logs: list) -> PumpFunEvent:
+        """Find and decode a Pump.fun CreateEvent or CompleteEvent, None otherwise"""
+        for line in logs:
+            if not line.startswith(_PUMP_PREFIXES):
+                continue
+            kind = "create" if line.startswith(_PUMP_CREATE_PREFIX) else "complete"
+
+            view = memoryview(binascii.a2b_base64(line[len(PROGRAM_DATA_PREFIX):]))
+            discriminator = _PUMP_CREATE_DISCRIMINATOR if kind == "create" else _PUMP_COMPLETE_DISCRIMINATOR
+            if view[:8] != discriminator:
+                continue
+
+            event = PumpFunEvent()
+            event.kind = kind
+            event.creator = None
+            event.open_time = None
+            event.base_reserve = None
+            event.quote_reserve = None
+            event.base_decimals = _PUMP_TOKEN_DECIMALS
+            event.quote_decimals = 9
+
+            if kind == "create":
+                # name, symbol, uri, then mint, bonding_curve, user
+                offset = _skip_string(view, 8)
+                offset = _skip_string(view, offset)
+                offset = _skip_string(view, offset)
+                mint = Pubkey(view[offset:offset + 32])
+                curve = Pubkey(view[offset + 32:offset + 64])
+                event.creator = _pubkey(view, offset + 64)
+                offset += 96
+
+                # Newer program versions append creator, timestamp and reserves
+                if len(view) >= offset + 32 + _PUMP_CREATE_TAIL.size:
+                    event.creator = _pubkey(view, offset)
+                    timestamp, virtual_token, virtual_sol, _, _ = _PUMP_CREATE_TAIL.unpack_from(view, offset + 32)
+                    event.open_time = timestamp
+                    event.base_reserve = virtual_token
+                    event.quote_reserve = virtual_sol
+            else:
+                # user, mint, bonding_curve, timestamp
+                mint = Pubkey(view[40:72])
+                curve = Pubkey(view[72:104])
+                if len(view) >= 112:
+                    (event.open_time,) = struct.unpack_from("<q", view, 104)
+
+            event.mint_address = str(mint)
+            event.pool_address = str(curve)
+            event.base_vault = str(associated_token_address(curve, mint))
+            event.quote_vault = event.pool_address  # SOL sits on the bonding curve account itself
+            return event
+
+        return None
+
+    @staticmethod
+    def decode_serum_market(data: bytes) -> SerumMarket:
+        """Decode the account keys of a Serum / OpenBook market, None if malformed"""
+        if not data or len(data) < _MARKET_SIZE:
+            return None
+
+        view = memoryview(data)
+        market = SerumMarket()
+        (market.vault_signer_nonce,) = struct.unpack_from("<Q", view, 45)
+        market.base_mint = _pubkey(view, 53)
+        market.quote_mint = _pubkey(view, 85)
+        market.base_vault = _pubkey(view, 117)
+        market.quote_vault = _pubkey(view, 165)
+        market.request_queue = _pubkey(view, 221)
+        market.event_queue = _pubkey(view, 253)
+        market.bids = _pubkey(view, 285)
+        market.asks = _pubkey(view, 317)
+        return market
+
+    @staticmethod
+    def decode_raydium_amm(data: bytes) -> RaydiumAmm:
+        """Decode a Raydium AMM v4 pool account, None if it is any other kind of account"""
+        if not data or len(data) != _AMM_SIZE:
+            return None
+
+        view = memoryview(data)
+        amm = RaydiumAmm()
+        amm.base_decimals, amm.quote_decimals = struct.unpack_from("<QQ", view, 32)
+        # Swap fees not yet taken out of the vaults, which don't belong to the pool
+        amm.need_take_pnl_base, amm.need_take_pnl_quote = struct.unpack_from("<QQ", view, 192)
+        amm.base_vault = _pubkey(view, 336)
+        amm.quote_vault = _pubkey(view, 368)
+        amm.base_mint = _pubkey(view, 400)
+        amm.quote_mint = _pubkey(view, 432)
+        amm.open_orders = _pubkey(view, 496)
+        amm.market = _pubkey(view, 528)
+        return amm
+
+# Global instance
+event_decoder = EventDecoder()
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from config.settings import LATENCY_REPORT_INTERVAL
+
+# Pipeline stages in the order they normally happen
+STAGES = ("received", "parsed", "deduped", "analyzed", "quoted", "built", "simulated", "sent", "confirmed")
+
+_SUB_BITS = 5  # 32 linear sub-buckets per power of two, about 3% error
+_SUB_COUNT = 1 << _SUB_BITS
+_MAX_EXPONENT = 32  # values up to 2^38 microseconds (76 hours)
+
+class Histogram:
+    """
+    HDR-style log-linear histogram of durations in microseconds.
+    Recording is an index computation and a list increment; memory is a
+    fixed list of counters however many samples are recorded.
+    """
+    def __init__(self):
+        self.counts = [0] * (_SUB_COUNT * (_MAX_EXPONENT + 2))
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(value: int) -> int:
+        if value < _SUB_COUNT:
+            return value
+        # value >> exponent falls in [_SUB_COUNT, 2 * _SUB_COUNT)
+        exponent = value.bit_length() - _SUB_BITS - 1
+        if exponent > _MAX_EXPONENT:
+            return (_MAX_EXPONENT + 2) * _SUB_COUNT - 1
+        return exponent * _SUB_COUNT + (value >> exponent)
+
+    @staticmethod
+    def _value(index: int) -> int:
+        """Midpoint of a bucket"""
+        if index < _SUB_COUNT:
+            return index
+        exponent, sub = divmod(index, _SUB_COUNT)
+        exponent -= 1
+        low = (_SUB_COUNT + sub) << exponent
+        return low + (1 << exponent) // 2
+
+    def record(self, seconds: float):
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        """Value at quantile q (0-1) in seconds"""
+        if not self.total:
+            return 0.0
+        target = max(1, int(q * self.total + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._value(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+class Trace:
+    """Monotonic timestamps of one candidate mint's trip through the pipeline."""
+    __slots__ = ("mint_address", "stages", "recorded")
+
+    def __init__(self, received_at: float = None):
+        self.mint_address = None
+        self.stages = {"received": received_at or time.monotonic()}
+        self.recorded = set()
+
+    def mark(self, stage: str):
+        self.stages[stage] = time.monotonic()
+
+    def elapsed(self, stage: str) -> float:
+        """Seconds from receiving the notification to a stage"""
+        return self.stages[stage] - self.stages["received"]
+
+class LatencyTracker:
+    """
+    Aggregates traces into one histogram per stage of the time since the
+    notification was received. Stages can overlap (the swap is built while
+    analysis runs), so cumulative times are kept rather than deltas.
+    """
+    def __init__(self, report_interval: float = LATENCY_REPORT_INTERVAL):
+        self.report_interval = report_interval
+        self.histograms = {}  # stage -> Histogram
+        self.traces = 0
+        self.task = None
+
+    def finish(self, trace: Trace):
+        """Record every stage of a trace not recorded yet; may be called again as it progresses."""
+        if not trace.recorded:
+            self.traces += 1
+        for stage, timestamp in trace.stages.items():
+            if stage == "received" or stage in trace.recorded:
+                continue
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.record(timestamp - trace.stages["received"])
+            trace.recorded.add(stage)
+
+    def summary(self) -> dict:
+        """p50/p90/p99 in seconds and sample count per stage"""
+        ordered = [stage for stage in STAGES if stage in self.histograms]
+        ordered += sorted(stage for stage in self.histograms if stage not in STAGES)
+        return {
+            stage: {
+                "count": self.histograms[stage].total,
+                "p50": self.histograms[stage].percentile(0.50),
+                "p90": self.histograms[stage].percentile(0.90),
+                "p99": self.histograms[stage].percentile(0.99)
+            }
+            for stage in ordered
+        }
+
+    def report(self) -> str:
+        """Fixed-width table of stage percentiles in milliseconds"""
+        summary = self.summary()
+        if not summary:
+            return "No latency samples yet."
+        lines = [f"{'stage':<10} {'count':>7} {'p50':>9} {'p90':>9} {'p99':>9}"]
+        for stage, row in summary.items():
+            lines.append(
+                f"{stage:<10} {row['count']:>7} {row['p50'] * 1000:>7.1f}ms "
+                f"{row['p90'] * 1000:>7.1f}ms {row['p99'] * 1000:>7.1f}ms"
+            )
+        return "\n".join(lines)
+
+    def start(self):
+        """Start the periodic report if enabled and not already running."""
+        if self.report_interval > 0 and (self.task is None or self.task.done()):
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        reported = 0
+        while True:
+            await asyncio.sleep(self.report_interval)
+            if self.traces != reported:
+                reported = self.traces
+                print(f"Latency since notification received ({self.traces} traces):\n{self.report()}")
+
+    async def close(self):
+        """Stop the periodic report."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+
+# Global instance
+latency_tracker = LatencyTracker()
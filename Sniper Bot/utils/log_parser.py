@@ -1,116 +1,132 @@
 import re
-import base64
-import json
-from solana.transaction import Transaction
-from solana.rpc.core import RPCException
-from bot.solana_client import solana_client
+from utils.event_decoder import event_decoder
+
+_MINT_PATTERN = re.compile(r'mint: (\w{32,44})')
+
+# Fields copied from decoded binary events onto ParsedLog
+_EVENT_FIELDS = (
+    "pool_address", "base_vault", "quote_vault", "open_time",
+    "base_reserve", "quote_reserve", "base_decimals", "quote_decimals"
+)
+
+class ParsedLog:
+    """Compact result of a parsed program log notification."""
+    __slots__ = (
+        "program", "signature", "action", "mint_address", "pool_address", "position_address",
+        "market", "base_vault", "quote_vault", "open_time", "base_reserve", "quote_reserve",
+        "base_decimals", "quote_decimals", "creator"
+    )
+
+    def __init__(self, program, signature, action):
+        self.program = program
+        self.signature = signature
+        self.action = action
+        self.mint_address = None
+        self.pool_address = None
+        self.position_address = None
+        self.market = None
+        self.base_vault = None
+        self.quote_vault = None
+        self.open_time = None
+        self.base_reserve = None
+        self.quote_reserve = None
+        self.base_decimals = None
+        self.quote_decimals = None
+        self.creator = None
+
+    def apply_event(self, event):
+        """Copy pool fields from a decoded binary event."""
+        for name in _EVENT_FIELDS:
+            setattr(self, name, getattr(event, name))
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"ParsedLog({self.program}, {self.action}, mint={self.mint_address})"
+
+def _contains(logs: list, marker: str) -> bool:
+    """True if any log line contains the marker, stopping at the first hit"""
+    for line in logs:
+        if marker in line:
+            return True
+    return False
+
+def _find(logs: list, literal: str, pattern) -> str:
+    """First capture of pattern, only running the regex on lines with the literal"""
+    for line in logs:
+        if literal in line:
+            match = pattern.search(line)
+            if match:
+                return match.group(1)
+    return None
 
 class LogParser:
+    """
+    Parses program log notifications into ParsedLog objects.
+    Almost every notification is a swap, so each parser rejects anything
+    that isn't a creation event with plain prefix/substring checks before
+    doing any decoding or regex work, and returns None for it.
+    Raydium AMM and Pump.fun events are decoded from their binary
+    ray_log / "Program data:" payloads.
+    """
     @staticmethod
-    def parse_raydium_amm_logs(logs: list, signature: str) -> dict:
+    def parse_raydium_amm_logs(logs: list, signature: str) -> ParsedLog:
         """
         Parse Raydium AMM logs to extract token information
-        Returns dict with mint_address, pool_address, and other details
+        Returns a ParsedLog for pool creations, None otherwise
         """
-        result = {
-            "mint_address": None,
-            "pool_address": None,
-            "signature": signature,
-            "program": "raydium_amm"
-        }
-        
         try:
-            joined_logs = " ".join(logs)
-            
-            # Look for mint address in logs
-            mint_pattern = r'mint: (\w{32,44})'
-            mint_match = re.search(mint_pattern, joined_logs)
-            if mint_match:
-                result["mint_address"] = mint_match.group(1)
-            
-            # Look for pool address
-            pool_pattern = r'pool: (\w{32,44})'
-            pool_match = re.search(pool_pattern, joined_logs)
-            if pool_match:
-                result["pool_address"] = pool_match.group(1)
-            
-            # Look for initialization message
-            if "initialize2" in joined_logs and "init_pair" in joined_logs:
-                result["action"] = "pool_creation"
-            
+            event = event_decoder.decode_raydium_init(logs)
+            if event is None:
+                return None
+
+            # ray_log carries the market but not the token mint; the mint is
+            # read from the market account when it is needed
+            result = ParsedLog("raydium_amm", signature, "pool_creation")
+            result.apply_event(event)
+            result.market = event.market
             return result
         except Exception as e:
             print(f"Error parsing Raydium AMM logs: {e}")
-            return result
-    
+            return None
+
     @staticmethod
-    def parse_raydium_clmm_logs(logs: list, signature: str) -> dict:
+    def parse_raydium_clmm_logs(logs: list, signature: str) -> ParsedLog:
         """
         Parse Raydium CLMM logs to extract token information
         """
-        result = {
-            "mint_address": None,
-            "position_address": None,
-            "signature": signature,
-            "program": "raydium_clmm"
-        }
-        
         try:
-            joined_logs = " ".join(logs)
-            
-            # Look for open position events
-            if "open_position" in joined_logs:
-                result["action"] = "position_opened"
-                
-                # Try to extract mint address
-                mint_pattern = r'mint: (\w{32,44})'
-                mint_match = re.search(mint_pattern, joined_logs)
-                if mint_match:
-                    result["mint_address"] = mint_match.group(1)
-            
+            if not _contains(logs, "open_position"):
+                return None
+
+            result = ParsedLog("raydium_clmm", signature, "position_opened")
+            result.mint_address = _find(logs, "mint: ", _MINT_PATTERN)
             return result
         except Exception as e:
             print(f"Error parsing Raydium CLMM logs: {e}")
-            return result
-    
+            return None
+
     @staticmethod
-    def parse_pump_fun_logs(logs: list, signature: str) -> dict:
+    def parse_pump_fun_logs(logs: list, signature: str) -> ParsedLog:
         """
         Parse Pump.fun logs to extract token information
         """
-        result = {
-            "mint_address": None,
-            "signature": signature,
-            "program": "pump_fun"
-        }
-        
         try:
-            joined_logs = " ".join(logs)
-            
-            # Look for token creation
-            if "create" in joined_logs and "token" in joined_logs:
-                result["action"] = "token_creation"
-                
-                # Try to extract mint address
-                mint_pattern = r'mint: (\w{32,44})'
-                mint_match = re.search(mint_pattern, joined_logs)
-                if mint_match:
-                    result["mint_address"] = mint_match.group(1)
-            
-            # Look for init_launch (migration to AMM)
-            if "init_launch" in joined_logs:
-                result["action"] = "migration_initiated"
-                
-                # Try to extract mint address
-                mint_pattern = r'mint: (\w{32,44})'
-                mint_match = re.search(mint_pattern, joined_logs)
-                if mint_match:
-                    result["mint_address"] = mint_match.group(1)
-            
+            event = event_decoder.decode_pump_fun_event(logs)
+            if event is None:
+                return None
+
+            # A completed bonding curve is what triggers migration to the AMM
+            action = "token_creation" if event.kind == "create" else "migration_initiated"
+            result = ParsedLog("pump_fun", signature, action)
+            result.apply_event(event)
+            result.mint_address = event.mint_address
+            result.creator = event.creator
             return result
         except Exception as e:
             print(f"Error parsing Pump.fun logs: {e}")
-            return result
+            return None
 
 # Global instance
 log_parser = LogParser()
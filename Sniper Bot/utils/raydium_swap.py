@@ -0,0 +1,232 @@
+import hashlib
+import struct
+from solders.instruction import AccountMeta, Instruction
+from solders.pubkey import Pubkey
+from solders.system_program import transfer, TransferParams
+from solana.transaction import Transaction
+from config.settings import OPENBOOK_PROGRAM_ID, SOL_MINT
+from utils.event_decoder import (
+    RAYDIUM_AMM_PROGRAM,
+    TOKEN_PROGRAM,
+    ASSOCIATED_TOKEN_PROGRAM,
+    raydium_pool_address,
+    associated_token_address
+)
+
+OPENBOOK_PROGRAM = Pubkey.from_string(OPENBOOK_PROGRAM_ID)
+SYSTEM_PROGRAM = Pubkey.from_string("11111111111111111111111111111111")
+WSOL_MINT = Pubkey.from_string(SOL_MINT)
+AMM_AUTHORITY = Pubkey.find_program_address([b"amm authority"], RAYDIUM_AMM_PROGRAM)[0]
+
+# Raydium AMM v4 trade fee, 0.25%
+FEE_NUMERATOR = 25
+FEE_DENOMINATOR = 10000
+
+# Compute units of a buy with both token account creations, for a buy that
+# can't be simulated because its pool doesn't exist yet
+BUY_COMPUTE_UNITS = 100_000
+
+_SWAP_BASE_IN = struct.Struct("<BQQ")  # instruction 9, amount_in, minimum_amount_out
+_SWAP_BASE_IN_TAG = 9
+_CREATE_ATA_IDEMPOTENT = bytes([1])
+_SYNC_NATIVE = bytes([17])
+_CLOSE_ACCOUNT = bytes([9])
+
+def vault_signer_address(market: Pubkey, nonce: int) -> Pubkey:
+    """
+    The OpenBook market's vault signer, None if the nonce doesn't derive an
+    off-curve address (solders' create_program_address panics instead of raising)
+    """
+    seeds = bytes(market) + struct.pack("<Q", nonce)
+    address = Pubkey(hashlib.sha256(seeds + bytes(OPENBOOK_PROGRAM) + b"ProgramDerivedAddress").digest())
+    return None if address.is_on_curve() else address
+
+def amount_out(amount_in: int, reserve_in: int, reserve_out: int) -> int:
+    """
+    Constant product output for amount_in, after the trade fee. Rounds the
+    way the program does: the fee up, the output down.
+    """
+    fee = -(-amount_in * FEE_NUMERATOR // FEE_DENOMINATOR)
+    amount_in_after_fee = amount_in - fee
+    return reserve_out * amount_in_after_fee // (reserve_in + amount_in_after_fee)
+
+def minimum_amount_out(amount: int, slippage_bps: int) -> int:
+    """amount less the slippage tolerance; tolerances of 100% or more accept any output"""
+    return amount * max(0, 10000 - slippage_bps) // 10000
+
+def price_impact(amount_in: int, amount: int, reserve_in: int, reserve_out: int) -> float:
+    """Fraction of the spot price lost to the trade's size and fee"""
+    if not amount_in or not reserve_out:
+        return 0.0
+    return 1 - (amount * reserve_in) / (amount_in * reserve_out)
+
+class RaydiumPool:
+    """Every account a Raydium AMM v4 swap touches, plus the reserves to quote against."""
+    __slots__ = (
+        "amm", "open_orders", "target_orders", "base_vault", "quote_vault",
+        "market", "bids", "asks", "event_queue", "market_base_vault", "market_quote_vault", "vault_signer",
+        "base_mint", "quote_mint", "base_reserve", "quote_reserve"
+    )
+
+    def reserves(self, input_mint: str) -> tuple:
+        """(reserve_in, reserve_out) for a swap from input_mint"""
+        if input_mint == self.quote_mint:
+            return self.quote_reserve, self.base_reserve
+        return self.base_reserve, self.quote_reserve
+
+class RaydiumSwap:
+    """
+    Quotes and builds Raydium AMM v4 swaps in-process from the pool keys
+    decoded at detection, instead of a Jupiter quote and swap request.
+    The pool's own accounts are derived from its market (initialize2
+    places them at market-associated addresses) and the OpenBook accounts
+    come from the decoded market state.
+    """
+    @staticmethod
+    def pool_from_market(market_address: Pubkey, market) -> RaydiumPool:
+        """
+        Keys of the pool initialize2 creates for a decoded Serum / OpenBook
+        market, known before the pool exists since every one of them is
+        derived from the market; None unless it is a SOL market. Reserves
+        are left unknown.
+        """
+        if market is None or SOL_MINT not in (market.base_mint, market.quote_mint):
+            return None
+        vault_signer = vault_signer_address(market_address, market.vault_signer_nonce)
+        if vault_signer is None:
+            return None
+
+        pool = RaydiumPool()
+        pool.amm = raydium_pool_address(market_address, b"amm_associated_seed")
+        pool.open_orders = raydium_pool_address(market_address, b"open_order_associated_seed")
+        pool.target_orders = raydium_pool_address(market_address, b"target_associated_seed")
+        pool.base_vault = raydium_pool_address(market_address, b"coin_vault_associated_seed")
+        pool.quote_vault = raydium_pool_address(market_address, b"pc_vault_associated_seed")
+        pool.market = market_address
+        pool.bids = Pubkey.from_string(market.bids)
+        pool.asks = Pubkey.from_string(market.asks)
+        pool.event_queue = Pubkey.from_string(market.event_queue)
+        pool.market_base_vault = Pubkey.from_string(market.base_vault)
+        pool.market_quote_vault = Pubkey.from_string(market.quote_vault)
+        pool.vault_signer = vault_signer
+        pool.base_mint = market.base_mint
+        pool.quote_mint = market.quote_mint
+        pool.base_reserve = None
+        pool.quote_reserve = None
+        return pool
+
+    @staticmethod
+    def pool_from_log(log_data, market) -> RaydiumPool:
+        """
+        Pool keys of a Raydium pool creation, given its decoded Serum /
+        OpenBook market; None unless it is a SOL pair with complete keys
+        and reserves
+        """
+        if log_data.base_reserve is None or log_data.quote_reserve is None:
+            return None
+        pool = RaydiumSwap.pool_from_market(Pubkey.from_string(log_data.market), market)
+        if pool is None:
+            return None
+        pool.base_reserve = log_data.base_reserve
+        pool.quote_reserve = log_data.quote_reserve
+        return pool
+
+    @staticmethod
+    def get_quote(pool: RaydiumPool, input_mint: str, amount: int, slippage_bps: int) -> dict:
+        """Quote a swap from the pool's reserves, in the shape of a Jupiter quote"""
+        reserve_in, reserve_out = pool.reserves(input_mint)
+        out = amount_out(amount, reserve_in, reserve_out)
+        output_mint = pool.base_mint if input_mint == pool.quote_mint else pool.quote_mint
+        return {
+            "inputMint": input_mint,
+            "inAmount": str(amount),
+            "outputMint": output_mint,
+            "outAmount": str(out),
+            "otherAmountThreshold": str(minimum_amount_out(out, slippage_bps)),
+            "swapMode": "ExactIn",
+            "slippageBps": slippage_bps,
+            "priceImpactPct": str(price_impact(amount, out, reserve_in, reserve_out))
+        }
+
+    @staticmethod
+    def floor_quote(pool: RaydiumPool, amount: int, minimum_out: int) -> dict:
+        """
+        A buy of amount lamports from a pool whose reserves aren't known
+        yet, in the shape of a Jupiter quote: only the least it may return
+        """
+        return {
+            "inputMint": SOL_MINT,
+            "inAmount": str(amount),
+            "outputMint": pool.base_mint if pool.quote_mint == SOL_MINT else pool.quote_mint,
+            "outAmount": str(minimum_out),
+            "otherAmountThreshold": str(minimum_out),
+            "swapMode": "ExactIn",
+            "priceImpactPct": "0"
+        }
+
+    @staticmethod
+    def swap_instruction(pool: RaydiumPool, source, destination, owner, amount_in: int, minimum_out: int) -> Instruction:
+        """swap_base_in with the program's 18 accounts"""
+        accounts = [
+            AccountMeta(TOKEN_PROGRAM, False, False),
+            AccountMeta(pool.amm, False, True),
+            AccountMeta(AMM_AUTHORITY, False, False),
+            AccountMeta(pool.open_orders, False, True),
+            AccountMeta(pool.target_orders, False, True),
+            AccountMeta(pool.base_vault, False, True),
+            AccountMeta(pool.quote_vault, False, True),
+            AccountMeta(OPENBOOK_PROGRAM, False, False),
+            AccountMeta(pool.market, False, True),
+            AccountMeta(pool.bids, False, True),
+            AccountMeta(pool.asks, False, True),
+            AccountMeta(pool.event_queue, False, True),
+            AccountMeta(pool.market_base_vault, False, True),
+            AccountMeta(pool.market_quote_vault, False, True),
+            AccountMeta(pool.vault_signer, False, False),
+            AccountMeta(source, False, True),
+            AccountMeta(destination, False, True),
+            AccountMeta(owner, True, False)
+        ]
+        data = _SWAP_BASE_IN.pack(_SWAP_BASE_IN_TAG, amount_in, minimum_out)
+        return Instruction(RAYDIUM_AMM_PROGRAM, data, accounts)
+
+    @staticmethod
+    def _create_token_account(owner, mint) -> Instruction:
+        """Idempotent associated token account creation, paid by the owner"""
+        return Instruction(ASSOCIATED_TOKEN_PROGRAM, _CREATE_ATA_IDEMPOTENT, [
+            AccountMeta(owner, True, True),
+            AccountMeta(associated_token_address(owner, mint), False, True),
+            AccountMeta(owner, False, False),
+            AccountMeta(mint, False, False),
+            AccountMeta(SYSTEM_PROGRAM, False, False),
+            AccountMeta(TOKEN_PROGRAM, False, False)
+        ])
+
+    def build_buy_transaction(self, pool: RaydiumPool, owner, quote: dict, blockhash=None) -> Transaction:
+        """
+        A SOL -> token swap for a quote from get_quote: wrap the SOL into the
+        owner's WSOL account, swap into the token account (both created if
+        missing) and unwrap what is left.
+        """
+        amount_in = int(quote["inAmount"])
+        minimum_out = int(quote["otherAmountThreshold"])
+        token_mint = Pubkey.from_string(quote["outputMint"])
+        wsol_account = associated_token_address(owner, WSOL_MINT)
+        token_account = associated_token_address(owner, token_mint)
+
+        instructions = [
+            self._create_token_account(owner, WSOL_MINT),
+            transfer(TransferParams(from_pubkey=owner, to_pubkey=wsol_account, lamports=amount_in)),
+            Instruction(TOKEN_PROGRAM, _SYNC_NATIVE, [AccountMeta(wsol_account, False, True)]),
+            self._create_token_account(owner, token_mint),
+            self.swap_instruction(pool, wsol_account, token_account, owner, amount_in, minimum_out),
+            Instruction(TOKEN_PROGRAM, _CLOSE_ACCOUNT, [
+                AccountMeta(wsol_account, False, True),
+                AccountMeta(owner, False, True),
+                AccountMeta(owner, True, False)
+            ])
+        ]
+        return Transaction(recent_blockhash=blockhash, fee_payer=owner, instructions=instructions)
+
+# Global instance
+raydium_swap = RaydiumSwap()
@@ -1,9 +1,26 @@
 import base64
+import functools
 import os
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from config.settings import ENCRYPTION_KEY
+from utils.container import container
+
+@functools.lru_cache(maxsize=4)
+def derive_key(password: str, salt: bytes) -> bytes:
+    """
+    PBKDF2 key for a password. Memoized for the life of the process so the
+    100k iterations run once however many managers are built; the derived
+    key is never written anywhere.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=100000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
 
 class SecurityManager:
     def __init__(self):
@@ -12,14 +29,7 @@ class SecurityManager:
     def _create_fernet(self, password: str) -> Fernet:
         """Create a Fernet instance from a password"""
         salt = b'solana_sniper_bot_salt_'  # In production, use a random salt and store it securely
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return Fernet(key)
+        return Fernet(derive_key(password, salt))
     
     def encrypt_data(self, data: str) -> str:
         """Encrypt sensitive data"""
@@ -36,5 +46,5 @@ class SecurityManager:
             data = '0' * len(data)
         return None
 
-# Global instance
-security_manager = SecurityManager()
+# Global instance, built on first use
+security_manager = container.register("security_manager", SecurityManager)
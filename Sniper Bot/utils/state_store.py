@@ -0,0 +1,153 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from config.settings import DATABASE_URL, STATE_PERSISTENCE, STATE_FLUSH_INTERVAL
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS state_expiry ON state (expires_at) WHERE expires_at IS NOT NULL;
+"""
+
+def sqlite_path(url: str) -> Path:
+    """Filesystem path of a sqlite:/// database URL"""
+    prefix = "sqlite:///"
+    if not url.startswith(prefix):
+        raise ValueError(f"Unsupported database URL: {url}")
+    return Path(url[len(prefix):])
+
+class StateStore:
+    """
+    Write-behind persistence of bot state in SQLite (WAL mode), stored as
+    JSON values keyed by (kind, key).
+    put() and delete() only record the latest change per key in memory. A
+    background task writes everything queued in one transaction per flush
+    interval on a worker thread, so callers never wait on the disk, and a
+    row that is added and removed between flushes is never written at all.
+    """
+    def __init__(self, url: str = DATABASE_URL, flush_interval: float = STATE_FLUSH_INTERVAL, enabled: bool = STATE_PERSISTENCE):
+        self.path = sqlite_path(url)
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.connection = None
+        self.lock = threading.Lock()  # one worker thread on the connection at a time
+        self.dirty = {}  # (kind, key) -> (JSON value, expires_at), or None to delete
+        self.task = None
+        self.flushes = 0
+        self.writes = 0
+        self.flush_time = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; a crash loses at most the last flush
+            connection.executescript(_SCHEMA)
+            self.connection = connection
+        return self.connection
+
+    def put(self, kind: str, key: str, value, expires_at: float = None):
+        """Queue a row for writing; expires_at is a unix time after which it is dropped"""
+        if self.enabled:
+            self.dirty[(kind, key)] = (json.dumps(value, separators=(",", ":")), expires_at)
+
+    def delete(self, kind: str, key: str):
+        """Queue a row for deletion"""
+        if self.enabled:
+            self.dirty[(kind, key)] = None
+
+    def _write(self, changes: dict):
+        upserts = [(kind, key, row[0], row[1]) for (kind, key), row in changes.items() if row is not None]
+        deletes = [(kind, key) for (kind, key), row in changes.items() if row is None]
+        with self.lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO state VALUES (?, ?, ?, ?)", upserts)
+                connection.executemany("DELETE FROM state WHERE kind = ? AND key = ?", deletes)
+                connection.execute("DELETE FROM state WHERE expires_at < ?", (time.time(),))
+
+    async def flush(self):
+        """Write every change queued so far."""
+        if not self.dirty:
+            return
+        changes, self.dirty = self.dirty, {}
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(self._write, changes)
+        except Exception:
+            # Retry with the next flush, unless the key has changed again since
+            for key, row in changes.items():
+                self.dirty.setdefault(key, row)
+            raise
+        self.flushes += 1
+        self.writes += len(changes)
+        self.flush_time += time.monotonic() - started
+
+    def _read(self) -> dict:
+        with self.lock:
+            rows = self._connect().execute(
+                "SELECT kind, key, value, expires_at FROM state WHERE expires_at IS NULL OR expires_at >= ?",
+                (time.time(),)
+            ).fetchall()
+        state = {}
+        for kind, key, value, expires_at in rows:
+            state.setdefault(kind, {})[key] = (json.loads(value), expires_at)
+        return state
+
+    async def load(self) -> dict:
+        """Every unexpired row, as {kind: {key: (value, expires_at)}}"""
+        if not self.enabled:
+            return {}
+        return await asyncio.to_thread(self._read)
+
+    def start(self):
+        """Start the background flush loop."""
+        if self.enabled and (self.task is None or self.task.done()):
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error saving bot state: {e}")
+
+    def stats(self) -> dict:
+        """Queued changes and flush counters"""
+        return {
+            "queued": len(self.dirty),
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "avg_flush_time": self.flush_time / self.flushes if self.flushes else 0.0
+        }
+
+    async def close(self):
+        """Stop the flush loop, write what is left and close the database."""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Error saving bot state: {e}")
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+# Global instance
+state_store = StateStore()
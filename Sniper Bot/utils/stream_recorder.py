@@ -0,0 +1,67 @@
+import gzip
+import json
+import time
+from pathlib import Path
+from config.settings import RECORDINGS_DIR
+
+class StreamRecorder:
+    """
+    Writes raw log notifications to gzip compressed JSONL, one object per
+    line with the arrival time in seconds since the recording started:
+        {"t": 0.0123, "program": "<program id>", "signature": "...", "logs": [...]}
+    Recordings are replayed with tools/replay.py.
+    """
+    def __init__(self, directory: Path = RECORDINGS_DIR):
+        self.directory = Path(directory)
+        self.path = None
+        self.file = None
+        self.started = None
+        self.records = 0
+
+    def open(self, path: Path = None) -> Path:
+        """Start a new recording, by default a timestamped file in the recordings directory"""
+        self.close()
+        if path is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"logs-{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+        self.path = Path(path)
+        self.file = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=5)
+        self.started = time.monotonic()
+        self.records = 0
+        print(f"Recording log notifications to {self.path}")
+        return self.path
+
+    def record(self, program_id: str, logs: list, signature: str):
+        if self.file is None:
+            self.open()
+        entry = {
+            "t": round(time.monotonic() - self.started, 6),
+            "program": program_id,
+            "signature": signature,
+            "logs": list(logs)
+        }
+        self.file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.records += 1
+
+    def wrap(self, program_id: str, callback):
+        """Websocket callback that records each notification before passing it on"""
+        async def recording_callback(logs, signature):
+            self.record(program_id, logs, signature)
+            await callback(logs, signature)
+        return recording_callback
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            print(f"Recorded {self.records} log notifications to {self.path}")
+        self.file = None
+
+def read_recording(path: Path):
+    """Yield the entries of a recording in arrival order"""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+# Global instance
+stream_recorder = StreamRecorder()
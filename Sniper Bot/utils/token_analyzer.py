@@ -1,17 +1,61 @@
 import aiohttp
 import asyncio
-from config.settings import DEXSCREENER_API_URL, MIN_LIQUIDITY
-from services.dexscreener_service import DexScreenerService
+import time
+from config.settings import (
+    DEXSCREENER_API_URL,
+    MIN_LIQUIDITY,
+    CACHE_MAX_ENTRIES,
+    CACHE_FRESH_TTL,
+    CACHE_ESTABLISHED_TTL,
+    CACHE_ESTABLISHED_AGE
+)
+from services.dexscreener_service import dexscreener_service
+from utils.async_cache import AsyncTTLCache
+from utils.state_store import state_store
+from utils.container import container
+
+def analysis_ttl(analysis: dict) -> float:
+    """Errors aren't cached; fresh pairs are re-analyzed sooner as liquidity changes fast"""
+    if any(warning.startswith("Analysis error") for warning in analysis["warnings"]):
+        return 0
+    age = analysis.get("pair_age")
+    if age is not None and age >= CACHE_ESTABLISHED_AGE:
+        return CACHE_ESTABLISHED_TTL
+    return CACHE_FRESH_TTL
 
 class TokenAnalyzer:
     def __init__(self):
-        self.dexscreener_service = DexScreenerService()
+        self.dexscreener_service = dexscreener_service
+        self.cache = AsyncTTLCache(CACHE_MAX_ENTRIES, CACHE_FRESH_TTL)
     
     async def analyze_token(self, mint_address: str) -> dict:
         """
         Analyze a token for potential risks and opportunities
-        Returns a dict with analysis results
+        Returns a dict with analysis results. Results are cached per mint
+        and concurrent calls for the same mint share one analysis, so
+        callers must not modify the returned dict.
         """
+        return await self.cache.get_or_load(
+            mint_address,
+            lambda: self._load(mint_address),
+            ttl=analysis_ttl
+        )
+    
+    async def _load(self, mint_address: str) -> dict:
+        """Analyze a token and save the result for as long as it is cached"""
+        analysis = await self._analyze(mint_address)
+        ttl = analysis_ttl(analysis)
+        if ttl > 0:
+            state_store.put("analysis", mint_address, analysis, time.time() + ttl)
+        return analysis
+    
+    def restore(self, analyses: dict):
+        """Seed the cache with saved analyses, as {mint: (analysis, expires_at)}"""
+        now = time.time()
+        for mint_address, (analysis, expires_at) in analyses.items():
+            self.cache.set(mint_address, analysis, expires_at - now)
+    
+    async def _analyze(self, mint_address: str) -> dict:
         analysis = {
             "mint_address": mint_address,
             "is_valid": False,
@@ -20,6 +64,7 @@ class TokenAnalyzer:
             "market_cap": 0,
             "holder_count": 0,
             "lock_status": "unknown",
+            "pair_age": None,  # seconds since the pair was created
             "risk_score": 10,  # 0-10, 10 being highest risk
             "warnings": [],
             "opportunities": []
@@ -56,6 +101,8 @@ class TokenAnalyzer:
             
             # Check creation time (recent tokens are riskier but also more opportunistic)
             # This would need actual implementation based on available data
+            if pair.get("pairCreatedAt"):
+                analysis["pair_age"] = time.time() - pair["pairCreatedAt"] / 1000
             
             # Check if honeypot (simplified)
             if pair.get("honeypot", False):
@@ -74,5 +121,5 @@ class TokenAnalyzer:
             analysis["warnings"].append(f"Analysis error: {str(e)}")
             return analysis
 
-# Global instance
-token_analyzer = TokenAnalyzer()
+# Global instance, built on first use
+token_analyzer = container.register("token_analyzer", TokenAnalyzer)
@@ -1,6 +1,33 @@
+import re
 from solana.rpc.core import RPCException
 from solana.rpc.commitment import Commitment
 from bot.solana_client import solana_client
+from utils.container import container
+
+_INVOKE = re.compile(r"^Program \w+ invoke \[(\d+)\]$")
+_CONSUMED = re.compile(r"^Program \w+ consumed (\d+) of \d+ compute units$")
+_EXIT = re.compile(r"^Program \w+ (?:success$|failed: )")
+
+def units_consumed_from_logs(logs: list) -> int:
+    """
+    Compute units a transaction consumed, from its program logs: the sum of
+    the top-level invocations. Inner invocations report their own use too,
+    but it is already counted in their caller's.
+    """
+    depth = 0
+    total = 0
+    for log in logs or ():
+        invoke = _INVOKE.match(log)
+        if invoke:
+            depth = int(invoke.group(1))
+            continue
+        consumed = _CONSUMED.match(log)
+        if consumed:
+            if depth == 1:
+                total += int(consumed.group(1))
+        elif _EXIT.match(log):
+            depth -= 1
+    return total
 
 class TransactionSimulator:
     @staticmethod
@@ -18,23 +45,22 @@ class TransactionSimulator:
         }
         
         try:
-            # Simulate the transaction
-            simulation = await solana_client.http_client.simulate_transaction(
+            # Swaps are simulated before they are signed, so signatures
+            # aren't checked; sending verifies them anyway
+            simulation = await solana_client.rpc.call(
+                "simulate_transaction",
                 transaction,
                 commitment=Commitment("confirmed"),
-                sig_verify=True
+                sig_verify=False
             )
             
             if simulation.value and simulation.value.err is None:
                 result["success"] = True
                 result["logs"] = simulation.value.logs
                 
-                # Extract compute units consumed
-                for log in simulation.value.logs:
-                    if "compute units consumed" in log:
-                        parts = log.split(" ")
-                        if len(parts) >= 4:
-                            result["units_consumed"] = int(parts[3])
+                # Nodes report the total; older ones only log it per program
+                units_consumed = getattr(simulation.value, "units_consumed", None)
+                result["units_consumed"] = units_consumed or units_consumed_from_logs(simulation.value.logs)
                 
                 return result
             else:
@@ -48,5 +74,5 @@ class TransactionSimulator:
             result["error"] = str(e)
             return result
 
-# Global instance
-transaction_simulator = TransactionSimulator()
+# Global instance, built on first use
+transaction_simulator = container.register("transaction_simulator", TransactionSimulator)